@@ -6,16 +6,15 @@ from __future__ import annotations
 
 import base64
 import binascii
+import itertools
 import os
 import time
 import typing
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 
 from cryptography import utils
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import hashes, padding
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.hazmat.bindings._rust import fernet as rust_fernet
+from cryptography.hazmat.bindings._rust import openssl as rust_openssl
 
 
 class InvalidToken(Exception):
@@ -42,8 +41,7 @@ class Fernet:
                 "Fernet key must be 32 url-safe base64-encoded bytes."
             )
 
-        self._signing_key = key[:16]
-        self._encryption_key = key[16:]
+        self._fernet = rust_fernet.Fernet(key)
 
     @classmethod
     def generate_key(cls) -> bytes:
@@ -53,33 +51,28 @@ class Fernet:
         return self.encrypt_at_time(data, int(time.time()))
 
     def encrypt_at_time(self, data: bytes, current_time: int) -> bytes:
-        iv = os.urandom(16)
+        iv = rust_openssl.rand.random_bytes(16)
         return self._encrypt_from_parts(data, current_time, iv)
 
     def _encrypt_from_parts(
         self, data: bytes, current_time: int, iv: bytes
     ) -> bytes:
         utils._check_bytes("data", data)
+        return self._fernet.encrypt(data, current_time, iv)
 
-        padder = padding.PKCS7(algorithms.AES.block_size).padder()
-        padded_data = padder.update(data) + padder.finalize()
-        encryptor = Cipher(
-            algorithms.AES(self._encryption_key),
-            modes.CBC(iv),
-        ).encryptor()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
-
-        basic_parts = (
-            b"\x80"
-            + current_time.to_bytes(length=8, byteorder="big")
-            + iv
-            + ciphertext
-        )
-
-        h = HMAC(self._signing_key, hashes.SHA256())
-        h.update(basic_parts)
-        hmac = h.finalize()
-        return base64.urlsafe_b64encode(basic_parts + hmac)
+    def encrypt_many(
+        self,
+        data: Iterable[bytes],
+        current_time: int | None = None,
+        parallelism: int = 1,
+    ) -> list[bytes]:
+        data = list(data)
+        for d in data:
+            utils._check_bytes("data", d)
+        if current_time is None:
+            current_time = int(time.time())
+        ivs = rust_openssl.rand.random_bytes(16 * len(data))
+        return self._fernet.encrypt_many(data, current_time, ivs, parallelism)
 
     def decrypt(self, token: bytes | str, ttl: int | None = None) -> bytes:
         timestamp, data = Fernet._get_unverified_token_data(token)
@@ -99,6 +92,33 @@ class Fernet:
         timestamp, data = Fernet._get_unverified_token_data(token)
         return self._decrypt_data(data, timestamp, (ttl, current_time))
 
+    def decrypt_many(
+        self,
+        tokens: Iterable[bytes | str],
+        ttl: int | None = None,
+        current_time: int | None = None,
+        parallelism: int = 1,
+    ) -> list[bytes | None]:
+        if ttl is None:
+            time_info = None
+        elif current_time is None:
+            time_info = (ttl, int(time.time()))
+        else:
+            time_info = (ttl, current_time)
+
+        data: list[bytes | None] = []
+        for token in tokens:
+            try:
+                timestamp, token_data = Fernet._get_unverified_token_data(
+                    token
+                )
+                Fernet._check_timestamp(timestamp, time_info)
+            except InvalidToken:
+                data.append(None)
+            else:
+                data.append(token_data)
+        return self._fernet.decrypt_many(data, parallelism)
+
     def extract_timestamp(self, token: bytes | str) -> int:
         timestamp, data = Fernet._get_unverified_token_data(token)
         # Verify the token was not tampered with.
@@ -110,10 +130,12 @@ class Fernet:
         if not isinstance(token, (str, bytes)):
             raise TypeError("token must be bytes or str")
 
-        try:
-            data = base64.urlsafe_b64decode(token)
-        except (TypeError, binascii.Error):
-            raise InvalidToken
+        data = rust_fernet.urlsafe_b64decode(token)
+        if data is None:
+            try:
+                data = base64.urlsafe_b64decode(token)
+            except (TypeError, binascii.Error):
+                raise InvalidToken
 
         if not data or data[0] != 0x80:
             raise InvalidToken
@@ -125,12 +147,7 @@ class Fernet:
         return timestamp, data
 
     def _verify_signature(self, data: bytes) -> None:
-        h = HMAC(self._signing_key, hashes.SHA256())
-        h.update(data[:-32])
-        try:
-            h.verify(data[-32:])
-        except InvalidSignature:
-            raise InvalidToken
+        self._fernet.verify(data)
 
     def _decrypt_data(
         self,
@@ -138,6 +155,13 @@ class Fernet:
         timestamp: int,
         time_info: tuple[int, int] | None,
     ) -> bytes:
+        Fernet._check_timestamp(timestamp, time_info)
+        return self._fernet.decrypt(data)
+
+    @staticmethod
+    def _check_timestamp(
+        timestamp: int, time_info: tuple[int, int] | None
+    ) -> None:
         if time_info is not None:
             ttl, current_time = time_info
             if timestamp + ttl < current_time:
@@ -146,27 +170,6 @@ class Fernet:
             if current_time + _MAX_CLOCK_SKEW < timestamp:
                 raise InvalidToken
 
-        self._verify_signature(data)
-
-        iv = data[9:25]
-        ciphertext = data[25:-32]
-        decryptor = Cipher(
-            algorithms.AES(self._encryption_key), modes.CBC(iv)
-        ).decryptor()
-        plaintext_padded = decryptor.update(ciphertext)
-        try:
-            plaintext_padded += decryptor.finalize()
-        except ValueError:
-            raise InvalidToken
-        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
-
-        unpadded = unpadder.update(plaintext_padded)
-        try:
-            unpadded += unpadder.finalize()
-        except ValueError:
-            raise InvalidToken
-        return unpadded
-
 
 class MultiFernet:
     def __init__(self, fernets: Iterable[Fernet]):
@@ -176,6 +179,7 @@ class MultiFernet:
                 "MultiFernet requires at least one Fernet instance"
             )
         self._fernets = fernets
+        self._rust_fernets = [f._fernet for f in fernets]
 
     def encrypt(self, msg: bytes) -> bytes:
         return self.encrypt_at_time(msg, int(time.time()))
@@ -185,40 +189,66 @@ class MultiFernet:
 
     def rotate(self, msg: bytes | str) -> bytes:
         timestamp, data = Fernet._get_unverified_token_data(msg)
-        for f in self._fernets:
-            try:
-                p = f._decrypt_data(data, timestamp, None)
-                break
-            except InvalidToken:
-                pass
-        else:
-            raise InvalidToken
+        p = rust_fernet.decrypt_any(self._rust_fernets, data)
 
-        iv = os.urandom(16)
+        iv = rust_openssl.rand.random_bytes(16)
         return self._fernets[0]._encrypt_from_parts(p, timestamp, iv)
 
+    def rotate_many(
+        self, msgs: Iterable[bytes | str], chunk_size: int = 1024
+    ) -> Iterator[bytes]:
+        if not isinstance(chunk_size, int):
+            raise TypeError("chunk_size must be an integer.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        return self._rotate_many(iter(msgs), chunk_size)
+
+    def _rotate_many(
+        self, msgs: Iterator[bytes | str], chunk_size: int
+    ) -> Iterator[bytes]:
+        while True:
+            chunk = []
+            invalid = False
+            for msg in itertools.islice(msgs, chunk_size):
+                try:
+                    chunk.append(Fernet._get_unverified_token_data(msg)[1])
+                except InvalidToken:
+                    # The tokens before an invalid one are still rotated and
+                    # returned before InvalidToken is raised.
+                    invalid = True
+                    break
+            if chunk:
+                ivs = rust_openssl.rand.random_bytes(16 * len(chunk))
+                for token in rust_fernet.rotate_many(
+                    self._rust_fernets, chunk, ivs
+                ):
+                    if token is None:
+                        raise InvalidToken
+                    yield token
+            if invalid:
+                raise InvalidToken
+            if not chunk:
+                return
+
     def decrypt(self, msg: bytes | str, ttl: int | None = None) -> bytes:
-        for f in self._fernets:
-            try:
-                return f.decrypt(msg, ttl)
-            except InvalidToken:
-                pass
-        raise InvalidToken
+        timestamp, data = Fernet._get_unverified_token_data(msg)
+        if ttl is not None:
+            Fernet._check_timestamp(timestamp, (ttl, int(time.time())))
+        return rust_fernet.decrypt_any(self._rust_fernets, data)
 
     def decrypt_at_time(
         self, msg: bytes | str, ttl: int, current_time: int
     ) -> bytes:
-        for f in self._fernets:
-            try:
-                return f.decrypt_at_time(msg, ttl, current_time)
-            except InvalidToken:
-                pass
-        raise InvalidToken
+        if ttl is None:
+            raise ValueError(
+                "decrypt_at_time() can only be used with a non-None ttl"
+            )
+        timestamp, data = Fernet._get_unverified_token_data(msg)
+        Fernet._check_timestamp(timestamp, (ttl, current_time))
+        return rust_fernet.decrypt_any(self._rust_fernets, data)
 
     def extract_timestamp(self, msg: bytes | str) -> int:
-        for f in self._fernets:
-            try:
-                return f.extract_timestamp(msg)
-            except InvalidToken:
-                pass
-        raise InvalidToken
+        timestamp, data = Fernet._get_unverified_token_data(msg)
+        # Verify the token was not tampered with.
+        rust_fernet.verify_any(self._rust_fernets, data)
+        return timestamp
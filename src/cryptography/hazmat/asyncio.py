@@ -0,0 +1,98 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import typing
+from concurrent.futures import Executor
+
+from cryptography.hazmat.primitives.asymmetric.types import (
+    CertificateIssuerPrivateKeyTypes,
+    CertificateIssuerPublicKeyTypes,
+)
+from cryptography.hazmat.primitives.ciphers.aead import (
+    AESCCM,
+    AESGCM,
+    AESGCMSIV,
+    AESOCB3,
+    ChaCha20Poly1305,
+)
+from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
+from cryptography.utils import Buffer
+
+__all__ = [
+    "decrypt",
+    "derive",
+    "encrypt",
+    "get_executor",
+    "run",
+    "set_executor",
+    "sign",
+    "verify",
+]
+
+_T = typing.TypeVar("_T")
+
+_AEAD = typing.Union[AESCCM, AESGCM, AESGCMSIV, AESOCB3, ChaCha20Poly1305]
+
+_executor: Executor | None = None
+
+
+def set_executor(executor: Executor | None) -> None:
+    global _executor
+    if executor is not None and not isinstance(executor, Executor):
+        raise TypeError("executor must be a concurrent.futures.Executor")
+    _executor = executor
+
+
+def get_executor() -> Executor | None:
+    return _executor
+
+
+async def run(func: typing.Callable[..., _T], *args: typing.Any) -> _T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, functools.partial(func, *args)
+    )
+
+
+async def encrypt(
+    aead: _AEAD,
+    nonce: Buffer,
+    data: Buffer,
+    associated_data: Buffer | None,
+) -> bytes:
+    return await run(aead.encrypt, nonce, data, associated_data)
+
+
+async def decrypt(
+    aead: _AEAD,
+    nonce: Buffer,
+    data: Buffer,
+    associated_data: Buffer | None,
+) -> bytes:
+    return await run(aead.decrypt, nonce, data, associated_data)
+
+
+async def derive(kdf: KeyDerivationFunction, key_material: bytes) -> bytes:
+    return await run(kdf.derive, key_material)
+
+
+async def sign(
+    private_key: CertificateIssuerPrivateKeyTypes,
+    data: Buffer,
+    *args: typing.Any,
+) -> bytes:
+    return await run(private_key.sign, data, *args)
+
+
+async def verify(
+    public_key: CertificateIssuerPublicKeyTypes,
+    signature: Buffer,
+    data: Buffer,
+    *args: typing.Any,
+) -> None:
+    await run(public_key.verify, signature, data, *args)
@@ -0,0 +1,30 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from cryptography.utils import Buffer
+
+class Fernet:
+    def __init__(self, key: Buffer) -> None: ...
+    def encrypt(
+        self, data: Buffer, current_time: int, iv: Buffer
+    ) -> bytes: ...
+    def encrypt_many(
+        self,
+        data: list[bytes],
+        current_time: int,
+        ivs: Buffer,
+        parallelism: int,
+    ) -> list[bytes]: ...
+    def verify(self, data: Buffer) -> None: ...
+    def decrypt(self, data: Buffer) -> bytes: ...
+    def decrypt_many(
+        self, data: list[bytes | None], parallelism: int
+    ) -> list[bytes | None]: ...
+
+def decrypt_any(fernets: list[Fernet], data: Buffer) -> bytes: ...
+def rotate_many(
+    fernets: list[Fernet], data: list[bytes], ivs: Buffer
+) -> list[bytes | None]: ...
+def urlsafe_b64decode(token: bytes | str) -> bytes | None: ...
+def verify_any(fernets: list[Fernet], data: Buffer) -> None: ...
@@ -18,6 +18,7 @@ from cryptography.hazmat.bindings._rust.openssl import (
     kdf,
     keys,
     poly1305,
+    rand,
     rsa,
     x448,
     x25519,
@@ -40,6 +41,7 @@ __all__ = [
     "openssl_version_text",
     "poly1305",
     "raise_openssl_error",
+    "rand",
     "rsa",
     "x448",
     "x25519",
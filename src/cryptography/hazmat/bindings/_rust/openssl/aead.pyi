@@ -22,6 +22,34 @@ class AESGCM:
         data: Buffer,
         associated_data: Buffer | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def encrypt_many(
+        self,
+        items: Sequence[tuple[Buffer, Buffer, Buffer | None]],
+    ) -> list[bytes]: ...
+    def decrypt_many(
+        self,
+        items: Sequence[tuple[Buffer, Buffer, Buffer | None]],
+    ) -> list[bytes]: ...
+    def decrypt_in_place(
+        self,
+        nonce: Buffer,
+        buf: Buffer,
+        associated_data: Buffer | None,
+    ) -> memoryview: ...
 
 class ChaCha20Poly1305:
     def __init__(self, key: Buffer) -> None: ...
@@ -39,6 +67,20 @@ class ChaCha20Poly1305:
         data: Buffer,
         associated_data: Buffer | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
 
 class AESCCM:
     def __init__(self, key: Buffer, tag_length: int = 16) -> None: ...
@@ -56,6 +98,20 @@ class AESCCM:
         data: Buffer,
         associated_data: Buffer | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
 
 class AESSIV:
     def __init__(self, key: Buffer) -> None: ...
@@ -71,6 +127,18 @@ class AESSIV:
         data: Buffer,
         associated_data: Sequence[Buffer] | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        data: Buffer,
+        associated_data: Sequence[Buffer] | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        data: Buffer,
+        associated_data: Sequence[Buffer] | None,
+        buf: Buffer,
+    ) -> int: ...
 
 class AESOCB3:
     def __init__(self, key: Buffer) -> None: ...
@@ -88,6 +156,20 @@ class AESOCB3:
         data: Buffer,
         associated_data: Buffer | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
 
 class AESGCMSIV:
     def __init__(self, key: Buffer) -> None: ...
@@ -105,3 +187,17 @@ class AESGCMSIV:
         data: Buffer,
         associated_data: Buffer | None,
     ) -> bytes: ...
+    def encrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
+    def decrypt_into(
+        self,
+        nonce: Buffer,
+        data: Buffer,
+        associated_data: Buffer | None,
+        buf: Buffer,
+    ) -> int: ...
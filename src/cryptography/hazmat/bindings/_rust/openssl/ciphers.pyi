@@ -13,7 +13,9 @@ def create_encryption_ctx(
 ) -> ciphers.AEADEncryptionContext: ...
 @typing.overload
 def create_encryption_ctx(
-    algorithm: ciphers.CipherAlgorithm, mode: modes.Mode | None
+    algorithm: ciphers.CipherAlgorithm,
+    mode: modes.Mode | None,
+    parallelism: int = 1,
 ) -> ciphers.CipherContext: ...
 @typing.overload
 def create_decryption_ctx(
@@ -21,11 +23,15 @@ def create_decryption_ctx(
 ) -> ciphers.AEADDecryptionContext: ...
 @typing.overload
 def create_decryption_ctx(
-    algorithm: ciphers.CipherAlgorithm, mode: modes.Mode | None
+    algorithm: ciphers.CipherAlgorithm,
+    mode: modes.Mode | None,
+    parallelism: int = 1,
 ) -> ciphers.CipherContext: ...
 def cipher_supported(
     algorithm: ciphers.CipherAlgorithm, mode: modes.Mode
 ) -> bool: ...
+def get_gil_release_threshold() -> int: ...
+def set_gil_release_threshold(threshold: int) -> None: ...
 def _advance(
     ctx: ciphers.AEADEncryptionContext | ciphers.AEADDecryptionContext, n: int
 ) -> None: ...
@@ -36,3 +42,22 @@ def _advance_aad(
 class CipherContext: ...
 class AEADEncryptionContext: ...
 class AEADDecryptionContext: ...
+
+class CipherTemplate:
+    def __init__(
+        self,
+        algorithm: ciphers.CipherAlgorithm,
+        mode_class: type[modes.Mode],
+    ) -> None: ...
+    @typing.overload
+    def encryptor(
+        self, mode: modes.ModeWithAuthenticationTag
+    ) -> ciphers.AEADEncryptionContext: ...
+    @typing.overload
+    def encryptor(self, mode: modes.Mode) -> ciphers.CipherContext: ...
+    @typing.overload
+    def decryptor(
+        self, mode: modes.ModeWithAuthenticationTag
+    ) -> ciphers.AEADDecryptionContext: ...
+    @typing.overload
+    def decryptor(self, mode: modes.Mode) -> ciphers.CipherContext: ...
@@ -2,6 +2,7 @@
 # 2.0, and the BSD License. See the LICENSE file in the root of this repository
 # for complete details.
 
+import os
 import typing
 
 from cryptography.hazmat.primitives import hashes
@@ -18,6 +19,29 @@ class Hash(hashes.HashContext):
     def copy(self) -> Hash: ...
 
 def hash_supported(algorithm: hashes.HashAlgorithm) -> bool: ...
+def digest(algorithm: hashes.HashAlgorithm, data: Buffer) -> bytes: ...
+@typing.overload
+def digest_many(
+    algorithm: hashes.HashAlgorithm,
+    data: typing.Sequence[Buffer],
+    *,
+    parallelism: int = 1,
+    packed: typing.Literal[False] = False,
+) -> list[bytes]: ...
+@typing.overload
+def digest_many(
+    algorithm: hashes.HashAlgorithm,
+    data: typing.Sequence[Buffer],
+    *,
+    parallelism: int = 1,
+    packed: typing.Literal[True],
+) -> bytes: ...
+def hash_file(
+    path_or_fd: str | os.PathLike[str] | int,
+    algorithm: hashes.HashAlgorithm,
+    *,
+    key: Buffer | None = None,
+) -> bytes: ...
 
 class XOFHash:
     def __init__(self, algorithm: hashes.ExtendableOutputFunction) -> None: ...
@@ -26,3 +50,20 @@ class XOFHash:
     def update(self, data: Buffer) -> None: ...
     def squeeze(self, length: int) -> bytes: ...
     def copy(self) -> XOFHash: ...
+
+class TreeHash(hashes.HashContext):
+    def __init__(
+        self,
+        algorithm: hashes.HashAlgorithm,
+        leaf_size: int,
+        *,
+        parallelism: int = 1,
+    ) -> None: ...
+    @property
+    def algorithm(self) -> hashes.HashAlgorithm: ...
+    @property
+    def leaf_size(self) -> int: ...
+    def update(self, data: Buffer) -> None: ...
+    def finalize(self) -> bytes: ...
+    def copy(self) -> TreeHash: ...
+    def leaf_digests(self) -> list[bytes]: ...
@@ -14,6 +14,9 @@ from cryptography.hazmat.primitives.ciphers.base import (
     AEADEncryptionContext,
     Cipher,
     CipherContext,
+    CipherTemplate,
+    get_gil_release_threshold,
+    set_gil_release_threshold,
 )
 
 __all__ = [
@@ -24,4 +27,7 @@ __all__ = [
     "Cipher",
     "CipherAlgorithm",
     "CipherContext",
+    "CipherTemplate",
+    "get_gil_release_threshold",
+    "set_gil_release_threshold",
 ]
@@ -0,0 +1,68 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import annotations
+
+import typing
+
+from cryptography import utils
+from cryptography.hazmat.bindings._rust import openssl as rust_openssl
+
+# The parts of the STREAM construction shared by StreamEncryptor,
+# StreamDecryptor and the file helpers in the files module.
+#
+# The nonce for each segment is nonce_prefix || counter || last_flag, with a
+# 4 byte big-endian counter and a 1 byte flag, as in the STREAM construction
+# from "Online Authenticated-Encryption and its Nonce-Reuse
+# Misuse-Resistance" (Hoang, Reyhanitabar, Rogaway, Vizár).
+NONCE_PREFIX_LENGTH = 7
+MAX_COUNTER = 2**32 - 1
+TAG_LENGTH = 16
+
+StreamAEAD = typing.Union[
+    rust_openssl.aead.AESGCM,
+    rust_openssl.aead.ChaCha20Poly1305,
+    rust_openssl.aead.AESGCMSIV,
+    rust_openssl.aead.AESOCB3,
+]
+
+
+def check_arguments(
+    aead: StreamAEAD,
+    nonce_prefix: bytes,
+    segment_size: int,
+    associated_data: bytes | None,
+) -> None:
+    if not isinstance(
+        aead,
+        (
+            rust_openssl.aead.AESGCM,
+            rust_openssl.aead.ChaCha20Poly1305,
+            rust_openssl.aead.AESGCMSIV,
+            rust_openssl.aead.AESOCB3,
+        ),
+    ):
+        raise TypeError(
+            "aead must be an instance of AESGCM, ChaCha20Poly1305, "
+            "AESGCMSIV, or AESOCB3"
+        )
+    utils._check_bytes("nonce_prefix", nonce_prefix)
+    if len(nonce_prefix) != NONCE_PREFIX_LENGTH:
+        raise ValueError("nonce_prefix must be 7 bytes")
+    if not isinstance(segment_size, int):
+        raise TypeError("segment_size must be an integer")
+    if not 0 < segment_size <= 2**31 - 1 - TAG_LENGTH:
+        raise ValueError("segment_size must be between 1 and 2**31 - 17")
+    if associated_data is not None:
+        utils._check_bytes("associated_data", associated_data)
+
+
+def segment_nonce(nonce_prefix: bytes, counter: int, last: bool) -> bytes:
+    if counter > MAX_COUNTER:
+        raise OverflowError("Maximum number of segments exceeded")
+    return (
+        nonce_prefix
+        + counter.to_bytes(4, "big")
+        + (b"\x01" if last else b"\x00")
+    )
@@ -4,7 +4,12 @@
 
 from __future__ import annotations
 
+import abc
+
+from cryptography import utils
+from cryptography.exceptions import AlreadyFinalized
 from cryptography.hazmat.bindings._rust import openssl as rust_openssl
+from cryptography.hazmat.primitives.ciphers import _stream
 
 __all__ = [
     "AESCCM",
@@ -13,6 +18,8 @@ __all__ = [
     "AESOCB3",
     "AESSIV",
     "ChaCha20Poly1305",
+    "StreamDecryptor",
+    "StreamEncryptor",
 ]
 
 AESGCM = rust_openssl.aead.AESGCM
@@ -21,3 +28,112 @@ AESCCM = rust_openssl.aead.AESCCM
 AESSIV = rust_openssl.aead.AESSIV
 AESOCB3 = rust_openssl.aead.AESOCB3
 AESGCMSIV = rust_openssl.aead.AESGCMSIV
+
+
+class _StreamContext(metaclass=abc.ABCMeta):
+    _input_segment_size: int
+
+    def __init__(
+        self,
+        aead: _stream.StreamAEAD,
+        nonce_prefix: bytes,
+        segment_size: int,
+        associated_data: bytes | None,
+    ) -> None:
+        _stream.check_arguments(
+            aead, nonce_prefix, segment_size, associated_data
+        )
+
+        self._aead = aead
+        self._nonce_prefix = nonce_prefix
+        self._associated_data = associated_data
+        self._counter = 0
+        self._buffer = bytearray()
+        self._finalized = False
+
+    def _nonce(self, last: bool) -> bytes:
+        nonce = _stream.segment_nonce(self._nonce_prefix, self._counter, last)
+        self._counter += 1
+        return nonce
+
+    @abc.abstractmethod
+    def _process(self, segment: memoryview, last: bool) -> bytes:
+        """
+        Encrypts or decrypts a single segment.
+        """
+
+    def update(self, data: utils.Buffer) -> bytes:
+        if self._finalized:
+            raise AlreadyFinalized("Context was already finalized.")
+        utils._check_byteslike("data", data)
+
+        self._buffer += data
+        # A full segment can only be processed once we know it isn't the last
+        # one, so at least one byte is always held back until finalize.
+        input_segment_size = self._input_segment_size
+        segments = []
+        offset = 0
+        try:
+            with memoryview(self._buffer) as view:
+                while len(view) - offset > input_segment_size:
+                    end = offset + input_segment_size
+                    with view[offset:end] as segment:
+                        segments.append(self._process(segment, False))
+                    offset = end
+        except BaseException:
+            # The segment counter and the buffer no longer agree, so the
+            # context can't be used again.
+            self._close()
+            raise
+        del self._buffer[:offset]
+        return b"".join(segments)
+
+    def finalize(self) -> bytes:
+        if self._finalized:
+            raise AlreadyFinalized("Context was already finalized.")
+        try:
+            with memoryview(self._buffer) as view:
+                result = self._process(view, True)
+        finally:
+            # Whether or not the final segment was processed successfully,
+            # the context can't be used again.
+            self._close()
+        return result
+
+    def _close(self) -> None:
+        self._finalized = True
+        self._buffer = bytearray()
+
+
+class StreamEncryptor(_StreamContext):
+    def __init__(
+        self,
+        aead: _stream.StreamAEAD,
+        nonce_prefix: bytes,
+        segment_size: int,
+        associated_data: bytes | None = None,
+    ) -> None:
+        super().__init__(aead, nonce_prefix, segment_size, associated_data)
+        self._input_segment_size = segment_size
+
+    def _process(self, segment: memoryview, last: bool) -> bytes:
+        return self._aead.encrypt(
+            self._nonce(last), segment, self._associated_data
+        )
+
+
+class StreamDecryptor(_StreamContext):
+    def __init__(
+        self,
+        aead: _stream.StreamAEAD,
+        nonce_prefix: bytes,
+        segment_size: int,
+        associated_data: bytes | None = None,
+    ) -> None:
+        super().__init__(aead, nonce_prefix, segment_size, associated_data)
+        self._input_segment_size = segment_size + _stream.TAG_LENGTH
+
+    def _process(self, segment: memoryview, last: bool) -> bytes:
+        return self._aead.decrypt(
+            self._nonce(last), segment, self._associated_data
+        )
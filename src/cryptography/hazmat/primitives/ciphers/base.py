@@ -28,6 +28,13 @@ class CipherContext(metaclass=abc.ABCMeta):
         provided buffer. Returns the number of bytes written.
         """
 
+    def update_many(self, data: typing.Sequence[Buffer]) -> bytes:
+        """
+        Processes each of the provided buffers in turn and returns the
+        combined results as bytes.
+        """
+        return b"".join([self.update(d) for d in data])
+
     @abc.abstractmethod
     def finalize(self) -> bytes:
         """
@@ -97,14 +104,16 @@ class Cipher(typing.Generic[Mode]):
     @typing.overload
     def encryptor(
         self: Cipher[modes.ModeWithAuthenticationTag],
+        parallelism: int = 1,
     ) -> AEADEncryptionContext: ...
 
     @typing.overload
     def encryptor(
         self: _CIPHER_TYPE,
+        parallelism: int = 1,
     ) -> CipherContext: ...
 
-    def encryptor(self):
+    def encryptor(self, parallelism: int = 1):
         if isinstance(self.mode, modes.ModeWithAuthenticationTag):
             if self.mode.tag is not None:
                 raise ValueError(
@@ -112,22 +121,24 @@ class Cipher(typing.Generic[Mode]):
                 )
 
         return rust_openssl.ciphers.create_encryption_ctx(
-            self.algorithm, self.mode
+            self.algorithm, self.mode, parallelism
         )
 
     @typing.overload
     def decryptor(
         self: Cipher[modes.ModeWithAuthenticationTag],
+        parallelism: int = 1,
     ) -> AEADDecryptionContext: ...
 
     @typing.overload
     def decryptor(
         self: _CIPHER_TYPE,
+        parallelism: int = 1,
     ) -> CipherContext: ...
 
-    def decryptor(self):
+    def decryptor(self, parallelism: int = 1):
         return rust_openssl.ciphers.create_decryption_ctx(
-            self.algorithm, self.mode
+            self.algorithm, self.mode, parallelism
         )
 
 
@@ -141,6 +152,76 @@ _CIPHER_TYPE = Cipher[
     ]
 ]
 
+
+class CipherTemplate:
+    def __init__(
+        self,
+        algorithm: CipherAlgorithm,
+        mode_class: type[modes.Mode],
+    ) -> None:
+        if not isinstance(algorithm, CipherAlgorithm):
+            raise TypeError("Expected interface of CipherAlgorithm.")
+        if not (
+            isinstance(mode_class, type) and issubclass(mode_class, modes.Mode)
+        ):
+            raise TypeError("mode_class must be a subclass of Mode.")
+
+        self.algorithm = algorithm
+        self.mode_class = mode_class
+        self._template = rust_openssl.ciphers.CipherTemplate(
+            algorithm, mode_class
+        )
+
+    def _check_mode(self, mode: modes.Mode) -> None:
+        if type(mode) is not self.mode_class:
+            raise TypeError(
+                f"mode must be an instance of {self.mode_class.__name__}."
+            )
+        mode.validate_for_algorithm(self.algorithm)
+
+    @typing.overload
+    def encryptor(
+        self, mode: modes.ModeWithAuthenticationTag
+    ) -> AEADEncryptionContext: ...
+
+    @typing.overload
+    def encryptor(self, mode: modes.Mode) -> CipherContext: ...
+
+    def encryptor(self, mode):
+        self._check_mode(mode)
+        if isinstance(mode, modes.ModeWithAuthenticationTag):
+            if mode.tag is not None:
+                raise ValueError(
+                    "Authentication tag must be None when encrypting."
+                )
+
+        return self._template.encryptor(mode)
+
+    @typing.overload
+    def decryptor(
+        self, mode: modes.ModeWithAuthenticationTag
+    ) -> AEADDecryptionContext: ...
+
+    @typing.overload
+    def decryptor(self, mode: modes.Mode) -> CipherContext: ...
+
+    def decryptor(self, mode):
+        self._check_mode(mode)
+        return self._template.decryptor(mode)
+
+
+def get_gil_release_threshold() -> int:
+    return rust_openssl.ciphers.get_gil_release_threshold()
+
+
+def set_gil_release_threshold(nbytes: int) -> None:
+    if not isinstance(nbytes, int):
+        raise TypeError("nbytes must be an integer.")
+    if nbytes < 0:
+        raise ValueError("nbytes must be non-negative.")
+    rust_openssl.ciphers.set_gil_release_threshold(nbytes)
+
+
 CipherContext.register(rust_openssl.ciphers.CipherContext)
 AEADEncryptionContext.register(rust_openssl.ciphers.AEADEncryptionContext)
 AEADDecryptionContext.register(rust_openssl.ciphers.AEADDecryptionContext)
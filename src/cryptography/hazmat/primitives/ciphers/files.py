@@ -0,0 +1,192 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import annotations
+
+import contextlib
+import mmap
+import os
+import typing
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives._cipheralgorithm import (
+    BlockCipherAlgorithm,
+)
+from cryptography.hazmat.primitives.ciphers import _stream, modes
+from cryptography.hazmat.primitives.ciphers.base import Cipher, CipherContext
+
+__all__ = [
+    "decrypt_file",
+    "decrypt_file_aead",
+    "encrypt_file",
+    "encrypt_file_aead",
+]
+
+_Path = typing.Union[str, "os.PathLike[str]"]
+
+
+@contextlib.contextmanager
+def _mapped(
+    f: typing.BinaryIO, length: int, access: int
+) -> typing.Iterator[memoryview]:
+    # Zero length files can't be mapped.
+    if length == 0:
+        with memoryview(bytearray()) as view:
+            yield view
+        return
+
+    with mmap.mmap(f.fileno(), length, access=access) as m:
+        with memoryview(m) as view:
+            yield view
+
+
+def _transform(
+    src_path: _Path,
+    dst_path: _Path,
+    output_length: typing.Callable[[int], int],
+    process: typing.Callable[[memoryview, memoryview], None],
+) -> None:
+    with open(src_path, "rb") as src:
+        src_stat = os.fstat(src.fileno())
+        # Opening the destination truncates it, which would destroy the
+        # input if they're the same file.
+        with contextlib.suppress(FileNotFoundError):
+            if os.path.samestat(src_stat, os.stat(dst_path)):
+                raise ValueError(
+                    "src_path and dst_path must not refer to the same file"
+                )
+        length = src_stat.st_size
+        dst_length = output_length(length)
+        with open(dst_path, "w+b") as dst:
+            try:
+                dst.truncate(dst_length)
+                with _mapped(
+                    src, length, mmap.ACCESS_READ
+                ) as src_view, _mapped(
+                    dst, dst_length, mmap.ACCESS_WRITE
+                ) as dst_view:
+                    process(src_view, dst_view)
+            except BaseException:
+                # Never leave partially processed output behind.
+                dst.truncate(0)
+                raise
+
+
+def _check_cipher(cipher: Cipher) -> None:
+    if not isinstance(cipher, Cipher):
+        raise TypeError("cipher must be an instance of Cipher")
+    if isinstance(cipher.mode, modes.ModeWithAuthenticationTag):
+        raise TypeError(
+            "Authenticated modes are not supported, use encrypt_file_aead "
+            "and decrypt_file_aead instead"
+        )
+    if isinstance(cipher.mode, modes.XTS):
+        raise TypeError("XTS mode is not supported")
+
+
+def _process_cipher(
+    ctx: CipherContext, cipher: Cipher, src: memoryview, dst: memoryview
+) -> None:
+    # update_into requires block_size - 1 bytes of space beyond the input, so
+    # the final bytes are processed with update and copied in.
+    if isinstance(cipher.algorithm, BlockCipherAlgorithm):
+        slack = cipher.algorithm.block_size // 8 - 1
+    else:
+        slack = 0
+    head = max(len(src) - slack, 0)
+    written = 0
+    if head:
+        with src[:head] as data:
+            written = ctx.update_into(data, dst)
+    with src[head:] as data:
+        tail = ctx.update(data) + ctx.finalize()
+    dst[written : written + len(tail)] = tail
+
+
+def encrypt_file(src_path: _Path, dst_path: _Path, cipher: Cipher) -> None:
+    _check_cipher(cipher)
+    ctx = cipher.encryptor()
+    _transform(
+        src_path,
+        dst_path,
+        lambda length: length,
+        lambda src, dst: _process_cipher(ctx, cipher, src, dst),
+    )
+
+
+def decrypt_file(src_path: _Path, dst_path: _Path, cipher: Cipher) -> None:
+    _check_cipher(cipher)
+    ctx = cipher.decryptor()
+    _transform(
+        src_path,
+        dst_path,
+        lambda length: length,
+        lambda src, dst: _process_cipher(ctx, cipher, src, dst),
+    )
+
+
+def _segment_count(length: int, segment_size: int) -> int:
+    # Mirrors StreamEncryptor.update, which always holds back at least one
+    # byte for the final segment.
+    return max(1, -(-length // segment_size))
+
+
+def encrypt_file_aead(
+    src_path: _Path,
+    dst_path: _Path,
+    aead: _stream.StreamAEAD,
+    nonce_prefix: bytes,
+    segment_size: int,
+    associated_data: bytes | None = None,
+) -> None:
+    _stream.check_arguments(aead, nonce_prefix, segment_size, associated_data)
+
+    def output_length(length: int) -> int:
+        segments = _segment_count(length, segment_size)
+        return length + segments * _stream.TAG_LENGTH
+
+    def process(src: memoryview, dst: memoryview) -> None:
+        segments = _segment_count(len(src), segment_size)
+        for i in range(segments):
+            start = i * segment_size
+            end = min(start + segment_size, len(src))
+            dst_start = start + i * _stream.TAG_LENGTH
+            dst_end = dst_start + (end - start) + _stream.TAG_LENGTH
+            nonce = _stream.segment_nonce(nonce_prefix, i, i == segments - 1)
+            with src[start:end] as data, dst[dst_start:dst_end] as buf:
+                aead.encrypt_into(nonce, data, associated_data, buf)
+
+    _transform(src_path, dst_path, output_length, process)
+
+
+def decrypt_file_aead(
+    src_path: _Path,
+    dst_path: _Path,
+    aead: _stream.StreamAEAD,
+    nonce_prefix: bytes,
+    segment_size: int,
+    associated_data: bytes | None = None,
+) -> None:
+    _stream.check_arguments(aead, nonce_prefix, segment_size, associated_data)
+    input_segment_size = segment_size + _stream.TAG_LENGTH
+
+    def output_length(length: int) -> int:
+        segments = _segment_count(length, input_segment_size)
+        last = length - (segments - 1) * input_segment_size
+        if last < _stream.TAG_LENGTH:
+            raise InvalidTag
+        return length - segments * _stream.TAG_LENGTH
+
+    def process(src: memoryview, dst: memoryview) -> None:
+        segments = _segment_count(len(src), input_segment_size)
+        for i in range(segments):
+            start = i * input_segment_size
+            end = min(start + input_segment_size, len(src))
+            dst_start = i * segment_size
+            dst_end = dst_start + (end - start) - _stream.TAG_LENGTH
+            nonce = _stream.segment_nonce(nonce_prefix, i, i == segments - 1)
+            with src[start:end] as data, dst[dst_start:dst_end] as buf:
+                aead.decrypt_into(nonce, data, associated_data, buf)
+
+    _transform(src_path, dst_path, output_length, process)
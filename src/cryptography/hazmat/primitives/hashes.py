@@ -31,7 +31,11 @@ __all__ = [
     "Hash",
     "HashAlgorithm",
     "HashContext",
+    "TreeHash",
     "XOFHash",
+    "digest",
+    "digest_many",
+    "hash_file",
 ]
 
 
@@ -89,6 +93,13 @@ class HashContext(metaclass=abc.ABCMeta):
 Hash = rust_openssl.hashes.Hash
 HashContext.register(Hash)
 
+TreeHash = rust_openssl.hashes.TreeHash
+HashContext.register(TreeHash)
+
+digest = rust_openssl.hashes.digest
+digest_many = rust_openssl.hashes.digest_many
+hash_file = rust_openssl.hashes.hash_file
+
 XOFHash = rust_openssl.hashes.XOFHash
 
 
@@ -0,0 +1,17 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import annotations
+
+from cryptography.hazmat.bindings._rust import openssl as rust_openssl
+
+__all__ = ["random_bytes"]
+
+
+def random_bytes(length: int) -> bytes:
+    if not isinstance(length, int):
+        raise TypeError("length must be an integer.")
+    if length < 0:
+        raise ValueError("length must be non-negative.")
+    return rust_openssl.rand.random_bytes(length)
@@ -4,7 +4,8 @@
 
 use pyo3::types::{PyAnyMethods, PyListMethods};
 
-use crate::buf::CffiBuf;
+use crate::backend::utils::allow_threads_if_large;
+use crate::buf::{CffiBuf, CffiMutBuf};
 use crate::error::{CryptographyError, CryptographyResult};
 use crate::exceptions;
 
@@ -21,24 +22,100 @@ fn check_length(data: &[u8]) -> CryptographyResult<()> {
     Ok(())
 }
 
+fn check_buffer_length(buf: &[u8], expected: usize) -> CryptographyResult<()> {
+    if buf.len() != expected {
+        return Err(CryptographyError::from(
+            pyo3::exceptions::PyValueError::new_err(format!(
+                "buffer must be {expected} bytes for this payload"
+            )),
+        ));
+    }
+
+    Ok(())
+}
+
+// A single (nonce, data, associated data) record in a batch operation.
+type BatchItem<'a> = (&'a [u8], &'a [u8], Option<&'a [u8]>);
+
 enum Aad<'a> {
     Single(CffiBuf<'a>),
     List(pyo3::Bound<'a, pyo3::types::PyList>),
 }
 
+// The maximum number of idle contexts a `CipherCtxPool` keeps around. This
+// only needs to be as large as the number of threads concurrently using a
+// single AEAD object.
+const MAX_POOLED_CTXS: usize = 16;
+
+// A pool of keyed cipher contexts which have been used before. Creating a
+// keyed context (and with it the key schedule) for every operation dominates
+// the cost of processing small messages. For some ciphers (GCM,
+// ChaCha20-Poly1305 and CCM) re-initializing a context with just a new nonce
+// completely resets it, so those contexts can be reused instead.
+struct CipherCtxPool {
+    reuse: bool,
+    ctxs: std::sync::Mutex<Vec<openssl::cipher_ctx::CipherCtx>>,
+}
+
+impl CipherCtxPool {
+    fn new(reuse: bool) -> CipherCtxPool {
+        CipherCtxPool {
+            reuse,
+            ctxs: std::sync::Mutex::new(vec![]),
+        }
+    }
+
+    // Calls `f` with a context from the pool, or with a new one from
+    // `new_ctx` if there isn't one to reuse.
+    fn with_ctx<T>(
+        &self,
+        new_ctx: impl FnOnce() -> CryptographyResult<openssl::cipher_ctx::CipherCtx>,
+        f: impl FnOnce(&mut openssl::cipher_ctx::CipherCtx) -> CryptographyResult<T>,
+    ) -> CryptographyResult<T> {
+        let pooled = if self.reuse {
+            self.ctxs.lock().unwrap().pop()
+        } else {
+            None
+        };
+        let mut ctx = match pooled {
+            Some(ctx) => ctx,
+            None => new_ctx()?,
+        };
+
+        let result = f(&mut ctx);
+
+        // Contexts are only returned to the pool if they were used
+        // successfully, so we never have to reason about what state a failed
+        // operation left one in.
+        if self.reuse && result.is_ok() {
+            let mut ctxs = self.ctxs.lock().unwrap();
+            if ctxs.len() < MAX_POOLED_CTXS {
+                ctxs.push(ctx);
+            }
+        }
+
+        result
+    }
+}
+
 struct EvpCipherAead {
     base_encryption_ctx: openssl::cipher_ctx::CipherCtx,
     base_decryption_ctx: openssl::cipher_ctx::CipherCtx,
+    encryption_ctxs: CipherCtxPool,
+    decryption_ctxs: CipherCtxPool,
     tag_len: usize,
     tag_first: bool,
 }
 
 impl EvpCipherAead {
+    // `reuse_ctxs` must only be set for ciphers where re-initializing a
+    // context with a new nonce fully resets its state, see `CipherCtxPool`.
     fn new(
         cipher: &openssl::cipher::CipherRef,
         key: &[u8],
         tag_len: usize,
         tag_first: bool,
+        reuse_ctxs: bool,
     ) -> CryptographyResult<EvpCipherAead> {
         let mut base_encryption_ctx = openssl::cipher_ctx::CipherCtx::new()?;
         base_encryption_ctx.encrypt_init(Some(cipher), Some(key), None)?;
@@ -48,11 +125,37 @@ impl EvpCipherAead {
         Ok(EvpCipherAead {
             base_encryption_ctx,
             base_decryption_ctx,
+            encryption_ctxs: CipherCtxPool::new(reuse_ctxs),
+            decryption_ctxs: CipherCtxPool::new(reuse_ctxs),
             tag_len,
             tag_first,
         })
     }
 
+    fn copy_ctx(
+        base: &openssl::cipher_ctx::CipherCtx,
+    ) -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        ctx.copy(base)?;
+        Ok(ctx)
+    }
+
+    fn with_encryption_ctx<T>(
+        &self,
+        f: impl FnOnce(&mut openssl::cipher_ctx::CipherCtx) -> CryptographyResult<T>,
+    ) -> CryptographyResult<T> {
+        self.encryption_ctxs
+            .with_ctx(|| Self::copy_ctx(&self.base_encryption_ctx), f)
+    }
+
+    fn with_decryption_ctx<T>(
+        &self,
+        f: impl FnOnce(&mut openssl::cipher_ctx::CipherCtx) -> CryptographyResult<T>,
+    ) -> CryptographyResult<T> {
+        self.decryption_ctxs
+            .with_ctx(|| Self::copy_ctx(&self.base_decryption_ctx), f)
+    }
+
     fn process_aad(
         ctx: &mut openssl::cipher_ctx::CipherCtx,
         aad: Option<Aad<'_>>,
@@ -134,31 +237,50 @@ impl EvpCipherAead {
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
-        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
-        ctx.copy(&self.base_encryption_ctx)?;
-        Self::encrypt_with_context(
-            py,
-            ctx,
-            plaintext,
-            aad,
-            nonce,
-            self.tag_len,
-            self.tag_first,
-            false,
-        )
+        self.with_encryption_ctx(|ctx| {
+            Self::encrypt_with_context(
+                py,
+                ctx,
+                plaintext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                false,
+            )
+        })
     }
 
-    #[allow(clippy::too_many_arguments)]
-    fn encrypt_with_context<'p>(
-        py: pyo3::Python<'p>,
-        mut ctx: openssl::cipher_ctx::CipherCtx,
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        plaintext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        self.with_encryption_ctx(|ctx| {
+            Self::encrypt_into_with_context(
+                py,
+                ctx,
+                plaintext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                false,
+                buf,
+            )
+        })
+    }
+
+    fn init_encrypt(
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
         plaintext: &[u8],
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
-        tag_len: usize,
-        tag_first: bool,
         is_ccm: bool,
-    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    ) -> CryptographyResult<()> {
         check_length(plaintext)?;
 
         if !is_ccm {
@@ -171,29 +293,79 @@ impl EvpCipherAead {
             ctx.set_data_len(plaintext.len())?;
         }
 
-        Self::process_aad(&mut ctx, aad)?;
+        Self::process_aad(ctx, aad)
+    }
+
+    fn encrypt_data(
+        py: pyo3::Python<'_>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        plaintext: &[u8],
+        out: &mut [u8],
+        tag_len: usize,
+        tag_first: bool,
+        is_ccm: bool,
+    ) -> CryptographyResult<()> {
+        let ciphertext;
+        let tag;
+        if tag_first {
+            (tag, ciphertext) = out.split_at_mut(tag_len);
+        } else {
+            (ciphertext, tag) = out.split_at_mut(plaintext.len());
+        }
+
+        // The input buffers are held (and their buffer exports kept
+        // alive) by our caller, so they remain valid while the GIL is
+        // released.
+        allow_threads_if_large(py, plaintext.len(), || {
+            Self::process_data(ctx, plaintext, ciphertext, is_ccm)
+        })?;
+
+        ctx.tag(tag)?;
+
+        Ok(())
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn encrypt_with_context<'p>(
+        py: pyo3::Python<'p>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        plaintext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        tag_len: usize,
+        tag_first: bool,
+        is_ccm: bool,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        Self::init_encrypt(ctx, plaintext, aad, nonce, is_ccm)?;
 
         Ok(pyo3::types::PyBytes::new_with(
             py,
             plaintext.len() + tag_len,
             |b| {
-                let ciphertext;
-                let tag;
-                if tag_first {
-                    (tag, ciphertext) = b.split_at_mut(tag_len);
-                } else {
-                    (ciphertext, tag) = b.split_at_mut(plaintext.len());
-                }
-
-                Self::process_data(&mut ctx, plaintext, ciphertext, is_ccm)?;
-
-                ctx.tag(tag).map_err(CryptographyError::from)?;
-
+                Self::encrypt_data(py, ctx, plaintext, b, tag_len, tag_first, is_ccm)?;
                 Ok(())
             },
         )?)
     }
 
+    #[allow(clippy::too_many_arguments)]
+    fn encrypt_into_with_context(
+        py: pyo3::Python<'_>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        plaintext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        tag_len: usize,
+        tag_first: bool,
+        is_ccm: bool,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        check_buffer_length(buf, plaintext.len() + tag_len)?;
+        Self::init_encrypt(ctx, plaintext, aad, nonce, is_ccm)?;
+        Self::encrypt_data(py, ctx, plaintext, buf, tag_len, tag_first, is_ccm)?;
+        Ok(buf.len())
+    }
+
     fn decrypt<'p>(
         &self,
         py: pyo3::Python<'p>,
@@ -201,31 +373,54 @@ impl EvpCipherAead {
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
-        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
-        ctx.copy(&self.base_decryption_ctx)?;
-        Self::decrypt_with_context(
-            py,
-            ctx,
-            ciphertext,
-            aad,
-            nonce,
-            self.tag_len,
-            self.tag_first,
-            false,
-        )
+        self.with_decryption_ctx(|ctx| {
+            Self::decrypt_with_context(
+                py,
+                ctx,
+                ciphertext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                false,
+            )
+        })
     }
 
-    #[allow(clippy::too_many_arguments)]
-    fn decrypt_with_context<'p>(
-        py: pyo3::Python<'p>,
-        mut ctx: openssl::cipher_ctx::CipherCtx,
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
         ciphertext: &[u8],
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        self.with_decryption_ctx(|ctx| {
+            Self::decrypt_into_with_context(
+                py,
+                ctx,
+                ciphertext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                false,
+                buf,
+            )
+        })
+    }
+
+    // Returns the portion of `ciphertext` which is the actual encrypted data
+    // (i.e., without the tag).
+    fn init_decrypt<'a>(
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        ciphertext: &'a [u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
         tag_len: usize,
         tag_first: bool,
         is_ccm: bool,
-    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    ) -> CryptographyResult<&'a [u8]> {
         if ciphertext.len() < tag_len {
             return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
         }
@@ -253,30 +448,256 @@ impl EvpCipherAead {
             ctx.set_data_len(ciphertext_data.len())?;
         }
 
-        Self::process_aad(&mut ctx, aad)?;
+        Self::process_aad(ctx, aad)?;
+
+        Ok(ciphertext_data)
+    }
+
+    fn decrypt_data(
+        py: pyo3::Python<'_>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        ciphertext_data: &[u8],
+        out: &mut [u8],
+        is_ccm: bool,
+    ) -> CryptographyResult<()> {
+        allow_threads_if_large(py, ciphertext_data.len(), || {
+            Self::process_data(ctx, ciphertext_data, out, is_ccm)
+        })
+        .map_err(|_| exceptions::InvalidTag::new_err(()))?;
+
+        Ok(())
+    }
+
+    #[allow(clippy::too_many_arguments)]
+    fn decrypt_with_context<'p>(
+        py: pyo3::Python<'p>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        ciphertext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        tag_len: usize,
+        tag_first: bool,
+        is_ccm: bool,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let ciphertext_data =
+            Self::init_decrypt(ctx, ciphertext, aad, nonce, tag_len, tag_first, is_ccm)?;
 
         Ok(pyo3::types::PyBytes::new_with(
             py,
             ciphertext_data.len(),
             |b| {
-                Self::process_data(&mut ctx, ciphertext_data, b, is_ccm)
-                    .map_err(|_| exceptions::InvalidTag::new_err(()))?;
-
+                Self::decrypt_data(py, ctx, ciphertext_data, b, is_ccm)?;
                 Ok(())
             },
         )?)
     }
+
+    #[allow(clippy::too_many_arguments)]
+    fn decrypt_into_with_context(
+        py: pyo3::Python<'_>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        ciphertext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        tag_len: usize,
+        tag_first: bool,
+        is_ccm: bool,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        let ciphertext_data =
+            Self::init_decrypt(ctx, ciphertext, aad, nonce, tag_len, tag_first, is_ccm)?;
+        check_buffer_length(buf, ciphertext_data.len())?;
+
+        if let Err(e) = Self::decrypt_data(py, ctx, ciphertext_data, buf, is_ccm) {
+            // Don't leave unauthenticated plaintext in the caller's buffer.
+            buf.fill(0);
+            return Err(e);
+        }
+        Ok(buf.len())
+    }
+
+    #[cfg(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    ))]
+    fn encrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: &[BatchItem<'_>],
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        self.with_encryption_ctx(|ctx| {
+            Self::encrypt_many_with_context(py, ctx, items, self.tag_len)
+        })
+    }
+
+    #[cfg(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    ))]
+    fn decrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: &[BatchItem<'_>],
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        self.with_decryption_ctx(|ctx| {
+            Self::decrypt_many_with_context(py, ctx, items, self.tag_len)
+        })
+    }
+
+    #[cfg(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    ))]
+    fn decrypt_in_place(
+        &self,
+        py: pyo3::Python<'_>,
+        buf: &mut [u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+    ) -> CryptographyResult<usize> {
+        self.with_decryption_ctx(|ctx| {
+            Self::decrypt_in_place_with_context(py, ctx, buf, aad, nonce, self.tag_len)
+        })
+    }
+
+    // Decrypts the ciphertext in `buf`, which is followed by the tag, in
+    // place and returns the length of the plaintext. If the tag doesn't
+    // validate `buf` is zeroed. Only valid for AEADs which behave like stream
+    // ciphers and put the tag last (i.e., GCM and ChaCha20-Poly1305).
+    fn decrypt_in_place_with_context(
+        py: pyo3::Python<'_>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        buf: &mut [u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        tag_len: usize,
+    ) -> CryptographyResult<usize> {
+        let data_len = Self::init_decrypt(ctx, buf, aad, nonce, tag_len, false, false)?.len();
+
+        let data = &mut buf[..data_len];
+        let result = allow_threads_if_large(py, data_len, || {
+            let n = ctx.cipher_update_inplace(data, data_len)?;
+            assert_eq!(n, data_len);
+
+            let mut final_block = [0];
+            let n = ctx.cipher_final(&mut final_block)?;
+            assert_eq!(n, 0);
+            Ok::<(), openssl::error::ErrorStack>(())
+        });
+        if result.is_err() {
+            buf.fill(0);
+            return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
+        }
+
+        Ok(data_len)
+    }
+
+    // Encrypts every item in `items` with a single context, which is only
+    // re-initialized with each item's nonce (the key schedule is kept). Each
+    // ciphertext (with its tag appended) is written directly into its own
+    // bytes object. Only valid for AEADs whose nonce is supplied at init time
+    // and which don't need the data length up front (i.e., not CCM or SIV).
+    fn encrypt_many_with_context<'p>(
+        py: pyo3::Python<'p>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        items: &[BatchItem<'_>],
+        tag_len: usize,
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        items
+            .iter()
+            .map(|&(nonce, data, aad)| {
+                Ok(pyo3::types::PyBytes::new_with(
+                    py,
+                    data.len() + tag_len,
+                    |b| {
+                        let (ciphertext, tag) = b.split_at_mut(data.len());
+                        allow_threads_if_large(py, data.len(), || -> CryptographyResult<()> {
+                            ctx.set_iv_length(nonce.len())?;
+                            ctx.encrypt_init(None, None, Some(nonce))?;
+                            if let Some(ad) = aad {
+                                ctx.cipher_update(ad, None)?;
+                            }
+                            Self::process_data(ctx, data, ciphertext, false)?;
+                            ctx.tag(tag)?;
+                            Ok(())
+                        })?;
+                        Ok(())
+                    },
+                )?)
+            })
+            .collect()
+    }
+
+    // The decryption counterpart to `encrypt_many_with_context`. If any item
+    // fails to authenticate, `InvalidTag` is raised for the whole batch.
+    fn decrypt_many_with_context<'p>(
+        py: pyo3::Python<'p>,
+        ctx: &mut openssl::cipher_ctx::CipherCtx,
+        items: &[BatchItem<'_>],
+        tag_len: usize,
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        if items.iter().any(|(_, data, _)| data.len() < tag_len) {
+            return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
+        }
+
+        items
+            .iter()
+            .map(|&(nonce, data, aad)| {
+                let (ciphertext_data, tag) = data.split_at(data.len() - tag_len);
+                Ok(pyo3::types::PyBytes::new_with(
+                    py,
+                    ciphertext_data.len(),
+                    |b| {
+                        allow_threads_if_large(py, b.len(), || -> CryptographyResult<()> {
+                            ctx.set_iv_length(nonce.len())?;
+                            ctx.decrypt_init(None, None, Some(nonce))?;
+                            ctx.set_tag(tag)?;
+                            if let Some(ad) = aad {
+                                ctx.cipher_update(ad, None)?;
+                            }
+                            Self::process_data(ctx, ciphertext_data, b, false)?;
+                            Ok(())
+                        })
+                        .map_err(|_| exceptions::InvalidTag::new_err(()))?;
+                        Ok(())
+                    },
+                )?)
+            })
+            .collect()
+    }
 }
 
 struct LazyEvpCipherAead {
     cipher: &'static openssl::cipher::CipherRef,
     key: pyo3::Py<pyo3::PyAny>,
 
+    // Keyed contexts are only created when they're first used, so that
+    // constructing an object which is used once stays cheap. They're always
+    // created with a fresh init rather than copied from a keyed context,
+    // since copying is slow on the builds this type is used for. CCM binds
+    // the nonce length into the key schedule, so CCM contexts are pooled
+    // separately for each nonce length; see `pool_index`.
+    encryption_ctxs: Vec<CipherCtxPool>,
+    decryption_ctxs: Vec<CipherCtxPool>,
+
     tag_len: usize,
     tag_first: bool,
     is_ccm: bool,
 }
 
+// The range of nonce lengths AES-CCM accepts.
+const CCM_MIN_NONCE_LEN: usize = 7;
+const CCM_MAX_NONCE_LEN: usize = 13;
+
 impl LazyEvpCipherAead {
     #[cfg(not(CRYPTOGRAPHY_IS_BORINGSSL))]
     fn new(
@@ -286,15 +707,100 @@ impl LazyEvpCipherAead {
         tag_first: bool,
         is_ccm: bool,
     ) -> LazyEvpCipherAead {
+        let n_pools = if is_ccm {
+            CCM_MAX_NONCE_LEN - CCM_MIN_NONCE_LEN + 1
+        } else {
+            1
+        };
         LazyEvpCipherAead {
             cipher,
             key,
+            encryption_ctxs: (0..n_pools).map(|_| CipherCtxPool::new(true)).collect(),
+            decryption_ctxs: (0..n_pools).map(|_| CipherCtxPool::new(true)).collect(),
             tag_len,
             tag_first,
             is_ccm,
         }
     }
 
+    // Callers have already checked that CCM nonces are between 7 and 13
+    // bytes long.
+    fn pool_index(&self, nonce: Option<&[u8]>) -> usize {
+        if self.is_ccm {
+            nonce.unwrap().len() - CCM_MIN_NONCE_LEN
+        } else {
+            0
+        }
+    }
+
+    fn with_encryption_ctx<T>(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: Option<&[u8]>,
+        f: impl FnOnce(&mut openssl::cipher_ctx::CipherCtx) -> CryptographyResult<T>,
+    ) -> CryptographyResult<T> {
+        let new_ctx = || -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+            let key_buf = self.key.bind(py).extract::<CffiBuf<'_>>()?;
+
+            let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+            if self.is_ccm {
+                ctx.encrypt_init(Some(self.cipher), None, None)?;
+                ctx.set_iv_length(nonce.unwrap().len())?;
+                ctx.set_tag_length(self.tag_len)?;
+                ctx.encrypt_init(None, Some(key_buf.as_bytes()), None)?;
+            } else {
+                ctx.encrypt_init(Some(self.cipher), Some(key_buf.as_bytes()), None)?;
+            }
+            Ok(ctx)
+        };
+        self.encryption_ctxs[self.pool_index(nonce)].with_ctx(new_ctx, |ctx| {
+            // Initializing a keyed CCM context with just a nonce resets it,
+            // while keeping the key schedule. Other ciphers are given their
+            // nonce by `EvpCipherAead::init_encrypt`.
+            if self.is_ccm {
+                ctx.encrypt_init(None, None, nonce)?;
+            }
+            f(ctx)
+        })
+    }
+
+    fn with_decryption_ctx<T>(
+        &self,
+        py: pyo3::Python<'_>,
+        ciphertext: &[u8],
+        nonce: Option<&[u8]>,
+        f: impl FnOnce(&mut openssl::cipher_ctx::CipherCtx) -> CryptographyResult<T>,
+    ) -> CryptographyResult<T> {
+        if self.is_ccm && ciphertext.len() < self.tag_len {
+            return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
+        }
+
+        let new_ctx = || -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+            let key_buf = self.key.bind(py).extract::<CffiBuf<'_>>()?;
+
+            let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+            if self.is_ccm {
+                ctx.decrypt_init(Some(self.cipher), None, None)?;
+                ctx.set_iv_length(nonce.unwrap().len())?;
+                ctx.set_tag_length(self.tag_len)?;
+                ctx.decrypt_init(None, Some(key_buf.as_bytes()), None)?;
+            } else {
+                ctx.decrypt_init(Some(self.cipher), Some(key_buf.as_bytes()), None)?;
+            }
+            Ok(ctx)
+        };
+        self.decryption_ctxs[self.pool_index(nonce)].with_ctx(new_ctx, |ctx| {
+            // CCM needs the tag before any data is processed, see
+            // `with_encryption_ctx`.
+            if self.is_ccm {
+                let (_, tag) = ciphertext.split_at(ciphertext.len() - self.tag_len);
+                ctx.set_tag(tag)?;
+                ctx.decrypt_init(None, None, nonce)?;
+            }
+            f(ctx)
+        })
+    }
+
     fn encrypt<'p>(
         &self,
         py: pyo3::Python<'p>,
@@ -302,28 +808,41 @@ impl LazyEvpCipherAead {
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
-        let key_buf = self.key.bind(py).extract::<CffiBuf<'_>>()?;
-
-        let mut encryption_ctx = openssl::cipher_ctx::CipherCtx::new()?;
-        if self.is_ccm {
-            encryption_ctx.encrypt_init(Some(self.cipher), None, None)?;
-            encryption_ctx.set_iv_length(nonce.as_ref().unwrap().len())?;
-            encryption_ctx.set_tag_length(self.tag_len)?;
-            encryption_ctx.encrypt_init(None, Some(key_buf.as_bytes()), nonce)?;
-        } else {
-            encryption_ctx.encrypt_init(Some(self.cipher), Some(key_buf.as_bytes()), None)?;
-        }
+        self.with_encryption_ctx(py, nonce, |ctx| {
+            EvpCipherAead::encrypt_with_context(
+                py,
+                ctx,
+                plaintext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                self.is_ccm,
+            )
+        })
+    }
 
-        EvpCipherAead::encrypt_with_context(
-            py,
-            encryption_ctx,
-            plaintext,
-            aad,
-            nonce,
-            self.tag_len,
-            self.tag_first,
-            self.is_ccm,
-        )
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        plaintext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        self.with_encryption_ctx(py, nonce, |ctx| {
+            EvpCipherAead::encrypt_into_with_context(
+                py,
+                ctx,
+                plaintext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                self.is_ccm,
+                buf,
+            )
+        })
     }
 
     fn decrypt<'p>(
@@ -333,35 +852,97 @@ impl LazyEvpCipherAead {
         aad: Option<Aad<'_>>,
         nonce: Option<&[u8]>,
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
-        let key_buf = self.key.bind(py).extract::<CffiBuf<'_>>()?;
-
-        let mut decryption_ctx = openssl::cipher_ctx::CipherCtx::new()?;
-        if self.is_ccm {
-            decryption_ctx.decrypt_init(Some(self.cipher), None, None)?;
-            decryption_ctx.set_iv_length(nonce.as_ref().unwrap().len())?;
+        self.with_decryption_ctx(py, ciphertext, nonce, |ctx| {
+            EvpCipherAead::decrypt_with_context(
+                py,
+                ctx,
+                ciphertext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                self.is_ccm,
+            )
+        })
+    }
 
-            if ciphertext.len() < self.tag_len {
-                return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
-            }
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        ciphertext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        self.with_decryption_ctx(py, ciphertext, nonce, |ctx| {
+            EvpCipherAead::decrypt_into_with_context(
+                py,
+                ctx,
+                ciphertext,
+                aad,
+                nonce,
+                self.tag_len,
+                self.tag_first,
+                self.is_ccm,
+                buf,
+            )
+        })
+    }
 
-            let (_, tag) = ciphertext.split_at(ciphertext.len() - self.tag_len);
-            decryption_ctx.set_tag(tag)?;
+    #[cfg(not(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    )))]
+    fn encrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: &[BatchItem<'_>],
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        assert!(!self.is_ccm);
+        self.with_encryption_ctx(py, None, |ctx| {
+            EvpCipherAead::encrypt_many_with_context(py, ctx, items, self.tag_len)
+        })
+    }
 
-            decryption_ctx.decrypt_init(None, Some(key_buf.as_bytes()), nonce)?;
-        } else {
-            decryption_ctx.decrypt_init(Some(self.cipher), Some(key_buf.as_bytes()), None)?;
-        }
+    #[cfg(not(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    )))]
+    fn decrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: &[BatchItem<'_>],
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        assert!(!self.is_ccm);
+        self.with_decryption_ctx(py, b"", None, |ctx| {
+            EvpCipherAead::decrypt_many_with_context(py, ctx, items, self.tag_len)
+        })
+    }
 
-        EvpCipherAead::decrypt_with_context(
-            py,
-            decryption_ctx,
-            ciphertext,
-            aad,
-            nonce,
-            self.tag_len,
-            self.tag_first,
-            self.is_ccm,
-        )
+    #[cfg(not(any(
+        CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC,
+        not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+    )))]
+    fn decrypt_in_place(
+        &self,
+        py: pyo3::Python<'_>,
+        buf: &mut [u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+    ) -> CryptographyResult<usize> {
+        assert!(!self.is_ccm);
+        self.with_decryption_ctx(py, b"", nonce, |ctx| {
+            EvpCipherAead::decrypt_in_place_with_context(py, ctx, buf, aad, nonce, self.tag_len)
+        })
     }
 }
 
@@ -384,6 +965,45 @@ impl EvpAead {
         })
     }
 
+    fn aad_bytes<'a>(aad: &'a Option<Aad<'_>>) -> CryptographyResult<&'a [u8]> {
+        if let Some(Aad::Single(ad)) = aad {
+            check_length(ad.as_bytes())?;
+            Ok(ad.as_bytes())
+        } else {
+            assert!(aad.is_none());
+            Ok(b"")
+        }
+    }
+
+    fn encrypt_data(
+        &self,
+        py: pyo3::Python<'_>,
+        plaintext: &[u8],
+        ad: &[u8],
+        nonce: Option<&[u8]>,
+        out: &mut [u8],
+    ) -> CryptographyResult<()> {
+        allow_threads_if_large(py, plaintext.len(), || {
+            self.ctx.encrypt(plaintext, nonce.unwrap_or(b""), ad, out)
+        })?;
+        Ok(())
+    }
+
+    fn decrypt_data(
+        &self,
+        py: pyo3::Python<'_>,
+        ciphertext: &[u8],
+        ad: &[u8],
+        nonce: Option<&[u8]>,
+        out: &mut [u8],
+    ) -> CryptographyResult<()> {
+        allow_threads_if_large(py, ciphertext.len(), || {
+            self.ctx.decrypt(ciphertext, nonce.unwrap_or(b""), ad, out)
+        })
+        .map_err(|_| exceptions::InvalidTag::new_err(()))?;
+        Ok(())
+    }
+
     fn encrypt<'p>(
         &self,
         py: pyo3::Python<'p>,
@@ -392,26 +1012,34 @@ impl EvpAead {
         nonce: Option<&[u8]>,
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
         check_length(plaintext)?;
+        let ad = Self::aad_bytes(&aad)?;
 
-        let ad = if let Some(Aad::Single(ad)) = &aad {
-            check_length(ad.as_bytes())?;
-            ad.as_bytes()
-        } else {
-            assert!(aad.is_none());
-            b""
-        };
         Ok(pyo3::types::PyBytes::new_with(
             py,
             plaintext.len() + self.tag_len,
             |b| {
-                self.ctx
-                    .encrypt(plaintext, nonce.unwrap_or(b""), ad, b)
-                    .map_err(CryptographyError::from)?;
+                self.encrypt_data(py, plaintext, ad, nonce, b)?;
                 Ok(())
             },
         )?)
     }
 
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        plaintext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        check_buffer_length(buf, plaintext.len() + self.tag_len)?;
+        check_length(plaintext)?;
+        let ad = Self::aad_bytes(&aad)?;
+
+        self.encrypt_data(py, plaintext, ad, nonce, buf)?;
+        Ok(buf.len())
+    }
+
     fn decrypt<'p>(
         &self,
         py: pyo3::Python<'p>,
@@ -422,27 +1050,39 @@ impl EvpAead {
         if ciphertext.len() < self.tag_len {
             return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
         }
-
-        let ad = if let Some(Aad::Single(ad)) = &aad {
-            check_length(ad.as_bytes())?;
-            ad.as_bytes()
-        } else {
-            assert!(aad.is_none());
-            b""
-        };
+        let ad = Self::aad_bytes(&aad)?;
 
         Ok(pyo3::types::PyBytes::new_with(
             py,
             ciphertext.len() - self.tag_len,
             |b| {
-                self.ctx
-                    .decrypt(ciphertext, nonce.unwrap_or(b""), ad, b)
-                    .map_err(|_| exceptions::InvalidTag::new_err(()))?;
-
+                self.decrypt_data(py, ciphertext, ad, nonce, b)?;
                 Ok(())
             },
         )?)
     }
+
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        ciphertext: &[u8],
+        aad: Option<Aad<'_>>,
+        nonce: Option<&[u8]>,
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        if ciphertext.len() < self.tag_len {
+            return Err(CryptographyError::from(exceptions::InvalidTag::new_err(())));
+        }
+        check_buffer_length(buf, ciphertext.len() - self.tag_len)?;
+        let ad = Self::aad_bytes(&aad)?;
+
+        if let Err(e) = self.decrypt_data(py, ciphertext, ad, nonce, buf) {
+            // Don't leave unauthenticated plaintext in the caller's buffer.
+            buf.fill(0);
+            return Err(e);
+        }
+        Ok(buf.len())
+    }
 }
 
 #[pyo3::pyclass(frozen, module = "cryptography.hazmat.bindings._rust.openssl.aead")]
@@ -469,6 +1109,18 @@ struct ChaCha20Poly1305 {
     ctx: LazyEvpCipherAead,
 }
 
+impl ChaCha20Poly1305 {
+    fn check_nonce(nonce: &[u8]) -> CryptographyResult<()> {
+        if nonce.len() != 12 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes"),
+            ));
+        }
+
+        Ok(())
+    }
+}
+
 #[pyo3::pymethods]
 impl ChaCha20Poly1305 {
     #[new]
@@ -508,6 +1160,7 @@ impl ChaCha20Poly1305 {
                         key_buf.as_bytes(),
                         16,
                         false,
+                        true,
                     )?,
                 })
             } else {
@@ -542,11 +1195,7 @@ impl ChaCha20Poly1305 {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() != 12 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
         self.ctx
             .encrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
@@ -563,15 +1212,57 @@ impl ChaCha20Poly1305 {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() != 12 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
         self.ctx
             .decrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
     }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx.encrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx.decrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
 }
 
 #[pyo3::pyclass(
@@ -599,6 +1290,40 @@ struct AesGcm {
     ctx: LazyEvpCipherAead,
 }
 
+impl AesGcm {
+    fn check_nonce(nonce: &[u8]) -> CryptographyResult<()> {
+        if nonce.len() < 8 || nonce.len() > 128 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Nonce must be between 8 and 128 bytes"),
+            ));
+        }
+
+        Ok(())
+    }
+
+    // Validates every item up front, so that a batch either fails before
+    // any work is done or is processed in its entirety.
+    fn batch_items<'a>(
+        items: &'a [(CffiBuf<'_>, CffiBuf<'_>, Option<CffiBuf<'_>>)],
+    ) -> CryptographyResult<Vec<BatchItem<'a>>> {
+        items
+            .iter()
+            .map(|(nonce, data, associated_data)| {
+                Self::check_nonce(nonce.as_bytes())?;
+                check_length(data.as_bytes())?;
+                if let Some(ad) = associated_data {
+                    check_length(ad.as_bytes())?;
+                }
+                Ok((
+                    nonce.as_bytes(),
+                    data.as_bytes(),
+                    associated_data.as_ref().map(|ad| ad.as_bytes()),
+                ))
+            })
+            .collect()
+    }
+}
+
 #[pyo3::pymethods]
 impl AesGcm {
     #[new]
@@ -626,7 +1351,7 @@ impl AesGcm {
                 not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
             ))] {
                 Ok(AesGcm {
-                    ctx: EvpCipherAead::new(cipher, key_buf.as_bytes(), 16, false)?,
+                    ctx: EvpCipherAead::new(cipher, key_buf.as_bytes(), 16, false, true)?,
                 })
             } else {
                 Ok(AesGcm {
@@ -651,46 +1376,136 @@ impl AesGcm {
         crate::backend::rand::get_rand_bytes(py, bit_length / 8)
     }
 
-    #[pyo3(signature = (nonce, data, associated_data))]
-    fn encrypt<'p>(
+    #[pyo3(signature = (nonce, data, associated_data))]
+    fn encrypt<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx
+            .encrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data))]
+    fn decrypt<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx
+            .decrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx.encrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn decrypt_into(
         &self,
-        py: pyo3::Python<'p>,
+        py: pyo3::Python<'_>,
         nonce: CffiBuf<'_>,
         data: CffiBuf<'_>,
         associated_data: Option<CffiBuf<'_>>,
-    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 8 || nonce_bytes.len() > 128 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 8 and 128 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
-        self.ctx
-            .encrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
+        self.ctx.decrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
     }
 
-    #[pyo3(signature = (nonce, data, associated_data))]
-    fn decrypt<'p>(
+    #[pyo3(signature = (items,))]
+    fn encrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: Vec<(CffiBuf<'_>, CffiBuf<'_>, Option<CffiBuf<'_>>)>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyList>> {
+        let items = Self::batch_items(&items)?;
+        let results = self.ctx.encrypt_many(py, &items)?;
+        Ok(pyo3::types::PyList::new(py, results)?)
+    }
+
+    #[pyo3(signature = (items,))]
+    fn decrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        items: Vec<(CffiBuf<'_>, CffiBuf<'_>, Option<CffiBuf<'_>>)>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyList>> {
+        let items = Self::batch_items(&items)?;
+        let results = self.ctx.decrypt_many(py, &items)?;
+        Ok(pyo3::types::PyList::new(py, results)?)
+    }
+
+    #[pyo3(signature = (nonce, buf, associated_data))]
+    fn decrypt_in_place<'p>(
         &self,
         py: pyo3::Python<'p>,
         nonce: CffiBuf<'_>,
-        data: CffiBuf<'_>,
+        buf: pyo3::Bound<'p, pyo3::PyAny>,
         associated_data: Option<CffiBuf<'_>>,
-    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 8 || nonce_bytes.len() > 128 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 8 and 128 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
-        self.ctx
-            .decrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
+        let n = {
+            let mut data = buf.extract::<CffiMutBuf<'_>>()?;
+            check_length(data.as_mut_bytes())?;
+            self.ctx
+                .decrypt_in_place(py, data.as_mut_bytes(), aad, Some(nonce_bytes))?
+        };
+
+        Ok(
+            pyo3::types::PyMemoryView::from(&buf)?.get_item(pyo3::types::PySlice::new(
+                py,
+                0,
+                n.try_into().unwrap(),
+                1,
+            ))?,
+        )
     }
 }
 
@@ -704,6 +1519,29 @@ struct AesCcm {
     tag_length: usize,
 }
 
+impl AesCcm {
+    fn check_nonce(nonce: &[u8], plaintext_len: usize) -> CryptographyResult<()> {
+        if nonce.len() < 7 || nonce.len() > 13 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Nonce must be between 7 and 13 bytes"),
+            ));
+        }
+        // For information about computing this, see
+        // https://tools.ietf.org/html/rfc3610#section-2.1
+        let l_val = 15 - nonce.len();
+        let max_length = 1usize.checked_shl(8 * l_val as u32);
+        // If `max_length` overflowed, then it's not possible for data to be
+        // longer than it.
+        if max_length.map(|v| v < plaintext_len).unwrap_or(false) {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Data too long for nonce"),
+            ));
+        }
+
+        Ok(())
+    }
+}
+
 #[pyo3::pymethods]
 impl AesCcm {
     #[new]
@@ -778,24 +1616,8 @@ impl AesCcm {
         let data_bytes = data.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 7 || nonce_bytes.len() > 13 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 7 and 13 bytes"),
-            ));
-        }
-
         check_length(data_bytes)?;
-        // For information about computing this, see
-        // https://tools.ietf.org/html/rfc3610#section-2.1
-        let l_val = 15 - nonce_bytes.len();
-        let max_length = 1usize.checked_shl(8 * l_val as u32);
-        // If `max_length` overflowed, then it's not possible for data to be
-        // longer than it.
-        if max_length.map(|v| v < data_bytes.len()).unwrap_or(false) {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Data too long for nonce"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes, data_bytes.len())?;
 
         self.ctx.encrypt(py, data_bytes, aad, Some(nonce_bytes))
     }
@@ -812,26 +1634,51 @@ impl AesCcm {
         let data_bytes = data.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 7 || nonce_bytes.len() > 13 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 7 and 13 bytes"),
-            ));
-        }
-        // For information about computing this, see
-        // https://tools.ietf.org/html/rfc3610#section-2.1
-        let l_val = 15 - nonce_bytes.len();
-        let max_length = 1usize.checked_shl(8 * l_val as u32);
-        // If `max_length` overflowed, then it's not possible for data to be
-        // longer than it.
         let pt_length = data_bytes.len().saturating_sub(self.tag_length);
-        if max_length.map(|v| v < pt_length).unwrap_or(false) {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Data too long for nonce"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes, pt_length)?;
 
         self.ctx.decrypt(py, data_bytes, aad, Some(nonce_bytes))
     }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let data_bytes = data.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        check_length(data_bytes)?;
+        Self::check_nonce(nonce_bytes, data_bytes.len())?;
+
+        self.ctx
+            .encrypt_into(py, data_bytes, aad, Some(nonce_bytes), buf.as_mut_bytes())
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let data_bytes = data.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        let pt_length = data_bytes.len().saturating_sub(self.tag_length);
+        Self::check_nonce(nonce_bytes, pt_length)?;
+
+        self.ctx
+            .decrypt_into(py, data_bytes, aad, Some(nonce_bytes), buf.as_mut_bytes())
+    }
 }
 
 #[pyo3::pyclass(
@@ -843,6 +1690,21 @@ struct AesSiv {
     ctx: EvpCipherAead,
 }
 
+impl AesSiv {
+    fn check_data(data: &[u8]) -> CryptographyResult<()> {
+        #[cfg(not(CRYPTOGRAPHY_OPENSSL_350_OR_GREATER))]
+        if data.is_empty() {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("data must not be zero length"),
+            ));
+        };
+        #[cfg(CRYPTOGRAPHY_OPENSSL_350_OR_GREATER)]
+        let _ = data;
+
+        Ok(())
+    }
+}
+
 #[pyo3::pymethods]
 impl AesSiv {
     #[new]
@@ -873,7 +1735,7 @@ impl AesSiv {
 
                 let cipher = openssl::cipher::Cipher::fetch(None, cipher_name, None)?;
                 Ok(AesSiv {
-                    ctx: EvpCipherAead::new(&cipher, key.as_bytes(), 16, true)?,
+                    ctx: EvpCipherAead::new(&cipher, key.as_bytes(), 16, true, false)?,
                 })
             } else {
                 _ = cipher_name;
@@ -912,12 +1774,7 @@ impl AesSiv {
         let data_bytes = data.as_bytes();
         let aad = associated_data.map(Aad::List);
 
-        #[cfg(not(CRYPTOGRAPHY_OPENSSL_350_OR_GREATER))]
-        if data_bytes.is_empty() {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("data must not be zero length"),
-            ));
-        };
+        Self::check_data(data_bytes)?;
         self.ctx.encrypt(py, data_bytes, aad, None)
     }
 
@@ -931,6 +1788,35 @@ impl AesSiv {
         let aad = associated_data.map(Aad::List);
         self.ctx.decrypt(py, data.as_bytes(), aad, None)
     }
+
+    #[pyo3(signature = (data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<pyo3::Bound<'_, pyo3::types::PyList>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let data_bytes = data.as_bytes();
+        let aad = associated_data.map(Aad::List);
+
+        Self::check_data(data_bytes)?;
+        self.ctx
+            .encrypt_into(py, data_bytes, aad, None, buf.as_mut_bytes())
+    }
+
+    #[pyo3(signature = (data, associated_data, buf))]
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<pyo3::Bound<'_, pyo3::types::PyList>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let aad = associated_data.map(Aad::List);
+        self.ctx
+            .decrypt_into(py, data.as_bytes(), aad, None, buf.as_mut_bytes())
+    }
 }
 
 #[pyo3::pyclass(
@@ -942,6 +1828,18 @@ struct AesOcb3 {
     ctx: EvpCipherAead,
 }
 
+impl AesOcb3 {
+    fn check_nonce(nonce: &[u8]) -> CryptographyResult<()> {
+        if nonce.len() < 12 || nonce.len() > 15 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Nonce must be between 12 and 15 bytes"),
+            ));
+        }
+
+        Ok(())
+    }
+}
+
 #[pyo3::pymethods]
 impl AesOcb3 {
     #[new]
@@ -980,7 +1878,7 @@ impl AesOcb3 {
                 };
 
                 Ok(AesOcb3 {
-                    ctx: EvpCipherAead::new(cipher, key.as_bytes(), 16, false)?,
+                    ctx: EvpCipherAead::new(cipher, key.as_bytes(), 16, false, false)?,
                 })
             }
         }
@@ -1011,11 +1909,7 @@ impl AesOcb3 {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 12 || nonce_bytes.len() > 15 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 12 and 15 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
         self.ctx
             .encrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
@@ -1032,15 +1926,57 @@ impl AesOcb3 {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        if nonce_bytes.len() < 12 || nonce_bytes.len() > 15 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be between 12 and 15 bytes"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
 
         self.ctx
             .decrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
     }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx.encrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_nonce(nonce_bytes)?;
+
+        self.ctx.decrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
 }
 
 #[pyo3::pyclass(
@@ -1055,6 +1991,39 @@ struct AesGcmSiv {
     ctx: EvpCipherAead,
 }
 
+impl AesGcmSiv {
+    fn check_data(data: &[u8]) -> CryptographyResult<()> {
+        #[cfg(not(any(
+            CRYPTOGRAPHY_OPENSSL_350_OR_GREATER,
+            CRYPTOGRAPHY_IS_BORINGSSL,
+            CRYPTOGRAPHY_IS_AWSLC
+        )))]
+        if data.is_empty() {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("data must not be zero length"),
+            ));
+        };
+        #[cfg(any(
+            CRYPTOGRAPHY_OPENSSL_350_OR_GREATER,
+            CRYPTOGRAPHY_IS_BORINGSSL,
+            CRYPTOGRAPHY_IS_AWSLC
+        ))]
+        let _ = data;
+
+        Ok(())
+    }
+
+    fn check_nonce(nonce: &[u8]) -> CryptographyResult<()> {
+        if nonce.len() != 12 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes long"),
+            ));
+        }
+
+        Ok(())
+    }
+}
+
 #[pyo3::pymethods]
 impl AesGcmSiv {
     #[new]
@@ -1107,7 +2076,7 @@ impl AesGcmSiv {
                 }
                 let cipher = openssl::cipher::Cipher::fetch(None, cipher_name, None)?;
                 Ok(AesGcmSiv {
-                    ctx: EvpCipherAead::new(&cipher, key.as_bytes(), 16, false)?,
+                    ctx: EvpCipherAead::new(&cipher, key.as_bytes(), 16, false, false)?,
                 })
             }
         }
@@ -1139,21 +2108,8 @@ impl AesGcmSiv {
         let data_bytes = data.as_bytes();
         let aad = associated_data.map(Aad::Single);
 
-        #[cfg(not(any(
-            CRYPTOGRAPHY_OPENSSL_350_OR_GREATER,
-            CRYPTOGRAPHY_IS_BORINGSSL,
-            CRYPTOGRAPHY_IS_AWSLC
-        )))]
-        if data_bytes.is_empty() {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("data must not be zero length"),
-            ));
-        };
-        if nonce_bytes.len() != 12 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes long"),
-            ));
-        }
+        Self::check_data(data_bytes)?;
+        Self::check_nonce(nonce_bytes)?;
         self.ctx.encrypt(py, data_bytes, aad, Some(nonce_bytes))
     }
 
@@ -1167,14 +2123,50 @@ impl AesGcmSiv {
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
         let nonce_bytes = nonce.as_bytes();
         let aad = associated_data.map(Aad::Single);
-        if nonce_bytes.len() != 12 {
-            return Err(CryptographyError::from(
-                pyo3::exceptions::PyValueError::new_err("Nonce must be 12 bytes long"),
-            ));
-        }
+        Self::check_nonce(nonce_bytes)?;
         self.ctx
             .decrypt(py, data.as_bytes(), aad, Some(nonce_bytes))
     }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn encrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let data_bytes = data.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+
+        Self::check_data(data_bytes)?;
+        Self::check_nonce(nonce_bytes)?;
+        self.ctx
+            .encrypt_into(py, data_bytes, aad, Some(nonce_bytes), buf.as_mut_bytes())
+    }
+
+    #[pyo3(signature = (nonce, data, associated_data, buf))]
+    fn decrypt_into(
+        &self,
+        py: pyo3::Python<'_>,
+        nonce: CffiBuf<'_>,
+        data: CffiBuf<'_>,
+        associated_data: Option<CffiBuf<'_>>,
+        mut buf: CffiMutBuf<'_>,
+    ) -> CryptographyResult<usize> {
+        let nonce_bytes = nonce.as_bytes();
+        let aad = associated_data.map(Aad::Single);
+        Self::check_nonce(nonce_bytes)?;
+        self.ctx.decrypt_into(
+            py,
+            data.as_bytes(),
+            aad,
+            Some(nonce_bytes),
+            buf.as_mut_bytes(),
+        )
+    }
 }
 
 #[pyo3::pymodule]
@@ -2,49 +2,109 @@
 // 2.0, and the BSD License. See the LICENSE file in the root of this repository
 // for complete details.
 
-use pyo3::types::PyAnyMethods;
+use pyo3::types::{PyAnyMethods, PyBytesMethods};
 use pyo3::IntoPyObject;
 
 use crate::backend::cipher_registry;
+use crate::backend::utils::{
+    allow_threads_if_large, check_parallelism, map_in_threads, thread_count,
+};
 use crate::buf::{CffiBuf, CffiMutBuf};
 use crate::error::{CryptographyError, CryptographyResult};
 use crate::{exceptions, types};
 
+// OpenSSL's update functions take an `int` length, so data is passed to them
+// in chunks of at most this size.
+const MAX_UPDATE_CHUNK_SIZE: usize = 1 << 29;
+
+// The minimum update size which is split across threads when parallelism is
+// enabled. Below this the cost of starting threads outweighs the benefit.
+const PARALLEL_CTR_THRESHOLD: usize = 1 << 20;
+
+// `update` and `update_many` write directly into a `bytes` object sized by
+// `output_length`, which can't be resized afterwards. That prediction is exact
+// for every mode we support. If OpenSSL ever wrote less than predicted (for
+// example, a backend which buffers differently), fall back to copying what was
+// written into a `bytes` object of the right length, rather than panicking.
+fn shrink_output<'p>(
+    py: pyo3::Python<'p>,
+    out: pyo3::Bound<'p, pyo3::types::PyBytes>,
+    written: usize,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    let out_bytes = out.as_bytes();
+    if written == out_bytes.len() {
+        return Ok(out);
+    }
+    if written > out_bytes.len() {
+        return Err(CryptographyError::from(exceptions::InternalError::new_err(
+            (
+                format!(
+                    "Cipher update wrote {written} bytes, expected at most {}",
+                    out_bytes.len()
+                ),
+                Vec::<u32>::new(),
+            ),
+        )));
+    }
+    Ok(pyo3::types::PyBytes::new(py, &out_bytes[..written]))
+}
+
+// Tracks where in the keystream a CTR mode context is, so that a large update
+// can be split into pieces, each processed on its own thread by a context
+// initialized with the counter block for the start of that piece.
+struct CtrState {
+    nonce: u128,
+    // The number of bytes processed since the nonce was set.
+    position: u128,
+    parallelism: usize,
+}
+
 pub(crate) struct CipherContext {
     ctx: openssl::cipher_ctx::CipherCtx,
     py_mode: pyo3::PyObject,
     py_algorithm: pyo3::PyObject,
     side: openssl::symm::Mode,
+    is_xts: bool,
+    // The number of bytes of a partial block held by `ctx`. Padding is
+    // always disabled, so every complete block is output immediately and the
+    // size of each update's output is known in advance.
+    buffered: usize,
+    ctr: Option<CtrState>,
 }
 
 impl CipherContext {
-    pub(crate) fn new(
-        py: pyo3::Python<'_>,
-        algorithm: pyo3::Bound<'_, pyo3::PyAny>,
-        mode: pyo3::Bound<'_, pyo3::PyAny>,
-        side: openssl::symm::Mode,
-    ) -> CryptographyResult<CipherContext> {
-        let cipher =
-            match cipher_registry::get_cipher(py, algorithm.clone(), mode.get_type().into_any())? {
-                Some(c) => c,
-                None => {
-                    return Err(CryptographyError::from(
-                        exceptions::UnsupportedAlgorithm::new_err((
-                            format!(
-                                "cipher {} in {} mode is not supported ",
-                                algorithm.getattr(pyo3::intern!(py, "name"))?,
-                                if mode.is_truthy()? {
-                                    mode.getattr(pyo3::intern!(py, "name"))?
-                                } else {
-                                    mode
-                                }
-                            ),
-                            exceptions::Reasons::UNSUPPORTED_CIPHER,
-                        )),
-                    ))
-                }
-            };
+    fn get_cipher<'p>(
+        py: pyo3::Python<'p>,
+        algorithm: &pyo3::Bound<'_, pyo3::PyAny>,
+        mode: &pyo3::Bound<'_, pyo3::PyAny>,
+        mode_cls: pyo3::Bound<'_, pyo3::PyAny>,
+    ) -> CryptographyResult<&'p openssl::cipher::CipherRef> {
+        match cipher_registry::get_cipher(py, algorithm.clone(), mode_cls)? {
+            Some(c) => Ok(c),
+            None => Err(CryptographyError::from(
+                exceptions::UnsupportedAlgorithm::new_err((
+                    format!(
+                        "cipher {} in {} mode is not supported ",
+                        algorithm.getattr(pyo3::intern!(py, "name"))?,
+                        if mode.is_truthy()? {
+                            mode.getattr(pyo3::intern!(py, "name"))?
+                        } else {
+                            mode.clone()
+                        }
+                    ),
+                    exceptions::Reasons::UNSUPPORTED_CIPHER,
+                )),
+            )),
+        }
+    }
 
+    // Returns the IV, tweak, or nonce, whichever `mode` (or for ChaCha20,
+    // `algorithm`) has.
+    fn get_iv_nonce<'p>(
+        py: pyo3::Python<'p>,
+        algorithm: &pyo3::Bound<'p, pyo3::PyAny>,
+        mode: &pyo3::Bound<'p, pyo3::PyAny>,
+    ) -> CryptographyResult<Option<CffiBuf<'p>>> {
         let iv_nonce = if mode.is_instance(&types::MODE_WITH_INITIALIZATION_VECTOR.get(py)?)? {
             Some(
                 mode.getattr(pyo3::intern!(py, "initialization_vector"))?
@@ -69,47 +129,78 @@ impl CipherContext {
         } else {
             None
         };
+        Ok(iv_nonce)
+    }
 
-        let key = algorithm
-            .getattr(pyo3::intern!(py, "key"))?
-            .extract::<CffiBuf<'_>>()?;
-
-        let init_op = match side {
+    fn side_init_op(
+        side: openssl::symm::Mode,
+    ) -> fn(
+        &mut openssl::cipher_ctx::CipherCtxRef,
+        Option<&openssl::cipher::CipherRef>,
+        Option<&[u8]>,
+        Option<&[u8]>,
+    ) -> Result<(), openssl::error::ErrorStack> {
+        match side {
             openssl::symm::Mode::Encrypt => openssl::cipher_ctx::CipherCtxRef::encrypt_init,
             openssl::symm::Mode::Decrypt => openssl::cipher_ctx::CipherCtxRef::decrypt_init,
-        };
-
-        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
-        init_op(&mut ctx, Some(cipher), None, None)?;
-        ctx.set_key_length(key.as_bytes().len())?;
+        }
+    }
 
-        if let Some(iv) = iv_nonce.as_ref() {
-            if cipher.iv_length() != 0 && cipher.iv_length() != iv.as_bytes().len() {
-                ctx.set_iv_length(iv.as_bytes().len())?;
+    // Initializes `ctx` with `key` and `iv_nonce` (either of which may be
+    // `None` to leave it unset).
+    fn init_key_iv(
+        ctx: &mut openssl::cipher_ctx::CipherCtxRef,
+        side: openssl::symm::Mode,
+        is_xts: bool,
+        key: Option<&[u8]>,
+        iv_nonce: Option<&[u8]>,
+    ) -> CryptographyResult<()> {
+        if let Some(iv) = iv_nonce {
+            if ctx.iv_length() != 0 && ctx.iv_length() != iv.len() {
+                ctx.set_iv_length(iv.len())?;
             }
         }
 
-        if mode.is_instance(&types::XTS.get(py)?)? {
-            init_op(
-                &mut ctx,
-                None,
-                Some(key.as_bytes()),
-                iv_nonce.as_ref().map(|b| b.as_bytes()),
-            )
-            .map_err(|_| {
+        let init_op = Self::side_init_op(side);
+        if is_xts && key.is_some() {
+            init_op(ctx, None, key, iv_nonce).map_err(|_| {
                 pyo3::exceptions::PyValueError::new_err(
                     "In XTS mode duplicated keys are not allowed",
                 )
             })?;
         } else {
-            init_op(
-                &mut ctx,
-                None,
-                Some(key.as_bytes()),
-                iv_nonce.as_ref().map(|b| b.as_bytes()),
-            )?;
+            init_op(ctx, None, key, iv_nonce)?;
         };
 
+        Ok(())
+    }
+
+    pub(crate) fn new(
+        py: pyo3::Python<'_>,
+        algorithm: pyo3::Bound<'_, pyo3::PyAny>,
+        mode: pyo3::Bound<'_, pyo3::PyAny>,
+        side: openssl::symm::Mode,
+    ) -> CryptographyResult<CipherContext> {
+        let cipher = Self::get_cipher(py, &algorithm, &mode, mode.get_type().into_any())?;
+        let iv_nonce = Self::get_iv_nonce(py, &algorithm, &mode)?;
+
+        let key = algorithm
+            .getattr(pyo3::intern!(py, "key"))?
+            .extract::<CffiBuf<'_>>()?;
+
+        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        Self::side_init_op(side)(&mut ctx, Some(cipher), None, None)?;
+        ctx.set_key_length(key.as_bytes().len())?;
+
+        let is_xts = mode.is_instance(&types::XTS.get(py)?)?;
+        Self::init_key_iv(
+            &mut ctx,
+            side,
+            is_xts,
+            Some(key.as_bytes()),
+            iv_nonce.as_ref().map(|b| b.as_bytes()),
+        )?;
+
         ctx.set_padding(false);
 
         Ok(CipherContext {
@@ -117,9 +208,111 @@ impl CipherContext {
             py_mode: mode.into(),
             py_algorithm: algorithm.into(),
             side,
+            is_xts,
+            buffered: 0,
+            ctr: None,
         })
     }
 
+    // Creates a context for `algorithm` with its key set, but no IV, tweak,
+    // or nonce, to be used as the base for `from_keyed_ctx`.
+    fn new_keyed_ctx(
+        py: pyo3::Python<'_>,
+        algorithm: &pyo3::Bound<'_, pyo3::PyAny>,
+        mode_cls: &pyo3::Bound<'_, pyo3::PyAny>,
+        side: openssl::symm::Mode,
+    ) -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+        let cipher = Self::get_cipher(py, algorithm, mode_cls, mode_cls.clone())?;
+        let key = algorithm
+            .getattr(pyo3::intern!(py, "key"))?
+            .extract::<CffiBuf<'_>>()?;
+
+        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        Self::side_init_op(side)(&mut ctx, Some(cipher), None, None)?;
+        ctx.set_key_length(key.as_bytes().len())?;
+
+        let is_xts = mode_cls.is(&types::XTS.get(py)?);
+        Self::init_key_iv(&mut ctx, side, is_xts, Some(key.as_bytes()), None)?;
+        ctx.set_padding(false);
+
+        Ok(ctx)
+    }
+
+    // Creates a context for `mode` from `ctx`, which was created by
+    // `new_keyed_ctx` (or is a copy of one), so only the IV, tweak, or nonce
+    // needs to be set.
+    fn from_keyed_ctx(
+        py: pyo3::Python<'_>,
+        mut ctx: openssl::cipher_ctx::CipherCtx,
+        algorithm: pyo3::Bound<'_, pyo3::PyAny>,
+        mode: pyo3::Bound<'_, pyo3::PyAny>,
+        side: openssl::symm::Mode,
+    ) -> CryptographyResult<CipherContext> {
+        let iv_nonce = Self::get_iv_nonce(py, &algorithm, &mode)?;
+
+        let is_xts = mode.is_instance(&types::XTS.get(py)?)?;
+        Self::init_key_iv(
+            &mut ctx,
+            side,
+            is_xts,
+            None,
+            iv_nonce.as_ref().map(|b| b.as_bytes()),
+        )?;
+
+        Ok(CipherContext {
+            ctx,
+            py_mode: mode.into(),
+            py_algorithm: algorithm.into(),
+            side,
+            is_xts,
+            buffered: 0,
+            ctr: None,
+        })
+    }
+
+    fn init_op(
+        &self,
+    ) -> fn(
+        &mut openssl::cipher_ctx::CipherCtxRef,
+        Option<&openssl::cipher::CipherRef>,
+        Option<&[u8]>,
+        Option<&[u8]>,
+    ) -> Result<(), openssl::error::ErrorStack> {
+        Self::side_init_op(self.side)
+    }
+
+    fn set_parallelism(
+        &mut self,
+        py: pyo3::Python<'_>,
+        parallelism: i64,
+    ) -> CryptographyResult<()> {
+        let parallelism = check_parallelism(parallelism)?;
+        if parallelism == 1 {
+            return Ok(());
+        }
+        // Splitting the keystream requires knowing how the counter block is
+        // incremented, which we only do for 128-bit counters.
+        if !self.py_mode.bind(py).is_instance(&types::CTR.get(py)?)? || self.ctx.iv_length() != 16 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err(
+                    "parallelism is only supported for CTR mode with a 128-bit block cipher",
+                ),
+            ));
+        }
+
+        let nonce = self
+            .py_mode
+            .bind(py)
+            .getattr(pyo3::intern!(py, "nonce"))?
+            .extract::<CffiBuf<'_>>()?;
+        self.ctr = Some(CtrState {
+            nonce: u128::from_be_bytes(nonce.as_bytes().try_into().unwrap()),
+            position: 0,
+            parallelism,
+        });
+        Ok(())
+    }
+
     fn reset_nonce(&mut self, py: pyo3::Python<'_>, nonce: CffiBuf<'_>) -> CryptographyResult<()> {
         if !self
             .py_mode
@@ -145,11 +338,11 @@ impl CipherContext {
                 )),
             ));
         }
-        let init_op = match self.side {
-            openssl::symm::Mode::Encrypt => openssl::cipher_ctx::CipherCtxRef::encrypt_init,
-            openssl::symm::Mode::Decrypt => openssl::cipher_ctx::CipherCtxRef::decrypt_init,
-        };
-        init_op(&mut self.ctx, None, None, Some(nonce.as_bytes()))?;
+        self.init_op()(&mut self.ctx, None, None, Some(nonce.as_bytes()))?;
+        if let Some(ctr) = self.ctr.as_mut() {
+            ctr.nonce = u128::from_be_bytes(nonce.as_bytes().try_into().unwrap());
+            ctr.position = 0;
+        }
         Ok(())
     }
 
@@ -158,9 +351,44 @@ impl CipherContext {
         py: pyo3::Python<'p>,
         data: &[u8],
     ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
-        let mut buf = vec![0; data.len() + self.ctx.block_size()];
-        let n = self.update_into(py, data, &mut buf)?;
-        Ok(pyo3::types::PyBytes::new(py, &buf[..n]))
+        let out_len = self.output_length(data.len());
+        let mut written = 0;
+        let out = pyo3::types::PyBytes::new_with(py, out_len, |b| {
+            // SAFETY: `b` is exactly the length of the output.
+            written = unsafe { self.update_unchecked(py, data, b)? };
+            Ok(())
+        })?;
+        shrink_output(py, out, written)
+    }
+
+    // Processes each buffer in `data` in turn, as if by successive calls to
+    // `update`, returning the concatenated output.
+    fn update_many<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+        data: &[CffiBuf<'_>],
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let total = data.iter().map(|d| d.as_bytes().len()).sum();
+        let out_len = self.output_length(total);
+        let mut written = 0;
+        let out = pyo3::types::PyBytes::new_with(py, out_len, |b| {
+            for d in data {
+                // SAFETY: The output of each update is at most the output of
+                // all the remaining updates, which `b[written..]` is exactly
+                // the length of.
+                written += unsafe { self.update_unchecked(py, d.as_bytes(), &mut b[written..])? };
+            }
+            Ok(())
+        })?;
+        shrink_output(py, out, written)
+    }
+
+    // The number of bytes an update with `data_len` bytes of input outputs.
+    // This must never be smaller than what OpenSSL actually writes, see
+    // `shrink_output`.
+    fn output_length(&self, data_len: usize) -> usize {
+        let block_size = self.ctx.block_size();
+        (self.buffered + data_len) / block_size * block_size
     }
 
     pub(crate) fn update_into(
@@ -178,27 +406,141 @@ impl CipherContext {
             ));
         }
 
-        let mut total_written = 0;
-        for chunk in data.chunks(1 << 29) {
-            // SAFETY: We ensure that outbuf is sufficiently large above.
-            unsafe {
-                let n = if self.py_mode.bind(py).is_instance(&types::XTS.get(py)?)? {
-                    self.ctx.cipher_update_unchecked(chunk, Some(&mut buf[total_written..])).map_err(|_| {
-                    pyo3::exceptions::PyValueError::new_err(
-                        "In XTS mode you must supply at least a full block in the first update call. For AES this is 16 bytes."
-                    )
-                })?
-                } else {
-                    self.ctx
-                        .cipher_update_unchecked(chunk, Some(&mut buf[total_written..]))?
+        // SAFETY: We ensure that buf is sufficiently large above.
+        unsafe { self.update_unchecked(py, data, buf) }
+    }
+
+    // Processes `data`, writing the output to `buf` and returning the number
+    // of bytes written.
+    //
+    // SAFETY: `buf` must be at least `self.output_length(data.len())` bytes.
+    unsafe fn update_unchecked(
+        &mut self,
+        py: pyo3::Python<'_>,
+        data: &[u8],
+        buf: &mut [u8],
+    ) -> CryptographyResult<usize> {
+        if let Some(ctr) = &self.ctr {
+            let threads = thread_count(ctr.parallelism);
+            if threads > 1 && data.len() >= PARALLEL_CTR_THRESHOLD {
+                let (nonce, position) = (ctr.nonce, ctr.position);
+                self.update_into_parallel(py, data, buf, nonce, position, threads)?;
+                self.ctr.as_mut().unwrap().position += data.len() as u128;
+                return Ok(data.len());
+            }
+        }
+
+        // `data` and `buf` are borrowed from buffers our caller holds
+        // exported, so they remain valid with the GIL released.
+        let ctx = &mut self.ctx;
+        let total_written = allow_threads_if_large(py, data.len(), || {
+            let mut total_written = 0;
+            for chunk in data.chunks(MAX_UPDATE_CHUNK_SIZE) {
+                // SAFETY: Our caller ensures that buf is large enough for the
+                // output of all of `data`.
+                total_written += unsafe {
+                    ctx.cipher_update_unchecked(chunk, Some(&mut buf[total_written..]))?
                 };
-                total_written += n;
             }
+            Ok::<_, openssl::error::ErrorStack>(total_written)
+        })
+        .map_err(|e| {
+            if self.is_xts {
+                CryptographyError::from(pyo3::exceptions::PyValueError::new_err(
+                    "In XTS mode you must supply at least a full block in the first update call. For AES this is 16 bytes."
+                ))
+            } else {
+                CryptographyError::from(e)
+            }
+        })?;
+
+        self.buffered = (self.buffered + data.len()) % self.ctx.block_size();
+        if let Some(ctr) = self.ctr.as_mut() {
+            ctr.position += data.len() as u128;
         }
 
         Ok(total_written)
     }
 
+    // Processes `data` with a CTR mode context, writing exactly `data.len()`
+    // bytes to `buf`.
+    fn ctr_update(
+        ctx: &mut openssl::cipher_ctx::CipherCtxRef,
+        data: &[u8],
+        buf: &mut [u8],
+    ) -> Result<(), openssl::error::ErrorStack> {
+        for (chunk, out) in data
+            .chunks(MAX_UPDATE_CHUNK_SIZE)
+            .zip(buf.chunks_mut(MAX_UPDATE_CHUNK_SIZE))
+        {
+            // SAFETY: CTR is a stream mode, so the output is exactly the same
+            // length as the input, and `out` is at least `chunk.len()`.
+            let n = unsafe { ctx.cipher_update_unchecked(chunk, Some(out))? };
+            assert_eq!(n, chunk.len());
+        }
+        Ok(())
+    }
+
+    // Splits a CTR mode update across `threads` threads. `position` is
+    // the number of bytes of keystream already consumed since `nonce` was
+    // set. On return `self.ctx` is positioned at the end of `data`, exactly
+    // as if it had processed it all itself.
+    fn update_into_parallel(
+        &mut self,
+        py: pyo3::Python<'_>,
+        data: &[u8],
+        buf: &mut [u8],
+        nonce: u128,
+        position: u128,
+        threads: usize,
+    ) -> CryptographyResult<()> {
+        // Finish any partially used counter block first, so that every piece
+        // handed to a thread starts at a block boundary.
+        let head_len = std::cmp::min(data.len(), ((16 - position % 16) % 16) as usize);
+        let (head, rest) = data.split_at(head_len);
+        let body_len = rest.len() - rest.len() % 16;
+        let (body, tail) = rest.split_at(body_len);
+        let (head_out, rest_out) = buf.split_at_mut(head_len);
+        let (body_out, rest_out) = rest_out.split_at_mut(body_len);
+        let tail_out = &mut rest_out[..tail.len()];
+
+        Self::ctr_update(&mut self.ctx, head, head_out)?;
+
+        let first_block = (position + head_len as u128) / 16;
+        let piece_len = std::cmp::max(1, (body_len / 16).div_ceil(threads)) * 16;
+        let init_op = self.init_op();
+        let base_ctx: &openssl::cipher_ctx::CipherCtxRef = &self.ctx;
+        let pieces = body
+            .chunks(piece_len)
+            .zip(body_out.chunks_mut(piece_len))
+            .enumerate()
+            .collect::<Vec<_>>();
+        map_in_threads(
+            py,
+            pieces,
+            |(i, (piece, piece_out))| -> Result<(), openssl::error::ErrorStack> {
+                let block = first_block + (i * piece_len / 16) as u128;
+                let iv = nonce.wrapping_add(block).to_be_bytes();
+                let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+                ctx.copy(base_ctx)?;
+                init_op(&mut ctx, None, None, Some(&iv))?;
+                Self::ctr_update(&mut ctx, piece, piece_out)
+            },
+        )
+        .into_iter()
+        .collect::<Result<(), _>>()?;
+
+        // Move our own context to the counter block following the data the
+        // threads processed, and handle any trailing partial block.
+        let iv = nonce
+            .wrapping_add(first_block + (body_len / 16) as u128)
+            .to_be_bytes();
+        init_op(&mut self.ctx, None, None, Some(&iv))?;
+        Self::ctr_update(&mut self.ctx, tail, tail_out)?;
+
+        Ok(())
+    }
+
     fn authenticate_additional_data(&mut self, data: &[u8]) -> CryptographyResult<()> {
         self.ctx.cipher_update(data, None)?;
         Ok(())
@@ -273,6 +615,14 @@ impl PyCipherContext {
         get_mut_ctx(self.ctx.as_mut())?.update(py, data.as_bytes())
     }
 
+    fn update_many<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+        data: Vec<CffiBuf<'_>>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        get_mut_ctx(self.ctx.as_mut())?.update_many(py, &data)
+    }
+
     fn reset_nonce(&mut self, py: pyo3::Python<'_>, nonce: CffiBuf<'_>) -> CryptographyResult<()> {
         get_mut_ctx(self.ctx.as_mut())?.reset_nonce(py, nonce)
     }
@@ -315,6 +665,23 @@ impl PyAEADEncryptionContext {
         get_mut_ctx(self.ctx.as_mut())?.update(py, data)
     }
 
+    fn update_many<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+        data: Vec<CffiBuf<'_>>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let total = data.iter().map(|d| d.as_bytes().len()).sum::<usize>();
+
+        self.updated = true;
+        self.bytes_remaining = self
+            .bytes_remaining
+            .checked_sub(total.try_into().unwrap())
+            .ok_or_else(|| {
+                pyo3::exceptions::PyValueError::new_err("Exceeded maximum encrypted byte limit")
+            })?;
+        get_mut_ctx(self.ctx.as_mut())?.update_many(py, &data)
+    }
+
     fn update_into(
         &mut self,
         py: pyo3::Python<'_>,
@@ -406,6 +773,23 @@ impl PyAEADDecryptionContext {
         get_mut_ctx(self.ctx.as_mut())?.update(py, data)
     }
 
+    fn update_many<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+        data: Vec<CffiBuf<'_>>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let total = data.iter().map(|d| d.as_bytes().len()).sum::<usize>();
+
+        self.updated = true;
+        self.bytes_remaining = self
+            .bytes_remaining
+            .checked_sub(total.try_into().unwrap())
+            .ok_or_else(|| {
+                pyo3::exceptions::PyValueError::new_err("Exceeded maximum encrypted byte limit")
+            })?;
+        get_mut_ctx(self.ctx.as_mut())?.update_many(py, &data)
+    }
+
     fn update_into(
         &mut self,
         py: pyo3::Python<'_>,
@@ -518,13 +902,23 @@ impl PyAEADDecryptionContext {
 }
 
 #[pyo3::pyfunction]
+#[pyo3(signature = (algorithm, mode, parallelism=1))]
 fn create_encryption_ctx<'p>(
     py: pyo3::Python<'p>,
     algorithm: pyo3::Bound<'_, pyo3::PyAny>,
     mode: pyo3::Bound<'_, pyo3::PyAny>,
+    parallelism: i64,
 ) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
-    let ctx = CipherContext::new(py, algorithm, mode.clone(), openssl::symm::Mode::Encrypt)?;
+    let mut ctx = CipherContext::new(py, algorithm, mode.clone(), openssl::symm::Mode::Encrypt)?;
+    ctx.set_parallelism(py, parallelism)?;
+    encryption_ctx_into_py(py, ctx, &mode)
+}
 
+fn encryption_ctx_into_py<'p>(
+    py: pyo3::Python<'p>,
+    ctx: CipherContext,
+    mode: &pyo3::Bound<'_, pyo3::PyAny>,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
     if mode.is_instance(&types::MODE_WITH_AUTHENTICATION_TAG.get(py)?)? {
         Ok(PyAEADEncryptionContext {
             ctx: Some(ctx),
@@ -547,13 +941,23 @@ fn create_encryption_ctx<'p>(
 }
 
 #[pyo3::pyfunction]
+#[pyo3(signature = (algorithm, mode, parallelism=1))]
 fn create_decryption_ctx<'p>(
     py: pyo3::Python<'p>,
     algorithm: pyo3::Bound<'_, pyo3::PyAny>,
     mode: pyo3::Bound<'_, pyo3::PyAny>,
+    parallelism: i64,
 ) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
     let mut ctx = CipherContext::new(py, algorithm, mode.clone(), openssl::symm::Mode::Decrypt)?;
+    ctx.set_parallelism(py, parallelism)?;
+    decryption_ctx_into_py(py, ctx, &mode)
+}
 
+fn decryption_ctx_into_py<'p>(
+    py: pyo3::Python<'p>,
+    mut ctx: CipherContext,
+    mode: &pyo3::Bound<'_, pyo3::PyAny>,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
     if mode.is_instance(&types::MODE_WITH_AUTHENTICATION_TAG.get(py)?)? {
         if let Some(tag) = mode
             .getattr(pyo3::intern!(py, "tag"))?
@@ -581,6 +985,122 @@ fn create_decryption_ctx<'p>(
     }
 }
 
+// A keyed cipher, which creates contexts for new IVs or nonces by copying an
+// existing context rather than looking up the cipher and expanding the key
+// every time.
+#[pyo3::pyclass(
+    frozen,
+    module = "cryptography.hazmat.bindings._rust.openssl.ciphers",
+    name = "CipherTemplate"
+)]
+struct PyCipherTemplate {
+    algorithm: pyo3::PyObject,
+    mode_class: pyo3::PyObject,
+    // The keyed contexts which each operation's context is copied from.
+    // These are `None` when a new context is keyed for each operation
+    // instead, see `PyCipherTemplate::new`.
+    encryption_ctx: Option<openssl::cipher_ctx::CipherCtx>,
+    decryption_ctx: Option<openssl::cipher_ctx::CipherCtx>,
+}
+
+impl PyCipherTemplate {
+    fn keyed_ctx(
+        &self,
+        py: pyo3::Python<'_>,
+        side: openssl::symm::Mode,
+    ) -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+        let base = match side {
+            openssl::symm::Mode::Encrypt => &self.encryption_ctx,
+            openssl::symm::Mode::Decrypt => &self.decryption_ctx,
+        };
+        match base {
+            Some(base) => {
+                let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+                ctx.copy(base)?;
+                Ok(ctx)
+            }
+            None => CipherContext::new_keyed_ctx(
+                py,
+                self.algorithm.bind(py),
+                self.mode_class.bind(py),
+                side,
+            ),
+        }
+    }
+}
+
+#[pyo3::pymethods]
+impl PyCipherTemplate {
+    #[new]
+    fn new(
+        py: pyo3::Python<'_>,
+        algorithm: pyo3::Bound<'_, pyo3::PyAny>,
+        mode_class: pyo3::Bound<'_, pyo3::PyAny>,
+    ) -> CryptographyResult<PyCipherTemplate> {
+        let encryption_ctx = CipherContext::new_keyed_ctx(
+            py,
+            &algorithm,
+            &mode_class,
+            openssl::symm::Mode::Encrypt,
+        )?;
+        let decryption_ctx = CipherContext::new_keyed_ctx(
+            py,
+            &algorithm,
+            &mode_class,
+            openssl::symm::Mode::Decrypt,
+        )?;
+
+        // On OpenSSL 3.0 and 3.1 copying a GCM context is slower than
+        // initializing a new one (which is also why AESGCM uses
+        // `LazyEvpCipherAead` there), so GCM templates key a new context for
+        // each operation instead.
+        let copy_ctxs = !(cfg!(not(any(
+            CRYPTOGRAPHY_OPENSSL_320_OR_GREATER,
+            CRYPTOGRAPHY_IS_LIBRESSL,
+            CRYPTOGRAPHY_IS_BORINGSSL,
+            CRYPTOGRAPHY_IS_AWSLC,
+            not(CRYPTOGRAPHY_OPENSSL_300_OR_GREATER),
+        ))) && mode_class.is(&types::GCM.get(py)?));
+
+        Ok(PyCipherTemplate {
+            encryption_ctx: copy_ctxs.then_some(encryption_ctx),
+            decryption_ctx: copy_ctxs.then_some(decryption_ctx),
+            algorithm: algorithm.unbind(),
+            mode_class: mode_class.unbind(),
+        })
+    }
+
+    fn encryptor<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        mode: pyo3::Bound<'p, pyo3::PyAny>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
+        let ctx = CipherContext::from_keyed_ctx(
+            py,
+            self.keyed_ctx(py, openssl::symm::Mode::Encrypt)?,
+            self.algorithm.bind(py).clone(),
+            mode.clone(),
+            openssl::symm::Mode::Encrypt,
+        )?;
+        encryption_ctx_into_py(py, ctx, &mode)
+    }
+
+    fn decryptor<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        mode: pyo3::Bound<'p, pyo3::PyAny>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
+        let ctx = CipherContext::from_keyed_ctx(
+            py,
+            self.keyed_ctx(py, openssl::symm::Mode::Decrypt)?,
+            self.algorithm.bind(py).clone(),
+            mode.clone(),
+            openssl::symm::Mode::Decrypt,
+        )?;
+        decryption_ctx_into_py(py, ctx, &mode)
+    }
+}
+
 #[pyo3::pyfunction]
 fn cipher_supported(
     py: pyo3::Python<'_>,
@@ -608,11 +1128,22 @@ fn _advance_aad(ctx: pyo3::Bound<'_, pyo3::PyAny>, n: u64) {
     }
 }
 
+#[pyo3::pyfunction]
+fn get_gil_release_threshold() -> usize {
+    crate::backend::utils::gil_release_threshold()
+}
+
+#[pyo3::pyfunction]
+fn set_gil_release_threshold(threshold: usize) {
+    crate::backend::utils::set_gil_release_threshold(threshold)
+}
+
 #[pyo3::pymodule]
 pub(crate) mod ciphers {
     #[pymodule_export]
     use super::{
         _advance, _advance_aad, cipher_supported, create_decryption_ctx, create_encryption_ctx,
-        PyAEADDecryptionContext, PyAEADEncryptionContext, PyCipherContext,
+        get_gil_release_threshold, set_gil_release_threshold, PyAEADDecryptionContext,
+        PyAEADEncryptionContext, PyCipherContext, PyCipherTemplate,
     };
 }
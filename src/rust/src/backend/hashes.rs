@@ -3,9 +3,13 @@
 // for complete details.
 
 use std::borrow::Cow;
+use std::collections::HashMap;
 
-use pyo3::types::PyAnyMethods;
+use pyo3::types::{PyAnyMethods, PyBytesMethods};
 
+use crate::backend::utils::{
+    allow_threads_if_large, check_parallelism, map_in_threads, thread_count,
+};
 use crate::buf::CffiBuf;
 use crate::error::{CryptographyError, CryptographyResult};
 use crate::{exceptions, types};
@@ -33,10 +37,68 @@ impl Hash {
     }
 }
 
+// The hash algorithms defined in `cryptography.hazmat.primitives.hashes`,
+// and the OpenSSL name of the digest each one corresponds to.
+const REGISTERED_DIGESTS: &[(&str, &str)] = &[
+    ("MD5", "md5"),
+    ("SHA1", "sha1"),
+    ("SHA224", "sha224"),
+    ("SHA256", "sha256"),
+    ("SHA384", "sha384"),
+    ("SHA512", "sha512"),
+    ("SHA512_224", "sha512-224"),
+    ("SHA512_256", "sha512-256"),
+    ("SHA3_224", "sha3-224"),
+    ("SHA3_256", "sha3-256"),
+    ("SHA3_384", "sha3-384"),
+    ("SHA3_512", "sha3-512"),
+    ("SHAKE128", "shake128"),
+    ("SHAKE256", "shake256"),
+    ("BLAKE2b", "blake2b512"),
+    ("BLAKE2s", "blake2s256"),
+    ("SM3", "sm3"),
+];
+
+struct DigestRegistry {
+    // Holding a reference to each type keeps it alive, so its address can't
+    // be reused by an unrelated type.
+    _types: Vec<pyo3::PyObject>,
+    digests: HashMap<usize, openssl::hash::MessageDigest>,
+}
+
+fn get_digest_registry(py: pyo3::Python<'_>) -> CryptographyResult<&DigestRegistry> {
+    static REGISTRY: pyo3::sync::GILOnceCell<DigestRegistry> = pyo3::sync::GILOnceCell::new();
+
+    REGISTRY.get_or_try_init(py, || {
+        let hashes_mod = types::HASHES_MODULE.get(py)?;
+        let mut registry = DigestRegistry {
+            _types: vec![],
+            digests: HashMap::new(),
+        };
+        for (class_name, openssl_name) in REGISTERED_DIGESTS {
+            // Unsupported digests are left out, so that looking them up
+            // takes the slow path and raises the usual error.
+            if let Some(md) = openssl::hash::MessageDigest::from_name(openssl_name) {
+                let cls = hashes_mod.getattr(*class_name)?;
+                registry.digests.insert(cls.as_ptr() as usize, md);
+                registry._types.push(cls.unbind());
+            }
+        }
+        Ok::<_, CryptographyError>(registry)
+    })
+}
+
 pub(crate) fn message_digest_from_algorithm(
     py: pyo3::Python<'_>,
     algorithm: &pyo3::Bound<'_, pyo3::PyAny>,
 ) -> CryptographyResult<openssl::hash::MessageDigest> {
+    // Instances of our own hash classes (but not subclasses of them, which
+    // may override `name`) can skip the name lookup entirely.
+    let registry = get_digest_registry(py)?;
+    if let Some(md) = registry.digests.get(&(algorithm.get_type_ptr() as usize)) {
+        return Ok(*md);
+    }
+
     if !algorithm.is_instance(&types::HASH_ALGORITHM.get(py)?)? {
         return Err(CryptographyError::from(
             pyo3::exceptions::PyTypeError::new_err("Expected instance of hashes.HashAlgorithm."),
@@ -71,6 +133,311 @@ fn hash_supported(py: pyo3::Python<'_>, algorithm: pyo3::Bound<'_, pyo3::PyAny>)
     message_digest_from_algorithm(py, &algorithm).is_ok()
 }
 
+// Resolves `algorithm` to a digest, along with the output length to use if
+// it is an extendable output function.
+pub(crate) fn digest_params(
+    py: pyo3::Python<'_>,
+    algorithm: &pyo3::Bound<'_, pyo3::PyAny>,
+) -> CryptographyResult<(openssl::hash::MessageDigest, Option<usize>)> {
+    let md = message_digest_from_algorithm(py, algorithm)?;
+    #[cfg(not(any(CRYPTOGRAPHY_IS_LIBRESSL, CRYPTOGRAPHY_IS_BORINGSSL)))]
+    if algorithm.is_instance(&types::EXTENDABLE_OUTPUT_FUNCTION.get(py)?)? {
+        let digest_size = algorithm
+            .getattr(pyo3::intern!(py, "digest_size"))?
+            .extract::<usize>()?;
+        return Ok((md, Some(digest_size)));
+    }
+    Ok((md, None))
+}
+
+// Hashes `data` in one shot, writing the digest to `out`, which must be
+// exactly the size of the digest (or the requested XOF output length).
+pub(crate) fn digest_into(
+    md: openssl::hash::MessageDigest,
+    xof: bool,
+    data: &[u8],
+    out: &mut [u8],
+) -> Result<(), openssl::error::ErrorStack> {
+    #[cfg(not(any(CRYPTOGRAPHY_IS_LIBRESSL, CRYPTOGRAPHY_IS_BORINGSSL)))]
+    if xof {
+        let mut h = openssl::hash::Hasher::new(md)?;
+        h.update(data)?;
+        return h.finish_xof(out);
+    }
+    #[cfg(any(CRYPTOGRAPHY_IS_LIBRESSL, CRYPTOGRAPHY_IS_BORINGSSL))]
+    let _ = xof;
+
+    out.copy_from_slice(&openssl::hash::hash(md, data)?);
+    Ok(())
+}
+
+#[pyo3::pyfunction]
+fn digest<'p>(
+    py: pyo3::Python<'p>,
+    algorithm: &pyo3::Bound<'p, pyo3::PyAny>,
+    data: CffiBuf<'_>,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    let (md, xof_length) = digest_params(py, algorithm)?;
+    let data = data.as_bytes();
+    Ok(pyo3::types::PyBytes::new_with(
+        py,
+        xof_length.unwrap_or_else(|| md.size()),
+        |b| {
+            allow_threads_if_large(py, data.len(), || {
+                digest_into(md, xof_length.is_some(), data, b)
+            })
+            .map_err(CryptographyError::from)?;
+            Ok(())
+        },
+    )?)
+}
+
+// Finalizes `h`, writing the digest to `out`, which must be exactly the size
+// of the digest (or the requested XOF output length). `h` is reinitialized
+// by its next `update`, so it can be reused.
+fn finish_into(
+    h: &mut openssl::hash::Hasher,
+    xof: bool,
+    out: &mut [u8],
+) -> Result<(), openssl::error::ErrorStack> {
+    #[cfg(not(any(CRYPTOGRAPHY_IS_LIBRESSL, CRYPTOGRAPHY_IS_BORINGSSL)))]
+    if xof {
+        return h.finish_xof(out);
+    }
+    #[cfg(any(CRYPTOGRAPHY_IS_LIBRESSL, CRYPTOGRAPHY_IS_BORINGSSL))]
+    let _ = xof;
+
+    out.copy_from_slice(&h.finish()?);
+    Ok(())
+}
+
+// Hashes `prefix` followed by each of `items` in turn with a single context,
+// writing the digests one after another to `out`.
+fn digest_chunk(
+    md: openssl::hash::MessageDigest,
+    xof_length: Option<usize>,
+    prefix: &[u8],
+    items: &[&[u8]],
+    out: &mut [u8],
+) -> Result<(), openssl::error::ErrorStack> {
+    let digest_len = xof_length.unwrap_or_else(|| md.size());
+    let mut h = openssl::hash::Hasher::new(md)?;
+    for (data, o) in items.iter().zip(out.chunks_exact_mut(digest_len)) {
+        h.update(prefix)?;
+        h.update(data)?;
+        finish_into(&mut h, xof_length.is_some(), o)?;
+    }
+    Ok(())
+}
+
+// Hashes `prefix` followed by each of `items`, writing the digests one after
+// another to `out`. With `parallelism` greater than one the items are split
+// evenly across that many threads (but no more threads than there are CPUs),
+// each with its own context.
+fn digest_batch(
+    py: pyo3::Python<'_>,
+    md: openssl::hash::MessageDigest,
+    xof_length: Option<usize>,
+    prefix: &[u8],
+    items: &[&[u8]],
+    out: &mut [u8],
+    parallelism: usize,
+) -> Result<(), openssl::error::ErrorStack> {
+    let threads = thread_count(parallelism);
+    if threads == 1 || items.len() < 2 {
+        let total_length = items.iter().map(|d| d.len()).sum();
+        return allow_threads_if_large(py, total_length, || {
+            digest_chunk(md, xof_length, prefix, items, out)
+        });
+    }
+
+    let chunk_size = items.len().div_ceil(threads);
+    let out_chunk_size = chunk_size * xof_length.unwrap_or_else(|| md.size());
+    let chunks = items
+        .chunks(chunk_size)
+        .zip(out.chunks_mut(out_chunk_size))
+        .collect::<Vec<_>>();
+    map_in_threads(py, chunks, |(chunk, o)| {
+        digest_chunk(md, xof_length, prefix, chunk, o)
+    })
+    .into_iter()
+    .collect()
+}
+
+#[pyo3::pyfunction]
+#[pyo3(signature = (algorithm, data, *, parallelism = 1, packed = false))]
+fn digest_many<'p>(
+    py: pyo3::Python<'p>,
+    algorithm: &pyo3::Bound<'p, pyo3::PyAny>,
+    data: Vec<CffiBuf<'_>>,
+    parallelism: i64,
+    packed: bool,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::PyAny>> {
+    let parallelism = check_parallelism(parallelism)?;
+    let (md, xof_length) = digest_params(py, algorithm)?;
+    let digest_len = xof_length.unwrap_or_else(|| md.size());
+    let items = data.iter().map(|d| d.as_bytes()).collect::<Vec<_>>();
+    let total_len = items
+        .len()
+        .checked_mul(digest_len)
+        .filter(|&n| n <= isize::MAX as usize)
+        .ok_or_else(|| {
+            pyo3::exceptions::PyOverflowError::new_err("Total digest size is too large.")
+        })?;
+
+    // The digests are always computed into a single bytes object, so that
+    // an overly large XOF digest_size raises MemoryError.
+    let out = pyo3::types::PyBytes::new_with(py, total_len, |b| {
+        digest_batch(py, md, xof_length, b"", &items, b, parallelism)
+            .map_err(CryptographyError::from)?;
+        Ok(())
+    })?;
+    if packed {
+        Ok(out.into_any())
+    } else {
+        Ok(pyo3::types::PyList::new(
+            py,
+            out.as_bytes()
+                .chunks(digest_len)
+                .map(|d| pyo3::types::PyBytes::new(py, d)),
+        )?
+        .into_any())
+    }
+}
+
+// The size of the buffer `hash_file` reads into.
+const HASH_FILE_BUFFER_SIZE: usize = 1024 * 1024;
+
+enum FileHashCtx {
+    Hash(openssl::hash::Hasher, Option<usize>),
+    Hmac(cryptography_openssl::hmac::Hmac),
+}
+
+impl FileHashCtx {
+    fn update(&mut self, data: &[u8]) -> Result<(), openssl::error::ErrorStack> {
+        match self {
+            FileHashCtx::Hash(h, _) => h.update(data),
+            FileHashCtx::Hmac(h) => h.update(data),
+        }
+    }
+
+    fn finish<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        match self {
+            FileHashCtx::Hash(h, Some(xof_length)) => {
+                Ok(pyo3::types::PyBytes::new_with(py, *xof_length, |b| {
+                    finish_into(h, true, b).map_err(CryptographyError::from)?;
+                    Ok(())
+                })?)
+            }
+            FileHashCtx::Hash(h, None) => Ok(pyo3::types::PyBytes::new(py, &h.finish()?)),
+            FileHashCtx::Hmac(h) => Ok(pyo3::types::PyBytes::new(py, &h.finish()?)),
+        }
+    }
+}
+
+// Reads `file` from its current position to the end, feeding it to `ctx`.
+fn hash_reader(file: &mut std::fs::File, ctx: &mut FileHashCtx) -> CryptographyResult<()> {
+    use std::io::Read;
+
+    let mut buf = vec![0; HASH_FILE_BUFFER_SIZE];
+    loop {
+        match file.read(&mut buf) {
+            Ok(0) => break,
+            Ok(n) => ctx.update(&buf[..n])?,
+            Err(e) if e.kind() == std::io::ErrorKind::Interrupted => continue,
+            Err(e) => return Err(CryptographyError::from(pyo3::PyErr::from(e))),
+        }
+    }
+    Ok(())
+}
+
+// Wraps a file descriptor owned by the caller in a `File`, which must not be
+// dropped, since that would close the descriptor.
+#[cfg(unix)]
+fn borrow_fd(
+    _py: pyo3::Python<'_>,
+    fd: i32,
+) -> CryptographyResult<std::mem::ManuallyDrop<std::fs::File>> {
+    use std::os::fd::FromRawFd;
+
+    // SAFETY: `fd` is non-negative, and it is never closed by us, because
+    // the `File` is wrapped in `ManuallyDrop`. If `fd` isn't open, reads
+    // from it fail with EBADF.
+    Ok(std::mem::ManuallyDrop::new(unsafe {
+        std::fs::File::from_raw_fd(fd)
+    }))
+}
+
+#[cfg(windows)]
+fn borrow_fd(
+    py: pyo3::Python<'_>,
+    fd: i32,
+) -> CryptographyResult<std::mem::ManuallyDrop<std::fs::File>> {
+    use std::os::windows::io::FromRawHandle;
+
+    let handle = py
+        .import(pyo3::intern!(py, "msvcrt"))?
+        .call_method1(pyo3::intern!(py, "get_osfhandle"), (fd,))?
+        .extract::<isize>()?;
+    // SAFETY: `get_osfhandle` has checked that `handle` is valid, and it is
+    // never closed by us, because the `File` is wrapped in `ManuallyDrop`.
+    Ok(std::mem::ManuallyDrop::new(unsafe {
+        std::fs::File::from_raw_handle(handle as std::os::windows::io::RawHandle)
+    }))
+}
+
+#[pyo3::pyfunction]
+#[pyo3(signature = (path_or_fd, algorithm, *, key = None))]
+fn hash_file<'p>(
+    py: pyo3::Python<'p>,
+    path_or_fd: &pyo3::Bound<'p, pyo3::PyAny>,
+    algorithm: &pyo3::Bound<'p, pyo3::PyAny>,
+    key: Option<CffiBuf<'_>>,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    let mut ctx = match key {
+        Some(key) => {
+            let md = message_digest_from_algorithm(py, algorithm)?;
+            let ctx = cryptography_openssl::hmac::Hmac::new(key.as_bytes(), md).map_err(|_| {
+                exceptions::UnsupportedAlgorithm::new_err((
+                    "Digest is not supported for HMAC",
+                    exceptions::Reasons::UNSUPPORTED_HASH,
+                ))
+            })?;
+            FileHashCtx::Hmac(ctx)
+        }
+        None => {
+            let (md, xof_length) = digest_params(py, algorithm)?;
+            FileHashCtx::Hash(openssl::hash::Hasher::new(md)?, xof_length)
+        }
+    };
+
+    let mut owned_file;
+    let mut borrowed_file;
+    let file = if let Ok(fd) = path_or_fd.extract::<i32>() {
+        if fd < 0 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("fd must be non-negative."),
+            ));
+        }
+        borrowed_file = borrow_fd(py, fd)?;
+        &mut *borrowed_file
+    } else {
+        let path = path_or_fd.extract::<std::path::PathBuf>().map_err(|_| {
+            pyo3::exceptions::PyTypeError::new_err(
+                "path_or_fd must be a path or a file descriptor.",
+            )
+        })?;
+        owned_file = std::fs::File::open(path).map_err(pyo3::PyErr::from)?;
+        &mut owned_file
+    };
+
+    py.allow_threads(|| hash_reader(file, &mut ctx))?;
+    ctx.finish(py)
+}
+
 impl Hash {
     pub(crate) fn update_bytes(&mut self, data: &[u8]) -> CryptographyResult<()> {
         self.get_mut_ctx()?.update(data)?;
@@ -244,8 +611,195 @@ impl XOFHash {
     }
 }
 
+// Domain separation prefixes for leaf and interior node hashes, as in
+// RFC 6962 section 2.1.
+const TREE_LEAF_PREFIX: &[u8] = &[0x00];
+const TREE_NODE_PREFIX: &[u8] = &[0x01];
+
+// Computes the RFC 6962 Merkle tree hash of the leaves whose digests are
+// `leaf_digests`, writing it to `out`. There must be at least one leaf.
+fn merkle_root(
+    h: &mut openssl::hash::Hasher,
+    leaf_digests: &[u8],
+    out: &mut [u8],
+) -> Result<(), openssl::error::ErrorStack> {
+    let digest_len = out.len();
+    let n = leaf_digests.len() / digest_len;
+    if n == 1 {
+        out.copy_from_slice(leaf_digests);
+        return Ok(());
+    }
+
+    // The left subtree contains the largest power of two number of leaves
+    // that is less than `n`.
+    let k = 1 << (usize::BITS - 1 - (n - 1).leading_zeros());
+    let (left_leaves, right_leaves) = leaf_digests.split_at(k * digest_len);
+    let mut left = vec![0; digest_len];
+    let mut right = vec![0; digest_len];
+    merkle_root(h, left_leaves, &mut left)?;
+    merkle_root(h, right_leaves, &mut right)?;
+
+    h.update(TREE_NODE_PREFIX)?;
+    h.update(&left)?;
+    h.update(&right)?;
+    out.copy_from_slice(&h.finish()?);
+    Ok(())
+}
+
+#[pyo3::pyclass(module = "cryptography.hazmat.bindings._rust.openssl.hashes")]
+pub(crate) struct TreeHash {
+    #[pyo3(get)]
+    algorithm: pyo3::Py<pyo3::PyAny>,
+    #[pyo3(get)]
+    leaf_size: usize,
+    md: openssl::hash::MessageDigest,
+    parallelism: usize,
+    // Data which doesn't yet fill a complete leaf.
+    buffer: Vec<u8>,
+    // The digests of the leaves hashed so far, one after another.
+    leaf_digests: Vec<u8>,
+    finalized: bool,
+}
+
+impl TreeHash {
+    fn add_leaves(&mut self, py: pyo3::Python<'_>, leaves: &[&[u8]]) -> CryptographyResult<()> {
+        if leaves.is_empty() {
+            return Ok(());
+        }
+        let start = self.leaf_digests.len();
+        let len = leaves.len() * self.md.size();
+        self.leaf_digests.resize(start + len, 0);
+        digest_batch(
+            py,
+            self.md,
+            None,
+            TREE_LEAF_PREFIX,
+            leaves,
+            &mut self.leaf_digests[start..],
+            self.parallelism,
+        )?;
+        Ok(())
+    }
+
+    // Hashes the buffered data as a leaf, if there is any.
+    fn flush_buffer(&mut self, py: pyo3::Python<'_>) -> CryptographyResult<()> {
+        if !self.buffer.is_empty() {
+            let leaf = std::mem::take(&mut self.buffer);
+            self.add_leaves(py, &[leaf.as_slice()])?;
+            // Reuse the allocation for the next leaf.
+            self.buffer = leaf;
+            self.buffer.clear();
+        }
+        Ok(())
+    }
+}
+
+#[pyo3::pymethods]
+impl TreeHash {
+    #[new]
+    #[pyo3(signature = (algorithm, leaf_size, *, parallelism = 1))]
+    fn new(
+        py: pyo3::Python<'_>,
+        algorithm: &pyo3::Bound<'_, pyo3::PyAny>,
+        leaf_size: usize,
+        parallelism: i64,
+    ) -> CryptographyResult<TreeHash> {
+        if leaf_size == 0 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("leaf_size must be at least 1"),
+            ));
+        }
+        let parallelism = check_parallelism(parallelism)?;
+        let (md, xof_length) = digest_params(py, algorithm)?;
+        if xof_length.is_some() {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyTypeError::new_err(
+                    "TreeHash does not support extendable output functions.",
+                ),
+            ));
+        }
+
+        Ok(TreeHash {
+            algorithm: algorithm.clone().unbind(),
+            leaf_size,
+            md,
+            parallelism,
+            buffer: vec![],
+            leaf_digests: vec![],
+            finalized: false,
+        })
+    }
+
+    fn update(&mut self, py: pyo3::Python<'_>, data: CffiBuf<'_>) -> CryptographyResult<()> {
+        if self.finalized {
+            return Err(exceptions::already_finalized_error());
+        }
+
+        let mut data = data.as_bytes();
+        if !self.buffer.is_empty() {
+            let n = std::cmp::min(self.leaf_size - self.buffer.len(), data.len());
+            self.buffer.extend_from_slice(&data[..n]);
+            data = &data[n..];
+            if self.buffer.len() < self.leaf_size {
+                return Ok(());
+            }
+            self.flush_buffer(py)?;
+        }
+
+        let complete = data.len() - data.len() % self.leaf_size;
+        let leaves = data[..complete].chunks(self.leaf_size).collect::<Vec<_>>();
+        self.add_leaves(py, &leaves)?;
+        self.buffer.extend_from_slice(&data[complete..]);
+        Ok(())
+    }
+
+    fn finalize<'p>(
+        &mut self,
+        py: pyo3::Python<'p>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        if self.finalized {
+            return Err(exceptions::already_finalized_error());
+        }
+        self.flush_buffer(py)?;
+        self.finalized = true;
+
+        let mut h = openssl::hash::Hasher::new(self.md)?;
+        Ok(pyo3::types::PyBytes::new_with(py, self.md.size(), |b| {
+            if self.leaf_digests.is_empty() {
+                // The hash of an empty tree is the hash of the empty string.
+                b.copy_from_slice(&h.finish().map_err(CryptographyError::from)?);
+            } else {
+                merkle_root(&mut h, &self.leaf_digests, b).map_err(CryptographyError::from)?;
+            }
+            Ok(())
+        })?)
+    }
+
+    fn leaf_digests<'p>(&self, py: pyo3::Python<'p>) -> Vec<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        self.leaf_digests
+            .chunks(self.md.size())
+            .map(|d| pyo3::types::PyBytes::new(py, d))
+            .collect()
+    }
+
+    fn copy(&self, py: pyo3::Python<'_>) -> CryptographyResult<TreeHash> {
+        if self.finalized {
+            return Err(exceptions::already_finalized_error());
+        }
+        Ok(TreeHash {
+            algorithm: self.algorithm.clone_ref(py),
+            leaf_size: self.leaf_size,
+            md: self.md,
+            parallelism: self.parallelism,
+            buffer: self.buffer.clone(),
+            leaf_digests: self.leaf_digests.clone(),
+            finalized: false,
+        })
+    }
+}
+
 #[pyo3::pymodule]
 pub(crate) mod hashes {
     #[pymodule_export]
-    use super::{hash_supported, Hash, XOFHash};
+    use super::{digest, digest_many, hash_file, hash_supported, Hash, TreeHash, XOFHash};
 }
@@ -26,8 +26,11 @@ pub(crate) fn derive_pbkdf2_hmac<'p>(
 ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
     let md = hashes::message_digest_from_algorithm(py, algorithm)?;
 
+    let key_material = key_material.as_bytes();
     Ok(pyo3::types::PyBytes::new_with(py, length, |b| {
-        openssl::pkcs5::pbkdf2_hmac(key_material.as_bytes(), salt, iterations, md, b).unwrap();
+        py.allow_threads(|| {
+            openssl::pkcs5::pbkdf2_hmac(key_material, salt, iterations, md, b).unwrap();
+        });
         Ok(())
     })?)
 }
@@ -130,8 +133,13 @@ impl Scrypt {
         }
         self.used = true;
 
+        let key_material = key_material.as_bytes();
+        let salt = self.salt.as_bytes(py);
+        let (n, r, p) = (self.n, self.r, self.p);
         Ok(pyo3::types::PyBytes::new_with(py, self.length, |b| {
-            openssl::pkcs5::scrypt(key_material.as_bytes(), self.salt.as_bytes(py), self.n, self.r, self.p, (usize::MAX / 2).try_into().unwrap(), b).map_err(|_| {
+            py.allow_threads(|| {
+                openssl::pkcs5::scrypt(key_material, salt, n, r, p, (usize::MAX / 2).try_into().unwrap(), b)
+            }).map_err(|_| {
                 // memory required formula explained here:
                 // https://blog.filippo.io/the-scrypt-parameters/
                 let min_memory = 128 * self.n * self.r / (1024 * 1024);
@@ -285,18 +293,25 @@ impl Argon2id {
             return Err(exceptions::already_finalized_error());
         }
         self.used = true;
+        let key_material = key_material.as_bytes();
+        let salt = self.salt.as_bytes(py);
+        let ad = self.ad.as_ref().map(|ad| ad.as_bytes(py));
+        let secret = self.secret.as_ref().map(|secret| secret.as_bytes(py));
+        let (iterations, lanes, memory_cost) = (self.iterations, self.lanes, self.memory_cost);
         Ok(pyo3::types::PyBytes::new_with(py, self.length, |b| {
-            openssl::kdf::argon2id(
-                None,
-                key_material.as_bytes(),
-                self.salt.as_bytes(py),
-                self.ad.as_ref().map(|ad| ad.as_bytes(py)),
-                self.secret.as_ref().map(|secret| secret.as_bytes(py)),
-                self.iterations,
-                self.lanes,
-                self.memory_cost,
-                b,
-            )
+            py.allow_threads(|| {
+                openssl::kdf::argon2id(
+                    None,
+                    key_material,
+                    salt,
+                    ad,
+                    secret,
+                    iterations,
+                    lanes,
+                    memory_cost,
+                    b,
+                )
+            })
             .map_err(CryptographyError::from)?;
             Ok(())
         })?)
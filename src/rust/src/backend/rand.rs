@@ -2,25 +2,153 @@
 // 2.0, and the BSD License. See the LICENSE file in the root of this repository
 // for complete details.
 
+use std::cell::RefCell;
+use std::sync::atomic::{AtomicU64, Ordering};
+
 use crate::error::{CryptographyError, CryptographyResult};
 
+// Size of each thread's buffer of random bytes. Requests larger than a
+// quarter of this bypass the buffer entirely.
+const POOL_SIZE: usize = 4096;
+const MAX_POOLED_REQUEST: usize = POOL_SIZE / 4;
+
+// Incremented in the child after every fork(), so that a child never hands
+// out bytes that were buffered (and possibly already used) by its parent.
+static FORK_GENERATION: AtomicU64 = AtomicU64::new(0);
+
+#[cfg(unix)]
+extern "C" {
+    fn pthread_atfork(
+        prepare: Option<unsafe extern "C" fn()>,
+        parent: Option<unsafe extern "C" fn()>,
+        child: Option<unsafe extern "C" fn()>,
+    ) -> std::os::raw::c_int;
+}
+
+// Runs in the child after every fork(), including ones which don't go
+// through os.fork (and so skip os.register_at_fork hooks). It must be
+// async-signal-safe, which incrementing an atomic is.
+#[cfg(unix)]
+unsafe extern "C" fn after_fork_in_child() {
+    FORK_GENERATION.fetch_add(1, Ordering::Relaxed);
+}
+
+struct RandPool {
+    buf: Box<[u8; POOL_SIZE]>,
+    pos: usize,
+    generation: u64,
+}
+
+impl RandPool {
+    fn new() -> RandPool {
+        RandPool {
+            buf: Box::new([0; POOL_SIZE]),
+            // Start empty, so the first request fills the buffer.
+            pos: POOL_SIZE,
+            generation: FORK_GENERATION.load(Ordering::Relaxed),
+        }
+    }
+
+    fn fill(&mut self, out: &mut [u8]) -> Result<(), openssl::error::ErrorStack> {
+        let generation = FORK_GENERATION.load(Ordering::Relaxed);
+        if self.generation != generation || POOL_SIZE - self.pos < out.len() {
+            openssl::rand::rand_bytes(&mut self.buf[..])?;
+            self.pos = 0;
+            self.generation = generation;
+        }
+
+        let end = self.pos + out.len();
+        out.copy_from_slice(&self.buf[self.pos..end]);
+        // Don't leave bytes that have been handed out lying around.
+        self.buf[self.pos..end].fill(0);
+        self.pos = end;
+        Ok(())
+    }
+}
+
+impl Drop for RandPool {
+    fn drop(&mut self) {
+        self.buf.fill(0);
+    }
+}
+
+thread_local! {
+    static POOL: RefCell<RandPool> = RefCell::new(RandPool::new());
+}
+
+fn fill_rand_bytes(b: &mut [u8]) -> Result<(), openssl::error::ErrorStack> {
+    #[cfg(any(
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC
+    ))]
+    openssl::rand::rand_bytes(b)?;
+    #[cfg(not(any(
+        CRYPTOGRAPHY_IS_LIBRESSL,
+        CRYPTOGRAPHY_IS_BORINGSSL,
+        CRYPTOGRAPHY_IS_AWSLC
+    )))]
+    openssl::rand::rand_priv_bytes(b)?;
+    Ok(())
+}
+
+// Fills `out` with random bytes from the calling thread's buffer. This is
+// intended for public values such as IVs, nonces, and salts; keys and other
+// secrets should use `get_rand_bytes`.
+pub(crate) fn fill_pooled_rand_bytes(out: &mut [u8]) -> CryptographyResult<()> {
+    if out.len() > MAX_POOLED_REQUEST {
+        openssl::rand::rand_bytes(out)?;
+        return Ok(());
+    }
+    POOL.with(|pool| pool.borrow_mut().fill(out))?;
+    Ok(())
+}
+
 pub(crate) fn get_rand_bytes(
     py: pyo3::Python<'_>,
     size: usize,
 ) -> CryptographyResult<pyo3::Bound<'_, pyo3::types::PyBytes>> {
     Ok(pyo3::types::PyBytes::new_with(py, size, |b| {
-        #[cfg(any(
-            CRYPTOGRAPHY_IS_LIBRESSL,
-            CRYPTOGRAPHY_IS_BORINGSSL,
-            CRYPTOGRAPHY_IS_AWSLC
-        ))]
-        openssl::rand::rand_bytes(b).map_err(CryptographyError::from)?;
-        #[cfg(not(any(
-            CRYPTOGRAPHY_IS_LIBRESSL,
-            CRYPTOGRAPHY_IS_BORINGSSL,
-            CRYPTOGRAPHY_IS_AWSLC
-        )))]
-        openssl::rand::rand_priv_bytes(b).map_err(CryptographyError::from)?;
+        fill_rand_bytes(b).map_err(CryptographyError::from)?;
         Ok(())
     })?)
 }
+
+pub(crate) fn get_pooled_rand_bytes(
+    py: pyo3::Python<'_>,
+    size: usize,
+) -> CryptographyResult<pyo3::Bound<'_, pyo3::types::PyBytes>> {
+    Ok(pyo3::types::PyBytes::new_with(py, size, |b| {
+        fill_pooled_rand_bytes(b)?;
+        Ok(())
+    })?)
+}
+
+#[pyo3::pyfunction]
+fn random_bytes(
+    py: pyo3::Python<'_>,
+    length: usize,
+) -> CryptographyResult<pyo3::Bound<'_, pyo3::types::PyBytes>> {
+    get_pooled_rand_bytes(py, length)
+}
+
+#[pyo3::pymodule]
+pub(crate) mod rand {
+    #[pymodule_export]
+    use super::random_bytes;
+
+    #[pymodule_init]
+    fn init(_m: &pyo3::Bound<'_, pyo3::types::PyModule>) -> pyo3::PyResult<()> {
+        // Windows doesn't fork.
+        #[cfg(unix)]
+        {
+            // SAFETY: `after_fork_in_child` is async-signal-safe, and the
+            // extension module is never unloaded, so the handler stays valid.
+            let rc = unsafe { super::pthread_atfork(None, None, Some(super::after_fork_in_child)) };
+            if rc != 0 {
+                return Err(std::io::Error::from_raw_os_error(rc).into());
+            }
+        }
+        Ok(())
+    }
+}
@@ -297,9 +297,12 @@ impl RsaPrivateKey {
         })?;
         setup_signature_ctx(py, &mut ctx, padding, &algorithm, self.pkey.size(), true)?;
 
-        let length = ctx.sign(data.as_bytes(), None)?;
+        let data = data.as_bytes();
+        let length = ctx.sign(data, None)?;
         Ok(pyo3::types::PyBytes::new_with(py, length, |b| {
-            let length = ctx.sign(data.as_bytes(), Some(b)).map_err(|_| {
+            // Private key operations are slow enough that it's always worth
+            // letting other threads run.
+            let length = py.allow_threads(|| ctx.sign(data, Some(b))).map_err(|_| {
                 pyo3::exceptions::PyValueError::new_err(
                     "Digest or salt length too long for key size. Use a larger key or shorter salt length if you are specifying a PSS salt",
                 )
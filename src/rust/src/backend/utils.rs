@@ -403,3 +403,87 @@ pub(crate) fn calculate_digest_and_algorithm<'p>(
 
     Ok((data, algorithm))
 }
+
+// Releasing the GIL has a fixed cost, so we only do it when there's enough
+// data that the operation is going to take a meaningful amount of time. This
+// can be changed at runtime with `set_gil_release_threshold`.
+static GIL_RELEASE_THRESHOLD: std::sync::atomic::AtomicUsize =
+    std::sync::atomic::AtomicUsize::new(64 * 1024);
+
+pub(crate) fn gil_release_threshold() -> usize {
+    GIL_RELEASE_THRESHOLD.load(std::sync::atomic::Ordering::Relaxed)
+}
+
+pub(crate) fn set_gil_release_threshold(threshold: usize) {
+    GIL_RELEASE_THRESHOLD.store(threshold, std::sync::atomic::Ordering::Relaxed);
+}
+
+// Runs `f` with the GIL released if `len` is large enough for that to be
+// worthwhile. Callers must ensure that any buffers `f` reads from or writes
+// to are kept alive (and exported, so they can't be resized) by the caller
+// for the duration of the call.
+pub(crate) fn allow_threads_if_large<T, F>(py: pyo3::Python<'_>, len: usize, f: F) -> T
+where
+    F: pyo3::marker::Ungil + FnOnce() -> T,
+    T: pyo3::marker::Ungil,
+{
+    if len >= gil_release_threshold() {
+        py.allow_threads(f)
+    } else {
+        f()
+    }
+}
+
+// The largest `parallelism` accepted by APIs which can split work across
+// threads. The number of threads actually started is further limited to the
+// number of CPUs available, see `thread_count`.
+const MAX_PARALLELISM: i64 = 1024;
+
+pub(crate) fn check_parallelism(parallelism: i64) -> CryptographyResult<usize> {
+    if parallelism < 1 {
+        return Err(CryptographyError::from(
+            pyo3::exceptions::PyValueError::new_err("parallelism must be at least 1"),
+        ));
+    }
+    if parallelism > MAX_PARALLELISM {
+        return Err(CryptographyError::from(
+            pyo3::exceptions::PyValueError::new_err(format!(
+                "parallelism must be at most {MAX_PARALLELISM}"
+            )),
+        ));
+    }
+    Ok(parallelism as usize)
+}
+
+// The number of threads to split work requested with `parallelism` across.
+// Starting more threads than there are CPUs to run them only adds overhead.
+pub(crate) fn thread_count(parallelism: usize) -> usize {
+    static AVAILABLE_PARALLELISM: std::sync::OnceLock<usize> = std::sync::OnceLock::new();
+    let available = *AVAILABLE_PARALLELISM
+        .get_or_init(|| std::thread::available_parallelism().map_or(1, |n| n.get()));
+    std::cmp::min(parallelism, available)
+}
+
+// Runs `f` on each of `tasks`, each on its own thread, with the GIL released,
+// returning the results in order. Callers are responsible for splitting their
+// work into at most `thread_count(parallelism)` tasks.
+pub(crate) fn map_in_threads<T, R, F>(py: pyo3::Python<'_>, tasks: Vec<T>, f: F) -> Vec<R>
+where
+    T: Send,
+    R: Send,
+    F: Fn(T) -> R + Sync,
+{
+    let f = &f;
+    py.allow_threads(|| {
+        std::thread::scope(|s| {
+            let handles = tasks
+                .into_iter()
+                .map(|t| s.spawn(move || f(t)))
+                .collect::<Vec<_>>();
+            handles
+                .into_iter()
+                .map(|h| h.join().expect("Worker thread panicked"))
+                .collect()
+        })
+    })
+}
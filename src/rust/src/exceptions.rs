@@ -35,6 +35,7 @@ pyo3::import_exception_bound!(cryptography.exceptions, InvalidSignature);
 pyo3::import_exception_bound!(cryptography.exceptions, InvalidTag);
 pyo3::import_exception_bound!(cryptography.exceptions, NotYetFinalized);
 pyo3::import_exception_bound!(cryptography.exceptions, UnsupportedAlgorithm);
+pyo3::import_exception_bound!(cryptography.fernet, InvalidToken);
 pyo3::import_exception_bound!(cryptography.x509, AttributeNotFound);
 pyo3::import_exception_bound!(cryptography.x509, DuplicateExtension);
 pyo3::import_exception_bound!(cryptography.x509, UnsupportedGeneralNameType);
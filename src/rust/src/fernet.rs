@@ -0,0 +1,489 @@
+// This file is dual licensed under the terms of the Apache License, Version
+// 2.0, and the BSD License. See the LICENSE file in the root of this repository
+// for complete details.
+
+use base64::engine::general_purpose::URL_SAFE;
+use base64::engine::Engine;
+use cryptography_crypto::constant_time;
+use pyo3::types::{PyAnyMethods, PyBytesMethods, PyStringMethods};
+
+use crate::backend::utils::{
+    allow_threads_if_large, check_parallelism, map_in_threads, thread_count,
+};
+use crate::buf::CffiBuf;
+use crate::error::{CryptographyError, CryptographyResult};
+use crate::exceptions;
+use crate::padding::check_pkcs7_padding;
+
+const VERSION: u8 = 0x80;
+const BLOCK_SIZE: usize = 16;
+// Version, timestamp, and IV.
+const HEADER_LENGTH: usize = 1 + 8 + BLOCK_SIZE;
+const HMAC_LENGTH: usize = 32;
+
+fn invalid_token() -> CryptographyError {
+    CryptographyError::from(exceptions::InvalidToken::new_err(()))
+}
+
+// Holds the HMAC and AES keys of a Fernet key, with their key schedules
+// computed once. Every operation works on copies of these contexts, so a
+// single instance can be used from multiple threads.
+#[pyo3::pyclass(
+    frozen,
+    module = "cryptography.hazmat.bindings._rust.fernet",
+    name = "Fernet"
+)]
+struct Fernet {
+    hmac: cryptography_openssl::hmac::Hmac,
+    encryption_ctx: openssl::cipher_ctx::CipherCtx,
+    decryption_ctx: openssl::cipher_ctx::CipherCtx,
+}
+
+impl Fernet {
+    // Returns the unencoded token for `data`.
+    fn encrypt_token(
+        &self,
+        data: &[u8],
+        current_time: u64,
+        iv: &[u8],
+    ) -> CryptographyResult<Vec<u8>> {
+        let ciphertext_length = (data.len() / BLOCK_SIZE + 1) * BLOCK_SIZE;
+        let signed_length = HEADER_LENGTH + ciphertext_length;
+        let mut token = vec![0; signed_length + HMAC_LENGTH];
+        token[0] = VERSION;
+        token[1..9].copy_from_slice(&current_time.to_be_bytes());
+        token[9..HEADER_LENGTH].copy_from_slice(iv);
+
+        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        ctx.copy(&self.encryption_ctx)?;
+        ctx.encrypt_init(None, None, Some(iv))?;
+        // The HMAC space after the ciphertext gives `cipher_update` the extra
+        // block of output space it requires.
+        let n = ctx.cipher_update(data, Some(&mut token[HEADER_LENGTH..]))?;
+        let n = n + ctx.cipher_final(&mut token[HEADER_LENGTH + n..])?;
+        assert_eq!(n, ciphertext_length);
+
+        let (signed, signature) = token.split_at_mut(signed_length);
+        self.sign(signed, signature)?;
+        Ok(token)
+    }
+
+    // Verifies the HMAC of `data`, a base64 decoded token, and decrypts its
+    // last ciphertext block to check the padding. Returns the length of the
+    // plaintext and the decrypted last block, or `None` if the token is
+    // invalid.
+    fn check_token(&self, data: &[u8]) -> CryptographyResult<Option<(usize, [u8; BLOCK_SIZE])>> {
+        if !self.verify_bytes(data)? || data.len() < HEADER_LENGTH + BLOCK_SIZE + HMAC_LENGTH {
+            return Ok(None);
+        }
+        let ciphertext_length = data.len() - HEADER_LENGTH - HMAC_LENGTH;
+        if ciphertext_length % BLOCK_SIZE != 0 {
+            return Ok(None);
+        }
+
+        // In CBC mode a block can be decrypted on its own, using the
+        // preceding ciphertext block (or for the first block, the IV, which
+        // immediately precedes the ciphertext) as the IV.
+        let end = data.len() - HMAC_LENGTH;
+        let mut ctx = self.decryption_ctx(&data[end - 2 * BLOCK_SIZE..end - BLOCK_SIZE])?;
+        let mut last = [0; 2 * BLOCK_SIZE];
+        let n = ctx.cipher_update(&data[end - BLOCK_SIZE..end], Some(&mut last))?;
+        assert_eq!(n, BLOCK_SIZE);
+        let last: [u8; BLOCK_SIZE] = last[..BLOCK_SIZE].try_into().unwrap();
+
+        // Invalid padding means an invalid token. The HMAC has already been
+        // verified, so this can't be used as a padding oracle.
+        if !check_pkcs7_padding(&last) {
+            return Ok(None);
+        }
+        let padding_length = usize::from(last[BLOCK_SIZE - 1]);
+        Ok(Some((ciphertext_length - padding_length, last)))
+    }
+
+    // Decrypts `data`, a token that `check_token` has returned `last` for,
+    // into `out`, which must be exactly the length of the plaintext.
+    fn decrypt_checked_token(
+        &self,
+        data: &[u8],
+        last: &[u8; BLOCK_SIZE],
+        out: &mut [u8],
+    ) -> CryptographyResult<()> {
+        let body = &data[HEADER_LENGTH..data.len() - HMAC_LENGTH - BLOCK_SIZE];
+        let (body_out, last_out) = out.split_at_mut(body.len());
+
+        let mut ctx = self.decryption_ctx(&data[9..HEADER_LENGTH])?;
+        // SAFETY: With padding disabled, decrypting whole blocks outputs
+        // exactly as many bytes as are input, and `body_out` is
+        // `body.len()` bytes.
+        let n = unsafe { ctx.cipher_update_unchecked(body, Some(body_out))? };
+        assert_eq!(n, body.len());
+        last_out.copy_from_slice(&last[..last_out.len()]);
+        Ok(())
+    }
+
+    // Verifies and decrypts `data`, a base64 decoded token. Returns `None` if
+    // the token is invalid.
+    fn decrypt_token(&self, data: &[u8]) -> CryptographyResult<Option<Vec<u8>>> {
+        let Some((length, last)) = self.check_token(data)? else {
+            return Ok(None);
+        };
+        let mut plaintext = vec![0; length];
+        self.decrypt_checked_token(data, &last, &mut plaintext)?;
+        Ok(Some(plaintext))
+    }
+
+    fn decryption_ctx(&self, iv: &[u8]) -> CryptographyResult<openssl::cipher_ctx::CipherCtx> {
+        let mut ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        ctx.copy(&self.decryption_ctx)?;
+        ctx.decrypt_init(None, None, Some(iv))?;
+        ctx.set_padding(false);
+        Ok(ctx)
+    }
+
+    fn sign(&self, data: &[u8], out: &mut [u8]) -> CryptographyResult<()> {
+        let mut h = self.hmac.copy()?;
+        h.update(data)?;
+        out.copy_from_slice(&h.finish()?);
+        Ok(())
+    }
+
+    fn verify_bytes(&self, data: &[u8]) -> CryptographyResult<bool> {
+        if data.len() < HMAC_LENGTH {
+            return Ok(false);
+        }
+        let (signed, signature) = data.split_at(data.len() - HMAC_LENGTH);
+        let mut expected = [0; HMAC_LENGTH];
+        self.sign(signed, &mut expected)?;
+        Ok(constant_time::bytes_eq(&expected, signature))
+    }
+}
+
+// Applies `f` to each of `items`, with the GIL released if there's enough
+// work for that to be worthwhile. With `parallelism` greater than one the
+// items are split evenly across that many threads (but no more threads than
+// there are CPUs).
+fn map_batch<T, R, F>(
+    py: pyo3::Python<'_>,
+    items: &[T],
+    total_length: usize,
+    parallelism: i64,
+    f: F,
+) -> CryptographyResult<Vec<R>>
+where
+    T: Sync,
+    R: Send,
+    F: Fn(&T) -> CryptographyResult<R> + Sync,
+{
+    let threads = thread_count(check_parallelism(parallelism)?);
+    if threads == 1 || items.len() < 2 {
+        return allow_threads_if_large(py, total_length, || items.iter().map(&f).collect());
+    }
+
+    let chunks = items
+        .chunks(items.len().div_ceil(threads))
+        .collect::<Vec<_>>();
+    let mut results = Vec::with_capacity(items.len());
+    for chunk_results in map_in_threads(py, chunks, |chunk| {
+        chunk.iter().map(&f).collect::<CryptographyResult<Vec<_>>>()
+    }) {
+        results.extend(chunk_results?);
+    }
+    Ok(results)
+}
+
+#[pyo3::pymethods]
+impl Fernet {
+    #[new]
+    fn new(key: CffiBuf<'_>) -> CryptographyResult<Fernet> {
+        let key = key.as_bytes();
+        if key.len() != 32 {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err(
+                    "Fernet key must be 32 url-safe base64-encoded bytes.",
+                ),
+            ));
+        }
+        let (signing_key, encryption_key) = key.split_at(16);
+
+        let hmac = cryptography_openssl::hmac::Hmac::new(
+            signing_key,
+            openssl::hash::MessageDigest::sha256(),
+        )?;
+
+        let cipher = openssl::cipher::Cipher::aes_128_cbc();
+        let mut encryption_ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        encryption_ctx.encrypt_init(Some(cipher), Some(encryption_key), None)?;
+        let mut decryption_ctx = openssl::cipher_ctx::CipherCtx::new()?;
+        decryption_ctx.decrypt_init(Some(cipher), Some(encryption_key), None)?;
+
+        Ok(Fernet {
+            hmac,
+            encryption_ctx,
+            decryption_ctx,
+        })
+    }
+
+    // Builds the token in a single buffer: the header, the PKCS7 padded
+    // ciphertext (OpenSSL's padding is the same as Fernet's), and the HMAC,
+    // which is then base64 encoded directly into the returned bytes.
+    fn encrypt<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        data: CffiBuf<'_>,
+        current_time: u64,
+        iv: CffiBuf<'_>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let data = data.as_bytes();
+        let iv = iv.as_bytes();
+        if iv.len() != BLOCK_SIZE {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("iv must be 16 bytes long."),
+            ));
+        }
+
+        let token = allow_threads_if_large(py, data.len(), || {
+            self.encrypt_token(data, current_time, iv)
+        })?;
+
+        let encoded_length = base64::encoded_len(token.len(), true).unwrap();
+        Ok(pyo3::types::PyBytes::new_with(py, encoded_length, |b| {
+            let n = URL_SAFE.encode_slice(&token, b).unwrap();
+            assert_eq!(n, encoded_length);
+            Ok(())
+        })?)
+    }
+
+    // `ivs` is the concatenation of one IV for each item of `data`.
+    fn encrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        data: Vec<CffiBuf<'_>>,
+        current_time: u64,
+        ivs: CffiBuf<'_>,
+        parallelism: i64,
+    ) -> CryptographyResult<Vec<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+        if ivs.as_bytes().len() != data.len() * BLOCK_SIZE {
+            return Err(CryptographyError::from(
+                pyo3::exceptions::PyValueError::new_err("ivs must be 16 bytes per item."),
+            ));
+        }
+        let items = data
+            .iter()
+            .map(|d| d.as_bytes())
+            .zip(ivs.as_bytes().chunks(BLOCK_SIZE))
+            .collect::<Vec<_>>();
+        let total_length = items.iter().map(|(d, _)| d.len()).sum();
+
+        let tokens = map_batch(py, &items, total_length, parallelism, |(d, iv)| {
+            self.encrypt_token(d, current_time, iv)
+        })?;
+        tokens
+            .iter()
+            .map(|token| -> CryptographyResult<_> {
+                let encoded_length = base64::encoded_len(token.len(), true).unwrap();
+                Ok(pyo3::types::PyBytes::new_with(py, encoded_length, |b| {
+                    let n = URL_SAFE.encode_slice(token, b).unwrap();
+                    assert_eq!(n, encoded_length);
+                    Ok(())
+                })?)
+            })
+            .collect()
+    }
+
+    // `data` is a base64 decoded token.
+    fn verify(&self, data: CffiBuf<'_>) -> CryptographyResult<()> {
+        if !self.verify_bytes(data.as_bytes())? {
+            return Err(invalid_token());
+        }
+        Ok(())
+    }
+
+    // `data` is a base64 decoded token. The timestamp is checked by the
+    // caller.
+    fn decrypt<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        data: CffiBuf<'_>,
+    ) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+        let data = data.as_bytes();
+        let Some((length, last)) =
+            allow_threads_if_large(py, data.len(), || self.check_token(data))?
+        else {
+            return Err(invalid_token());
+        };
+        // The plaintext length is known once the padding is checked, so the
+        // ciphertext is decrypted directly into the returned bytes.
+        Ok(pyo3::types::PyBytes::new_with(py, length, |b| {
+            allow_threads_if_large(py, length, || self.decrypt_checked_token(data, &last, b))?;
+            Ok(())
+        })?)
+    }
+
+    // Each item of `data` is a base64 decoded token, or `None` for a token
+    // that the caller has already found to be invalid. Returns `None` for
+    // each invalid token.
+    fn decrypt_many<'p>(
+        &self,
+        py: pyo3::Python<'p>,
+        data: Vec<Option<CffiBuf<'_>>>,
+        parallelism: i64,
+    ) -> CryptographyResult<Vec<Option<pyo3::Bound<'p, pyo3::types::PyBytes>>>> {
+        let items = data
+            .iter()
+            .map(|d| d.as_ref().map(|d| d.as_bytes()))
+            .collect::<Vec<_>>();
+        let total_length = items.iter().flatten().map(|d| d.len()).sum();
+
+        let plaintexts = map_batch(py, &items, total_length, parallelism, |d| match d {
+            Some(d) => self.decrypt_token(d),
+            None => Ok(None),
+        })?;
+        Ok(plaintexts
+            .iter()
+            .map(|p| p.as_ref().map(|p| pyo3::types::PyBytes::new(py, p)))
+            .collect())
+    }
+}
+
+// Decodes `token` directly into the returned bytes, if it is canonical,
+// padded, URL-safe base64, which is what every Fernet implementation
+// produces. Returns `None` for anything else, so that the caller can fall
+// back to the more lenient `base64.urlsafe_b64decode`.
+#[pyo3::pyfunction]
+fn urlsafe_b64decode<'p>(
+    py: pyo3::Python<'p>,
+    token: pyo3::Bound<'p, pyo3::PyAny>,
+) -> pyo3::PyResult<Option<pyo3::Bound<'p, pyo3::types::PyBytes>>> {
+    let string;
+    let encoded = if let Ok(s) = token.downcast::<pyo3::types::PyString>() {
+        match s.to_cow() {
+            Ok(s) => {
+                string = s;
+                string.as_bytes()
+            }
+            Err(_) => return Ok(None),
+        }
+    } else {
+        token.downcast::<pyo3::types::PyBytes>()?.as_bytes()
+    };
+
+    if encoded.len() % 4 != 0 {
+        return Ok(None);
+    }
+    let padding = encoded
+        .iter()
+        .rev()
+        .take(2)
+        .take_while(|&&c| c == b'=')
+        .count();
+    let length = encoded.len() / 4 * 3 - padding;
+    let decoded =
+        pyo3::types::PyBytes::new_with(py, length, |b| match URL_SAFE.decode_slice(encoded, b) {
+            Ok(n) if n == length => Ok(()),
+            _ => Err(pyo3::exceptions::PyValueError::new_err("Invalid base64")),
+        });
+    Ok(decoded.ok())
+}
+
+// Decrypts `data`, a base64 decoded token, with the first of `fernets` whose
+// key it was created with. Returns `None` if there is no such key.
+fn decrypt_token_any(fernets: &[&Fernet], data: &[u8]) -> CryptographyResult<Option<Vec<u8>>> {
+    for f in fernets {
+        if let Some(plaintext) = f.decrypt_token(data)? {
+            return Ok(Some(plaintext));
+        }
+    }
+    Ok(None)
+}
+
+// This lets `MultiFernet` decode a token once and then check the HMAC for
+// each key, without raising an exception for each key that doesn't match.
+#[pyo3::pyfunction]
+fn decrypt_any<'p>(
+    py: pyo3::Python<'p>,
+    fernets: Vec<pyo3::Bound<'_, Fernet>>,
+    data: CffiBuf<'_>,
+) -> CryptographyResult<pyo3::Bound<'p, pyo3::types::PyBytes>> {
+    let fernets = fernets.iter().map(|f| f.get()).collect::<Vec<_>>();
+    match decrypt_token_any(&fernets, data.as_bytes())? {
+        Some(plaintext) => Ok(pyo3::types::PyBytes::new(py, &plaintext)),
+        None => Err(invalid_token()),
+    }
+}
+
+// Decrypts each of `data`, base64 decoded tokens, with any of `fernets`, and
+// encrypts it again with the first of `fernets`, keeping its timestamp. `ivs`
+// is the concatenation of one IV for each token. Rotation stops at the first
+// invalid token, for which `None` is returned as the last item, so that the
+// caller can return the tokens rotated before it and then raise
+// `InvalidToken`.
+#[pyo3::pyfunction]
+fn rotate_many<'p>(
+    py: pyo3::Python<'p>,
+    fernets: Vec<pyo3::Bound<'_, Fernet>>,
+    data: Vec<CffiBuf<'_>>,
+    ivs: CffiBuf<'_>,
+) -> CryptographyResult<Vec<Option<pyo3::Bound<'p, pyo3::types::PyBytes>>>> {
+    if ivs.as_bytes().len() != data.len() * BLOCK_SIZE {
+        return Err(CryptographyError::from(
+            pyo3::exceptions::PyValueError::new_err("ivs must be 16 bytes per token."),
+        ));
+    }
+    let fernets = fernets.iter().map(|f| f.get()).collect::<Vec<_>>();
+    let items = data
+        .iter()
+        .map(|d| d.as_bytes())
+        .zip(ivs.as_bytes().chunks(BLOCK_SIZE))
+        .collect::<Vec<_>>();
+    let total_length = items.iter().map(|(d, _)| d.len()).sum();
+
+    let tokens = allow_threads_if_large(py, total_length, || -> CryptographyResult<_> {
+        let mut tokens = Vec::with_capacity(items.len());
+        for (d, iv) in &items {
+            let Some(plaintext) = decrypt_token_any(&fernets, d)? else {
+                tokens.push(None);
+                break;
+            };
+            let timestamp = u64::from_be_bytes(d[1..9].try_into().unwrap());
+            tokens.push(Some(fernets[0].encrypt_token(&plaintext, timestamp, iv)?));
+        }
+        Ok(tokens)
+    })?;
+    tokens
+        .iter()
+        .map(|token| -> CryptographyResult<_> {
+            let Some(token) = token else {
+                return Ok(None);
+            };
+            let encoded_length = base64::encoded_len(token.len(), true).unwrap();
+            Ok(Some(pyo3::types::PyBytes::new_with(
+                py,
+                encoded_length,
+                |b| {
+                    let n = URL_SAFE.encode_slice(token, b).unwrap();
+                    assert_eq!(n, encoded_length);
+                    Ok(())
+                },
+            )?))
+        })
+        .collect()
+}
+
+// Raises `InvalidToken` unless the HMAC of `data`, a base64 decoded token,
+// is valid for one of `fernets`.
+#[pyo3::pyfunction]
+fn verify_any(fernets: Vec<pyo3::Bound<'_, Fernet>>, data: CffiBuf<'_>) -> CryptographyResult<()> {
+    let data = data.as_bytes();
+    for f in &fernets {
+        if f.get().verify_bytes(data)? {
+            return Ok(());
+        }
+    }
+    Err(invalid_token())
+}
+
+#[pyo3::pymodule]
+pub(crate) mod fernet {
+    #[pymodule_export]
+    use super::{decrypt_any, rotate_many, urlsafe_b64decode, verify_any, Fernet};
+}
@@ -20,6 +20,7 @@ mod backend;
 mod buf;
 mod error;
 mod exceptions;
+mod fernet;
 pub(crate) mod oid;
 mod padding;
 mod pkcs12;
@@ -103,6 +104,8 @@ mod _rust {
     #[pymodule_export]
     use crate::exceptions::exceptions;
     #[pymodule_export]
+    use crate::fernet::fernet;
+    #[pymodule_export]
     use crate::oid::ObjectIdentifier;
     #[pymodule_export]
     use crate::padding::{
@@ -194,6 +197,8 @@ mod _rust {
         #[pymodule_export]
         use crate::backend::poly1305::poly1305;
         #[pymodule_export]
+        use crate::backend::rand::rand;
+        #[pymodule_export]
         use crate::backend::rsa::rsa;
         #[pymodule_export]
         use crate::backend::x25519::x25519;
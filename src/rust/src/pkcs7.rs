@@ -107,7 +107,7 @@ fn encrypt_and_serialize<'p>(
     let content_encryption_algorithm = content_encryption_algorithm_type.call1((&key,))?;
 
     // Get the mode
-    let iv = crate::backend::rand::get_rand_bytes(py, 16)?;
+    let iv = crate::backend::rand::get_pooled_rand_bytes(py, 16)?;
     let cbc_mode = types::CBC.get(py)?.call1((&iv,))?;
 
     let encrypted_content = symmetric_encrypt(
@@ -52,6 +52,12 @@ def test_aesgcm_decrypt(benchmark):
     benchmark(aes.decrypt, b"\x00" * 12, ct, None)
 
 
+def test_aesgcm_encrypt_many(benchmark):
+    aes = AESGCM(b"\x00" * 32)
+    items = [(b"\x00" * 12, b"hello world plaintext", None)] * 100
+    benchmark(aes.encrypt_many, items)
+
+
 @pytest.mark.skipif(
     not _aead_supported(AESSIV),
     reason="Requires OpenSSL with AES-SIV support",
@@ -4,13 +4,19 @@
 
 
 import binascii
+import concurrent.futures
 import mmap
 import os
 import sys
 
 import pytest
 
-from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm, _Reasons
+from cryptography.exceptions import (
+    AlreadyFinalized,
+    InvalidTag,
+    UnsupportedAlgorithm,
+    _Reasons,
+)
 from cryptography.hazmat.bindings._rust import openssl as rust_openssl
 from cryptography.hazmat.primitives.ciphers.aead import (
     AESCCM,
@@ -19,6 +25,8 @@ from cryptography.hazmat.primitives.ciphers.aead import (
     AESOCB3,
     AESSIV,
     ChaCha20Poly1305,
+    StreamDecryptor,
+    StreamEncryptor,
 )
 
 from ...utils import (
@@ -194,6 +202,22 @@ class TestChaCha20Poly1305:
         computed_pt2 = chacha2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_encrypt_decrypt_into(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        nonce = os.urandom(12)
+        ct = chacha.encrypt(nonce, b"encrypt me", b"ad")
+        buf = bytearray(len(ct))
+        assert chacha.encrypt_into(nonce, b"encrypt me", b"ad", buf) == 26
+        assert buf == ct
+        pt_buf = bytearray(10)
+        assert chacha.decrypt_into(nonce, buf, b"ad", pt_buf) == 10
+        assert pt_buf == b"encrypt me"
+
+        with pytest.raises(ValueError):
+            chacha.encrypt_into(nonce, b"encrypt me", b"ad", bytearray(25))
+        with pytest.raises(ValueError):
+            chacha.decrypt_into(nonce, ct, b"ad", bytearray(11))
+
 
 @pytest.mark.skipif(
     not _aead_supported(AESCCM),
@@ -364,6 +388,86 @@ class TestAESCCM:
         computed_pt2 = aesccm2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_encrypt_decrypt_into(self, backend):
+        aesccm = AESCCM(AESCCM.generate_key(128), tag_length=8)
+        nonce = os.urandom(12)
+        ct = aesccm.encrypt(nonce, b"encrypt me", None)
+        buf = bytearray(18)
+        assert aesccm.encrypt_into(nonce, b"encrypt me", None, buf) == 18
+        assert buf == ct
+        pt_buf = bytearray(10)
+        assert aesccm.decrypt_into(nonce, ct, None, pt_buf) == 10
+        assert pt_buf == b"encrypt me"
+
+        with pytest.raises(ValueError):
+            aesccm.encrypt_into(nonce, b"encrypt me", None, bytearray(26))
+        with pytest.raises(InvalidTag):
+            aesccm.decrypt_into(nonce, ct[:-1], None, bytearray(9))
+
+    @pytest.mark.parametrize("tag_length", [4, 16])
+    def test_cached_contexts(self, tag_length, backend):
+        # Keyed contexts are pooled per nonce length and reused by giving
+        # them just a new nonce (and tag, when decrypting). Every item after
+        # the first of each nonce length uses a reused context, so make sure
+        # that state from one call (AAD, data length, a failed tag check)
+        # doesn't leak into the next.
+        key = AESCCM.generate_key(128)
+        aesccm = AESCCM(key, tag_length=tag_length)
+        items = [
+            (b"\x00" * 12, b"abc", b"ad"),
+            (b"\x01" * 7, b"def" * 20, None),
+            (b"\x02" * 13, b"", b"more ad"),
+            (b"\x00" * 12, b"abc", None),
+            (b"\x03" * 12, b"ghi" * 7, b"ad"),
+        ]
+        for nonce, pt, ad in items * 2:
+            ct = aesccm.encrypt(nonce, pt, ad)
+            assert ct == AESCCM(key, tag_length=tag_length).encrypt(
+                nonce, pt, ad
+            )
+            with pytest.raises(InvalidTag):
+                aesccm.decrypt(nonce, ct[:-1] + bytes([ct[-1] ^ 1]), ad)
+            with pytest.raises(InvalidTag):
+                aesccm.decrypt(nonce, ct[: tag_length - 1], ad)
+            assert aesccm.decrypt(nonce, ct, ad) == pt
+
+            buf = bytearray(len(ct))
+            assert aesccm.encrypt_into(nonce, pt, ad, buf) == len(ct)
+            assert buf == ct
+            pt_buf = bytearray(len(pt))
+            assert aesccm.decrypt_into(nonce, ct, ad, pt_buf) == len(pt)
+            assert pt_buf == pt
+
+    def test_cached_contexts_vectors(self, backend):
+        # A single instance processes several RFC 3610 messages, so all but
+        # the first of them go through a reused context.
+        key = binascii.unhexlify("c0c1c2c3c4c5c6c7c8c9cacbcccdcecf")
+        aesccm = AESCCM(key, tag_length=8)
+        vectors = [
+            (
+                "00000003020100a0a1a2a3a4a5",
+                "0001020304050607",
+                "08090a0b0c0d0e0f101112131415161718191a1b1c1d1e",
+                "588c979a61c663d2f066d0c2c0f989806d5f6b61dac38417e8d12cfdf926e0",
+            ),
+            (
+                "00000004030201a0a1a2a3a4a5",
+                "0001020304050607",
+                "08090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+                "72c91a36e135f8cf291ca894085c87e3cc15c439c9e43a3ba091d56e10400916",
+            ),
+            (
+                "00000005040302a0a1a2a3a4a5",
+                "0001020304050607",
+                "08090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f20",
+                "51b1e5f44a197d1da46b0f8e2d282ae871e838bb64da8596574adaa76fbd9fb0c5",
+            ),
+        ]
+        for vector in vectors * 2:
+            nonce, ad, pt, ct = (binascii.unhexlify(v) for v in vector)
+            assert aesccm.encrypt(nonce, pt, ad) == ct
+            assert aesccm.decrypt(nonce, ct, ad) == pt
+
     def test_max_data_length(self):
         plaintext = b"A" * 65535
         aad = b"authenticated but unencrypted data"
@@ -525,6 +629,154 @@ class TestAESGCM:
         computed_pt3 = aesgcm3.decrypt(m_nonce, m_ct3, m_ad)
         assert computed_pt3 == pt
 
+    def test_encrypt_decrypt_into(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        pt = b"encrypt me" * 10
+        ct = aesgcm.encrypt(nonce, pt, b"ad")
+        buf = bytearray(len(ct))
+        assert aesgcm.encrypt_into(nonce, pt, b"ad", memoryview(buf)) == 116
+        assert buf == ct
+        pt_buf = bytearray(len(pt))
+        assert aesgcm.decrypt_into(nonce, ct, b"ad", pt_buf) == 100
+        assert pt_buf == pt
+
+        with pytest.raises(ValueError):
+            aesgcm.encrypt_into(nonce, pt, b"ad", bytearray(100))
+        with pytest.raises(ValueError):
+            aesgcm.decrypt_into(nonce, ct, b"ad", bytearray(116))
+        with pytest.raises(TypeError):
+            aesgcm.encrypt_into(nonce, pt, b"ad", bytes(116))
+
+    def test_decrypt_into_invalid_tag_zeroes_buffer(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        ct = aesgcm.encrypt(nonce, b"encrypt me", None)
+        buf = bytearray(b"\xff" * 10)
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_into(
+                nonce, ct[:-1] + bytes([ct[-1] ^ 1]), None, buf
+            )
+        assert buf == bytearray(10)
+
+    def test_encrypt_decrypt_many(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(256))
+        items = [
+            (os.urandom(12), os.urandom(i * 7), b"ad" if i % 2 else None)
+            for i in range(20)
+        ]
+        items.append((os.urandom(16), b"longer nonce", b""))
+        cts = aesgcm.encrypt_many(items)
+        assert cts == [aesgcm.encrypt(n, pt, ad) for n, pt, ad in items]
+
+        pts = aesgcm.decrypt_many(
+            [(n, ct, ad) for (n, _, ad), ct in zip(items, cts)]
+        )
+        assert pts == [pt for _, pt, _ in items]
+
+        assert aesgcm.encrypt_many([]) == []
+        assert aesgcm.decrypt_many([]) == []
+
+    def test_encrypt_many_invalid(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        with pytest.raises(ValueError):
+            aesgcm.encrypt_many(
+                [(b"0" * 12, b"", None), (b"0" * 4, b"", None)]
+            )
+        with pytest.raises(TypeError):
+            aesgcm.encrypt_many([(b"0" * 12, "data", None)])  # type: ignore[list-item]
+
+    def test_decrypt_many_invalid_tag(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        ct = aesgcm.encrypt(nonce, b"data", None)
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_many(
+                [
+                    (nonce, ct, None),
+                    (nonce, ct[:-1] + bytes([ct[-1] ^ 1]), None),
+                ]
+            )
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_many([(nonce, ct, None), (nonce, ct[:15], None)])
+
+    @pytest.mark.parametrize("length", [0, 1, 100, 2**17])
+    def test_decrypt_in_place(self, length, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        pt = os.urandom(length)
+        buf = bytearray(aesgcm.encrypt(nonce, pt, b"ad"))
+        with aesgcm.decrypt_in_place(nonce, buf, b"ad") as view:
+            assert view == pt
+            assert len(view) == length
+        assert buf[:length] == pt
+
+    def test_decrypt_in_place_invalid_tag(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        nonce = os.urandom(12)
+        ct = aesgcm.encrypt(nonce, b"data", None)
+        buf = bytearray(ct[:-1] + bytes([ct[-1] ^ 1]))
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_in_place(nonce, buf, None)
+        assert buf == bytearray(len(ct))
+
+        buf = bytearray(ct)
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_in_place(nonce, buf, b"wrong")
+        assert buf == bytearray(len(ct))
+
+        buf = bytearray(ct[:15])
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt_in_place(nonce, buf, None)
+
+    def test_decrypt_in_place_invalid(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        ct = aesgcm.encrypt(b"\x00" * 12, b"data", None)
+        with pytest.raises(TypeError):
+            aesgcm.decrypt_in_place(b"\x00" * 12, ct, None)
+        with pytest.raises(ValueError):
+            aesgcm.decrypt_in_place(b"\x00" * 7, bytearray(ct), None)
+
+    def test_context_reuse(self, backend):
+        # Contexts are reused between calls, so make sure the state from one
+        # call (nonce length, AAD, a failed tag check) doesn't leak into the
+        # next.
+        key = AESGCM.generate_key(128)
+        aesgcm = AESGCM(key)
+        items = [
+            (b"\x00" * 12, b"abc", b"ad"),
+            (b"\x01" * 16, b"def" * 20, None),
+            (b"\x02" * 8, b"", b"more ad"),
+            (b"\x00" * 12, b"abc", None),
+        ]
+        for nonce, pt, ad in items * 2:
+            ct = aesgcm.encrypt(nonce, pt, ad)
+            assert ct == AESGCM(key).encrypt(nonce, pt, ad)
+            with pytest.raises(InvalidTag):
+                aesgcm.decrypt(nonce, ct[:-1] + bytes([ct[-1] ^ 1]), ad)
+            assert aesgcm.decrypt(nonce, ct, ad) == pt
+
+    def test_large_data_threads(self, backend):
+        # Large payloads are processed with the GIL released, so make sure
+        # concurrent use of a single instance is consistent.
+        key = AESGCM.generate_key(128)
+        aesgcm = AESGCM(key)
+        nonce = os.urandom(12)
+        pt = os.urandom(1024 * 1024)
+        ct = aesgcm.encrypt(nonce, pt, b"ad")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            cts = list(
+                pool.map(lambda _: aesgcm.encrypt(nonce, pt, b"ad"), range(8))
+            )
+            pts = list(
+                pool.map(lambda c: aesgcm.decrypt(nonce, c, b"ad"), cts)
+            )
+        assert cts == [ct] * 8
+        assert pts == [pt] * 8
+
+        with pytest.raises(InvalidTag):
+            aesgcm.decrypt(nonce, ct[:-1] + bytes([ct[-1] ^ 1]), b"ad")
+
 
 @pytest.mark.skipif(
     _aead_supported(AESOCB3),
@@ -863,6 +1115,19 @@ class TestAESSIV:
         computed_pt2 = aessiv.decrypt(ct2, ad)
         assert computed_pt2 == pt
 
+    def test_encrypt_decrypt_into(self, backend):
+        aessiv = AESSIV(AESSIV.generate_key(256))
+        ct = aessiv.encrypt(b"encrypt me", [b"ad"])
+        buf = bytearray(26)
+        assert aessiv.encrypt_into(b"encrypt me", [b"ad"], buf) == 26
+        assert buf == ct
+        pt_buf = bytearray(10)
+        assert aessiv.decrypt_into(ct, [b"ad"], pt_buf) == 10
+        assert pt_buf == b"encrypt me"
+
+        with pytest.raises(ValueError):
+            aessiv.encrypt_into(b"encrypt me", [b"ad"], bytearray(10))
+
 
 @pytest.mark.skipif(
     not _aead_supported(AESGCMSIV),
@@ -1057,3 +1322,109 @@ class TestAESGCMSIV:
         assert ct2 == ct
         computed_pt2 = aesgcmsiv.decrypt(nonce, ct2, ad)
         assert computed_pt2 == pt
+
+
+class TestStream:
+    def _encrypt(self, aead, prefix, segment_size, pt, chunk_size, ad=None):
+        encryptor = StreamEncryptor(aead, prefix, segment_size, ad)
+        ct = b"".join(
+            encryptor.update(pt[i : i + chunk_size])
+            for i in range(0, len(pt), chunk_size)
+        )
+        return ct + encryptor.finalize()
+
+    def _decrypt(self, aead, prefix, segment_size, ct, chunk_size, ad=None):
+        decryptor = StreamDecryptor(aead, prefix, segment_size, ad)
+        pt = b"".join(
+            decryptor.update(ct[i : i + chunk_size])
+            for i in range(0, len(ct), chunk_size)
+        )
+        return pt + decryptor.finalize()
+
+    @pytest.mark.parametrize("length", [0, 1, 63, 64, 65, 128, 1000])
+    @pytest.mark.parametrize("chunk_size", [1, 17, 64, 4096])
+    def test_roundtrip(self, length, chunk_size, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        prefix = os.urandom(7)
+        pt = os.urandom(length)
+        ct = self._encrypt(aesgcm, prefix, 64, pt, chunk_size, b"ad")
+        assert len(ct) == length + 16 * max(1, -(-length // 64))
+        assert self._decrypt(aesgcm, prefix, 64, ct, chunk_size, b"ad") == pt
+
+    def test_segment_nonces(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        prefix = b"\x01" * 7
+        ct = self._encrypt(aesgcm, prefix, 4, b"abcdefghij", 10)
+        assert ct == b"".join(
+            [
+                aesgcm.encrypt(
+                    prefix + b"\x00\x00\x00\x00\x00", b"abcd", None
+                ),
+                aesgcm.encrypt(
+                    prefix + b"\x00\x00\x00\x01\x00", b"efgh", None
+                ),
+                aesgcm.encrypt(prefix + b"\x00\x00\x00\x02\x01", b"ij", None),
+            ]
+        )
+
+    def test_truncation(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        prefix = os.urandom(7)
+        ct = self._encrypt(aesgcm, prefix, 16, b"\x00" * 64, 64)
+        # Drop the final segment; the previous one isn't marked as last.
+        with pytest.raises(InvalidTag):
+            self._decrypt(aesgcm, prefix, 16, ct[:-32], 64)
+        with pytest.raises(InvalidTag):
+            self._decrypt(aesgcm, prefix, 16, ct[:-1], 64)
+        with pytest.raises(InvalidTag):
+            self._decrypt(aesgcm, prefix, 16, ct[32:], 64)
+
+    def test_wrong_associated_data(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        prefix = os.urandom(7)
+        ct = self._encrypt(chacha, prefix, 16, b"data", 4, b"ad")
+        with pytest.raises(InvalidTag):
+            self._decrypt(chacha, prefix, 16, ct, 4, b"other")
+
+    def test_already_finalized(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        encryptor = StreamEncryptor(aesgcm, b"\x00" * 7, 16)
+        encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update(b"data")
+        with pytest.raises(AlreadyFinalized):
+            encryptor.finalize()
+
+    def test_unusable_after_error(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        prefix = os.urandom(7)
+        ct = self._encrypt(aesgcm, prefix, 16, b"\x00" * 64, 64)
+        # Corrupt the second segment, so the first one has already been
+        # processed when the update fails.
+        corrupted = bytearray(ct)
+        corrupted[40] ^= 1
+        decryptor = StreamDecryptor(aesgcm, prefix, 16)
+        with pytest.raises(InvalidTag):
+            decryptor.update(corrupted)
+        with pytest.raises(AlreadyFinalized):
+            decryptor.update(ct[64:])
+        with pytest.raises(AlreadyFinalized):
+            decryptor.finalize()
+
+        decryptor = StreamDecryptor(aesgcm, prefix, 16)
+        decryptor.update(ct[:-1])
+        with pytest.raises(InvalidTag):
+            decryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            decryptor.finalize()
+
+    def test_invalid_params(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        with pytest.raises(ValueError):
+            StreamEncryptor(aesgcm, b"\x00" * 8, 16)
+        with pytest.raises(ValueError):
+            StreamEncryptor(aesgcm, b"\x00" * 7, 0)
+        with pytest.raises(TypeError):
+            StreamEncryptor(aesgcm, b"\x00" * 7, 1.5)  # type: ignore[arg-type]
+        with pytest.raises(TypeError):
+            StreamEncryptor(object(), b"\x00" * 7, 16)  # type: ignore[arg-type]
@@ -0,0 +1,207 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+
+import os
+import sys
+
+import pytest
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import (
+    AESGCM,
+    StreamDecryptor,
+    StreamEncryptor,
+)
+from cryptography.hazmat.primitives.ciphers.files import (
+    decrypt_file,
+    decrypt_file_aead,
+    encrypt_file,
+    encrypt_file_aead,
+)
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.skipif(
+    sys.platform not in {"linux", "darwin"} or sys.maxsize < 2**31,
+    reason="mmap and 64-bit platform required",
+)
+class TestFiles:
+    @pytest.mark.parametrize("length", [0, 1, 15, 16, 17, 4096, 2**20 + 5])
+    def test_ctr_roundtrip(self, tmp_path, length, backend):
+        key = os.urandom(16)
+        nonce = os.urandom(16)
+        cipher = Cipher(algorithms.AES(key), modes.CTR(nonce))
+        data = os.urandom(length)
+        _write(tmp_path / "src", data)
+
+        encrypt_file(tmp_path / "src", tmp_path / "enc", cipher)
+        ct = _read(tmp_path / "enc")
+        assert ct == cipher.encryptor().update(data)
+
+        decrypt_file(tmp_path / "enc", tmp_path / "dec", cipher)
+        assert _read(tmp_path / "dec") == data
+
+    @pytest.mark.parametrize("length", [0, 16, 4096])
+    def test_cbc_roundtrip(self, tmp_path, length, backend):
+        cipher = Cipher(
+            algorithms.AES(os.urandom(16)), modes.CBC(os.urandom(16))
+        )
+        data = os.urandom(length)
+        _write(tmp_path / "src", data)
+
+        encrypt_file(tmp_path / "src", tmp_path / "enc", cipher)
+        encryptor = cipher.encryptor()
+        ct = encryptor.update(data) + encryptor.finalize()
+        assert _read(tmp_path / "enc") == ct
+
+        decrypt_file(tmp_path / "enc", tmp_path / "dec", cipher)
+        assert _read(tmp_path / "dec") == data
+
+    def test_cbc_unaligned(self, tmp_path, backend):
+        cipher = Cipher(
+            algorithms.AES(os.urandom(16)), modes.CBC(os.urandom(16))
+        )
+        _write(tmp_path / "src", b"\x00" * 17)
+        with pytest.raises(ValueError):
+            encrypt_file(tmp_path / "src", tmp_path / "enc", cipher)
+        assert _read(tmp_path / "enc") == b""
+
+    def test_invalid_cipher(self, tmp_path, backend):
+        _write(tmp_path / "src", b"\x00" * 16)
+        with pytest.raises(TypeError):
+            encrypt_file(
+                tmp_path / "src",
+                tmp_path / "enc",
+                object(),  # type: ignore[arg-type]
+            )
+        with pytest.raises(TypeError):
+            encrypt_file(
+                tmp_path / "src",
+                tmp_path / "enc",
+                Cipher(algorithms.AES(b"\x00" * 16), modes.GCM(b"\x00" * 12)),
+            )
+        with pytest.raises(TypeError):
+            decrypt_file(
+                tmp_path / "src",
+                tmp_path / "enc",
+                Cipher(
+                    algorithms.AES(os.urandom(32)), modes.XTS(b"\x01" * 16)
+                ),
+            )
+
+    def test_same_file(self, tmp_path, backend):
+        cipher = Cipher(
+            algorithms.AES(os.urandom(16)), modes.CTR(os.urandom(16))
+        )
+        data = os.urandom(32)
+        _write(tmp_path / "src", data)
+        os.link(tmp_path / "src", tmp_path / "link")
+        with pytest.raises(ValueError):
+            encrypt_file(tmp_path / "src", tmp_path / "src", cipher)
+        with pytest.raises(ValueError):
+            decrypt_file(tmp_path / "src", tmp_path / "link", cipher)
+        assert _read(tmp_path / "src") == data
+
+
+@pytest.mark.skipif(
+    sys.platform not in {"linux", "darwin"} or sys.maxsize < 2**31,
+    reason="mmap and 64-bit platform required",
+)
+class TestAEADFiles:
+    @pytest.mark.parametrize("length", [0, 1, 63, 64, 65, 1000])
+    def test_roundtrip(self, tmp_path, length, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+        nonce_prefix = os.urandom(7)
+        data = os.urandom(length)
+        _write(tmp_path / "src", data)
+
+        encrypt_file_aead(
+            tmp_path / "src", tmp_path / "enc", aesgcm, nonce_prefix, 64, b"ad"
+        )
+        ct = _read(tmp_path / "enc")
+        encryptor = StreamEncryptor(aesgcm, nonce_prefix, 64, b"ad")
+        assert ct == encryptor.update(data) + encryptor.finalize()
+
+        decrypt_file_aead(
+            tmp_path / "enc", tmp_path / "dec", aesgcm, nonce_prefix, 64, b"ad"
+        )
+        assert _read(tmp_path / "dec") == data
+
+    def test_decrypt_stream_output(self, tmp_path, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+        nonce_prefix = os.urandom(7)
+        data = os.urandom(300)
+        encryptor = StreamEncryptor(aesgcm, nonce_prefix, 100)
+        _write(tmp_path / "enc", encryptor.update(data) + encryptor.finalize())
+
+        decrypt_file_aead(
+            tmp_path / "enc", tmp_path / "dec", aesgcm, nonce_prefix, 100
+        )
+        assert _read(tmp_path / "dec") == data
+
+        decryptor = StreamDecryptor(aesgcm, nonce_prefix, 100)
+        pt = decryptor.update(_read(tmp_path / "enc")) + decryptor.finalize()
+        assert pt == data
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda ct: ct[:-1] + bytes([ct[-1] ^ 1]),
+            lambda ct: bytes([ct[0] ^ 1]) + ct[1:],
+            lambda ct: ct[:116],
+            lambda ct: ct[:10],
+        ],
+    )
+    def test_invalid_tag(self, tmp_path, mutate, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+        nonce_prefix = os.urandom(7)
+        _write(tmp_path / "src", os.urandom(250))
+        encrypt_file_aead(
+            tmp_path / "src", tmp_path / "enc", aesgcm, nonce_prefix, 100
+        )
+        _write(tmp_path / "enc", mutate(_read(tmp_path / "enc")))
+
+        with pytest.raises(InvalidTag):
+            decrypt_file_aead(
+                tmp_path / "enc", tmp_path / "dec", aesgcm, nonce_prefix, 100
+            )
+        if os.path.exists(tmp_path / "dec"):
+            assert _read(tmp_path / "dec") == b""
+
+    def test_invalid_arguments(self, tmp_path, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+        _write(tmp_path / "src", b"data")
+        with pytest.raises(ValueError):
+            encrypt_file_aead(
+                tmp_path / "src", tmp_path / "enc", aesgcm, b"short", 64
+            )
+        with pytest.raises(TypeError):
+            encrypt_file_aead(
+                tmp_path / "src",
+                tmp_path / "enc",
+                object(),  # type: ignore[arg-type]
+                b"\x00" * 7,
+                64,
+            )
+
+    def test_same_file(self, tmp_path, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+        data = os.urandom(32)
+        _write(tmp_path / "src", data)
+        with pytest.raises(ValueError):
+            encrypt_file_aead(
+                tmp_path / "src", tmp_path / "src", aesgcm, b"\x00" * 7, 64
+            )
+        assert _read(tmp_path / "src") == data
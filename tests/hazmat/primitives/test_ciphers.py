@@ -6,11 +6,16 @@
 import binascii
 import os
 import sys
+import threading
 
 import pytest
 
 from cryptography import utils
-from cryptography.exceptions import AlreadyFinalized
+from cryptography.exceptions import (
+    AlreadyFinalized,
+    AlreadyUpdated,
+    _Reasons,
+)
 from cryptography.hazmat.primitives import ciphers
 from cryptography.hazmat.primitives.ciphers import modes
 from cryptography.hazmat.primitives.ciphers.algorithms import (
@@ -18,7 +23,12 @@ from cryptography.hazmat.primitives.ciphers.algorithms import (
     Camellia,
 )
 
-from ...utils import load_nist_vectors, load_vectors_from_file
+from ...doubles import DummyCipherAlgorithm, DummyMode
+from ...utils import (
+    load_nist_vectors,
+    load_vectors_from_file,
+    raises_unsupported_algorithm,
+)
 from .test_aead import large_mmap
 
 
@@ -204,6 +214,37 @@ class TestCipherUpdateInto:
         assert res == len(pt)
         assert bytes(buf)[:res] == ct
 
+    @pytest.mark.parametrize(
+        "mode",
+        [modes.CBC(b"\x01" * 16), modes.ECB(), modes.CTR(b"\x01" * 16)],
+    )
+    def test_update_partial_blocks(self, mode, backend):
+        # The output of update is sized from the number of bytes buffered by
+        # earlier calls, so mix update and update_into with unaligned sizes.
+        key = b"\x00" * 16
+        pt = os.urandom(160)
+        c = ciphers.Cipher(AES(key), mode, backend)
+        encryptor = c.encryptor()
+        expected = encryptor.update(pt) + encryptor.finalize()
+
+        for splits in [
+            [0, 1, 16, 17, 50, 100, 160],
+            [3, 15, 31, 33, 159, 160],
+        ]:
+            encryptor = c.encryptor()
+            ct = b""
+            buf = bytearray(len(pt) + 15)
+            prev = 0
+            for i, end in enumerate(splits):
+                if i % 2:
+                    n = encryptor.update_into(pt[prev:end], buf)
+                    ct += bytes(buf[:n])
+                else:
+                    ct += encryptor.update(pt[prev:end])
+                prev = end
+            ct += encryptor.finalize()
+            assert ct == expected
+
     def test_update_into_buffer_too_small(self, backend):
         key = b"\x00" * 16
         c = ciphers.Cipher(AES(key), modes.ECB(), backend)
@@ -244,6 +285,375 @@ class TestCipherUpdateInto:
             encryptor.update(object)  # type: ignore[arg-type]
 
 
+class TestParallelCTR:
+    @pytest.mark.parametrize("parallelism", [2, 3, 8])
+    @pytest.mark.parametrize(
+        "nonce",
+        [b"\x00" * 16, b"\xff" * 16, b"\x00" * 8 + b"\xff" * 8],
+    )
+    def test_matches_sequential(self, parallelism, nonce, backend):
+        key = os.urandom(16)
+        data = os.urandom(3 * 2**20 + 7)
+        c = ciphers.Cipher(AES(key), modes.CTR(nonce))
+        expected = c.encryptor().update(data)
+
+        # Unaligned updates on either side of the parallel one exercise
+        # moving the context to and from a block boundary.
+        encryptor = c.encryptor(parallelism=parallelism)
+        ct = encryptor.update(data[:5])
+        ct += encryptor.update(data[5 : 2**21 + 3])
+        ct += encryptor.update(data[2**21 + 3 :])
+        ct += encryptor.finalize()
+        assert ct == expected
+
+        decryptor = c.decryptor(parallelism=parallelism)
+        assert decryptor.update(ct) + decryptor.finalize() == data
+
+    def test_update_into(self, backend):
+        key = os.urandom(16)
+        nonce = os.urandom(16)
+        data = os.urandom(2**21)
+        c = ciphers.Cipher(AES(key), modes.CTR(nonce))
+        buf = bytearray(len(data))
+        encryptor = c.encryptor(parallelism=4)
+        assert encryptor.update_into(data, buf) == len(data)
+        assert buf == c.encryptor().update(data)
+
+    def test_reset_nonce(self, backend):
+        key = os.urandom(16)
+        data = os.urandom(2**21 + 1)
+        c = ciphers.Cipher(AES(key), modes.CTR(b"\x00" * 16))
+        encryptor = c.encryptor(parallelism=4)
+        encryptor.update(data)
+        nonce = os.urandom(16)
+        encryptor.reset_nonce(nonce)
+        expected = (
+            ciphers.Cipher(AES(key), modes.CTR(nonce)).encryptor().update(data)
+        )
+        assert encryptor.update(data) == expected
+
+    def test_invalid_parallelism(self, backend):
+        c = ciphers.Cipher(AES(b"\x00" * 16), modes.CTR(b"\x00" * 16))
+        with pytest.raises(ValueError):
+            c.encryptor(parallelism=0)
+        with pytest.raises(ValueError):
+            c.encryptor(parallelism=-1)
+        with pytest.raises(ValueError):
+            c.decryptor(parallelism=1025)
+        with pytest.raises(ValueError):
+            ciphers.Cipher(AES(b"\x00" * 16), modes.ECB()).encryptor(
+                parallelism=2
+            )
+        with pytest.raises(ValueError):
+            ciphers.Cipher(
+                AES(b"\x00" * 16), modes.CBC(b"\x00" * 16)
+            ).decryptor(parallelism=2)
+
+    def test_aead_parallelism(self, backend):
+        # AEAD modes accept the default parallelism, but can't be split.
+        c = ciphers.Cipher(AES(b"\x00" * 16), modes.GCM(b"\x00" * 12))
+        encryptor = c.encryptor(parallelism=1)
+        ct = encryptor.update(b"data") + encryptor.finalize()
+        decryptor = ciphers.Cipher(
+            AES(b"\x00" * 16), modes.GCM(b"\x00" * 12, encryptor.tag)
+        ).decryptor(parallelism=1)
+        assert decryptor.update(ct) + decryptor.finalize() == b"data"
+        with pytest.raises(ValueError):
+            c.encryptor(parallelism=2)
+        with pytest.raises(ValueError):
+            c.decryptor(parallelism=2)
+
+
+class TestCipherTemplate:
+    @pytest.mark.parametrize(
+        ("mode_class", "iv_length"),
+        [(modes.CBC, 16), (modes.CTR, 16), (modes.OFB, 16), (modes.CFB, 16)],
+    )
+    def test_matches_cipher(self, mode_class, iv_length, backend):
+        key = os.urandom(16)
+        data = os.urandom(64)
+        template = ciphers.CipherTemplate(AES(key), mode_class)
+        for _ in range(3):
+            mode = mode_class(os.urandom(iv_length))
+            cipher = ciphers.Cipher(AES(key), mode)
+            encryptor = cipher.encryptor()
+            expected = encryptor.update(data) + encryptor.finalize()
+
+            encryptor = template.encryptor(mode)
+            ct = encryptor.update(data) + encryptor.finalize()
+            assert ct == expected
+            decryptor = template.decryptor(mode)
+            assert decryptor.update(ct) + decryptor.finalize() == data
+
+    def test_ecb(self, backend):
+        key = os.urandom(16)
+        template = ciphers.CipherTemplate(AES(key), modes.ECB)
+        encryptor = template.encryptor(modes.ECB())
+        ct = encryptor.update(b"\x00" * 32) + encryptor.finalize()
+        assert ct == (
+            ciphers.Cipher(AES(key), modes.ECB())
+            .encryptor()
+            .update(b"\x00" * 32)
+        )
+
+    def test_independent_contexts(self, backend):
+        key = os.urandom(16)
+        template = ciphers.CipherTemplate(AES(key), modes.CTR)
+        nonce1 = os.urandom(16)
+        nonce2 = os.urandom(16)
+        encryptor1 = template.encryptor(modes.CTR(nonce1))
+        encryptor2 = template.encryptor(modes.CTR(nonce2))
+        ct1 = encryptor1.update(b"a" * 20)
+        ct2 = encryptor2.update(b"a" * 20)
+        ct1 += encryptor1.update(b"b" * 20) + encryptor1.finalize()
+        ct2 += encryptor2.update(b"b" * 20) + encryptor2.finalize()
+
+        data = b"a" * 20 + b"b" * 20
+        for nonce, ct in [(nonce1, ct1), (nonce2, ct2)]:
+            c = ciphers.Cipher(AES(key), modes.CTR(nonce))
+            assert ct == c.encryptor().update(data)
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.cipher_supported(
+            AES(b"\x00" * 16), modes.GCM(b"\x00" * 12)
+        ),
+        skip_message="Does not support AES GCM",
+    )
+    @pytest.mark.parametrize("nonce_length", [12, 16])
+    def test_gcm(self, nonce_length, backend):
+        key = os.urandom(16)
+        template = ciphers.CipherTemplate(AES(key), modes.GCM)
+        for _ in range(3):
+            nonce = os.urandom(nonce_length)
+            encryptor = template.encryptor(modes.GCM(nonce))
+            encryptor.authenticate_additional_data(b"ad")
+            ct = encryptor.update(b"data") + encryptor.finalize()
+
+            expected = ciphers.Cipher(AES(key), modes.GCM(nonce)).encryptor()
+            expected.authenticate_additional_data(b"ad")
+            assert ct == expected.update(b"data") + expected.finalize()
+            assert encryptor.tag == expected.tag
+
+            decryptor = template.decryptor(modes.GCM(nonce, encryptor.tag))
+            decryptor.authenticate_additional_data(b"ad")
+            assert decryptor.update(ct) + decryptor.finalize() == b"data"
+
+            decryptor = template.decryptor(modes.GCM(nonce))
+            decryptor.authenticate_additional_data(b"ad")
+            pt = decryptor.update(ct)
+            assert pt + decryptor.finalize_with_tag(encryptor.tag) == b"data"
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.cipher_supported(
+            AES(b"\x00" * 32), modes.XTS(b"\x00" * 16)
+        ),
+        skip_message="Does not support AES XTS",
+    )
+    def test_xts(self, backend):
+        key = os.urandom(32)
+        template = ciphers.CipherTemplate(AES(key), modes.XTS)
+        tweak = os.urandom(16)
+        encryptor = template.encryptor(modes.XTS(tweak))
+        ct = encryptor.update(b"\x01" * 32) + encryptor.finalize()
+        assert ct == (
+            ciphers.Cipher(AES(key), modes.XTS(tweak))
+            .encryptor()
+            .update(b"\x01" * 32)
+        )
+        decryptor = template.decryptor(modes.XTS(tweak))
+        assert decryptor.update(ct) == b"\x01" * 32
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            ciphers.CipherTemplate(
+                object(),  # type: ignore[arg-type]
+                modes.CBC,
+            )
+        with pytest.raises(TypeError):
+            ciphers.CipherTemplate(
+                AES(b"\x00" * 16),
+                modes.CBC(b"\x00" * 16),  # type: ignore[arg-type]
+            )
+        with pytest.raises(TypeError):
+            ciphers.CipherTemplate(
+                AES(b"\x00" * 16),
+                object,  # type: ignore[arg-type]
+            )
+
+    def test_invalid_mode(self, backend):
+        template = ciphers.CipherTemplate(AES(b"\x00" * 16), modes.CBC)
+        with pytest.raises(TypeError):
+            template.encryptor(modes.CTR(b"\x00" * 16))
+        with pytest.raises(TypeError):
+            template.decryptor(modes.CTR(b"\x00" * 16))
+        with pytest.raises(ValueError):
+            template.encryptor(modes.CBC(b"\x00" * 8))
+
+    def test_gcm_encryptor_with_tag(self, backend):
+        template = ciphers.CipherTemplate(AES(b"\x00" * 16), modes.GCM)
+        with pytest.raises(ValueError):
+            template.encryptor(modes.GCM(b"\x00" * 12, b"\x00" * 16))
+
+    def test_unsupported(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            ciphers.CipherTemplate(DummyCipherAlgorithm(), modes.CBC)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_CIPHER):
+            ciphers.CipherTemplate(AES(b"\x00" * 16), DummyMode)
+
+
+class TestCipherUpdateMany:
+    @pytest.mark.parametrize(
+        "mode",
+        [
+            modes.ECB(),
+            modes.CBC(b"\x01" * 16),
+            modes.CTR(b"\x01" * 16),
+            modes.CFB(b"\x01" * 16),
+        ],
+    )
+    def test_matches_update(self, mode, backend):
+        key = os.urandom(16)
+        data = os.urandom(64)
+        pieces: list[utils.Buffer] = [
+            data[:5],
+            memoryview(data[5:5]),
+            data[5:37],
+            data[37:],
+        ]
+        c = ciphers.Cipher(AES(key), mode)
+
+        encryptor = c.encryptor()
+        expected = encryptor.update(data) + encryptor.finalize()
+        encryptor = c.encryptor()
+        ct = encryptor.update_many(pieces) + encryptor.finalize()
+        assert ct == expected
+
+        decryptor = c.decryptor()
+        pt = decryptor.update_many([ct[:17], bytearray(ct[17:])])
+        assert pt + decryptor.finalize() == data
+
+    def test_state_carries_over(self, backend):
+        c = ciphers.Cipher(AES(b"\x00" * 16), modes.CBC(b"\x00" * 16))
+        encryptor = c.encryptor()
+        assert encryptor.update_many([b"\x00" * 5, b"\x00" * 5]) == b""
+        ct = encryptor.update(b"\x00" * 6)
+        assert len(ct) == 16
+        assert ct == c.encryptor().update(b"\x00" * 16)
+        assert encryptor.update_many([]) == b""
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.cipher_supported(
+            AES(b"\x00" * 16), modes.GCM(b"\x00" * 12)
+        ),
+        skip_message="Does not support AES GCM",
+    )
+    def test_gcm(self, backend):
+        key = os.urandom(16)
+        nonce = os.urandom(12)
+        c = ciphers.Cipher(AES(key), modes.GCM(nonce))
+        encryptor = c.encryptor()
+        encryptor.authenticate_additional_data(b"ad")
+        ct = encryptor.update_many([b"header", b"body", b"trailer"])
+        ct += encryptor.finalize()
+
+        expected = c.encryptor()
+        expected.authenticate_additional_data(b"ad")
+        assert (
+            ct == expected.update(b"headerbodytrailer") + expected.finalize()
+        )
+
+        decryptor = ciphers.Cipher(
+            AES(key), modes.GCM(nonce, encryptor.tag)
+        ).decryptor()
+        decryptor.authenticate_additional_data(b"ad")
+        pt = decryptor.update_many([ct[:3], ct[3:]]) + decryptor.finalize()
+        assert pt == b"headerbodytrailer"
+
+        encryptor = c.encryptor()
+        encryptor.update_many([b"data"])
+        with pytest.raises(AlreadyUpdated):
+            encryptor.authenticate_additional_data(b"ad")
+
+    def test_finalized(self, backend):
+        c = ciphers.Cipher(AES(b"\x00" * 16), modes.CTR(b"\x00" * 16))
+        encryptor = c.encryptor()
+        encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update_many([b"data"])
+
+    def test_invalid_data(self, backend):
+        c = ciphers.Cipher(AES(b"\x00" * 16), modes.CTR(b"\x00" * 16))
+        with pytest.raises(TypeError):
+            c.encryptor().update_many(
+                [b"data", "text"]  # type: ignore[list-item]
+            )
+
+
+class TestGILReleaseThreshold:
+    @pytest.fixture(autouse=True)
+    def restore_threshold(self):
+        threshold = ciphers.get_gil_release_threshold()
+        yield
+        ciphers.set_gil_release_threshold(threshold)
+
+    @pytest.mark.parametrize("threshold", [0, 16, 2**20])
+    @pytest.mark.parametrize(
+        "mode",
+        [modes.CBC(b"\x01" * 16), modes.CTR(b"\x01" * 16)],
+    )
+    def test_update(self, threshold, mode, backend):
+        key = b"\x00" * 16
+        data = b"\x02" * 4096
+        expected = ciphers.Cipher(AES(key), mode).encryptor().update(data)
+
+        ciphers.set_gil_release_threshold(threshold)
+        assert ciphers.get_gil_release_threshold() == threshold
+        c = ciphers.Cipher(AES(key), mode)
+        assert c.encryptor().update(data) == expected
+        buf = bytearray(len(data) + 15)
+        assert c.encryptor().update_into(data, buf) == len(data)
+        assert bytes(buf[: len(data)]) == expected
+        assert c.decryptor().update(expected) == data
+
+    def test_update_threads(self, backend):
+        ciphers.set_gil_release_threshold(0)
+        key = os.urandom(16)
+        data = os.urandom(2**16)
+        nonces = [os.urandom(16) for _ in range(8)]
+        results: list[bytes] = [b""] * len(nonces)
+
+        def worker(i):
+            c = ciphers.Cipher(AES(key), modes.CTR(nonces[i]))
+            results[i] = c.encryptor().update(data)
+
+        threads = [
+            threading.Thread(target=worker, args=(i,))
+            for i in range(len(nonces))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for nonce, result in zip(nonces, results):
+            c = ciphers.Cipher(AES(key), modes.CTR(nonce))
+            assert c.decryptor().update(result) == data
+
+    def test_xts_error(self, backend):
+        ciphers.set_gil_release_threshold(0)
+        c = ciphers.Cipher(AES(os.urandom(32)), modes.XTS(b"\x00" * 16))
+        with pytest.raises(ValueError, match="XTS"):
+            c.encryptor().update(b"\x00" * 15)
+
+    def test_invalid_threshold(self, backend):
+        with pytest.raises(ValueError):
+            ciphers.set_gil_release_threshold(-1)
+        with pytest.raises(TypeError):
+            ciphers.set_gil_release_threshold(
+                1.5  # type: ignore[arg-type]
+            )
+
+
 @pytest.mark.skipif(
     sys.platform not in {"linux", "darwin"}, reason="mmap required"
 )
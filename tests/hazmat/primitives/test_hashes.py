@@ -4,11 +4,14 @@
 
 
 import binascii
+import os
+import sys
 
 import pytest
 
 from cryptography.exceptions import AlreadyFinalized, _Reasons
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import hashes, hmac
+from cryptography.utils import Buffer
 
 from ...doubles import DummyHashAlgorithm
 from ...utils import raises_unsupported_algorithm
@@ -42,6 +45,17 @@ class TestHashContext:
         with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
             hashes.Hash(DummyHashAlgorithm(), backend)
 
+    def test_subclass_name(self, backend):
+        class SHA256Subclass(hashes.SHA256):
+            name = "sha512"
+            digest_size = 64
+
+        h = hashes.Hash(SHA256Subclass(), backend=backend)
+        h.update(b"abc")
+        expected = hashes.Hash(hashes.SHA512(), backend=backend)
+        expected.update(b"abc")
+        assert h.finalize() == expected.finalize()
+
 
 @pytest.mark.supported(
     only_if=lambda backend: backend.hash_supported(hashes.SHA1()),
@@ -188,3 +202,294 @@ class TestSM3:
         hashes.SM3(),
         digest_size=32,
     )
+
+
+class TestDigest:
+    @pytest.mark.parametrize(
+        "algorithm",
+        [
+            hashes.SHA1(),
+            hashes.SHA256(),
+            hashes.SHA512(),
+            hashes.SHA3_256(),
+            hashes.BLAKE2b(64),
+            hashes.SHAKE128(digest_size=100),
+        ],
+    )
+    def test_matches_hash(self, algorithm, backend):
+        if not backend.hash_supported(algorithm):
+            pytest.skip(f"Does not support {algorithm.name}")
+
+        for data in [b"", b"abc", b"\x00" * 1000, b"\x01" * (2**20 + 1)]:
+            h = hashes.Hash(algorithm, backend=backend)
+            h.update(data)
+            expected = h.finalize()
+            assert hashes.digest(algorithm, data) == expected
+            assert len(expected) == algorithm.digest_size
+
+    def test_buffer_protocol(self, backend):
+        data = binascii.unhexlify(b"b4190e")
+        assert hashes.digest(hashes.SHA256(), bytearray(data)) == (
+            hashes.digest(hashes.SHA256(), memoryview(data))
+        )
+
+    def test_invalid_types(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256(), "abc")  # type: ignore[arg-type]
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256, b"abc")  # type: ignore[arg-type]
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest(DummyHashAlgorithm(), b"abc")
+
+
+class TestDigestMany:
+    @pytest.mark.parametrize("parallelism", [1, 2, 3, 8, 100])
+    def test_matches_digest(self, parallelism, backend):
+        data = [os.urandom(i) for i in range(50)]
+        expected = [hashes.digest(hashes.SHA256(), d) for d in data]
+        assert (
+            hashes.digest_many(hashes.SHA256(), data, parallelism=parallelism)
+            == expected
+        )
+        assert hashes.digest_many(
+            hashes.SHA256(), data, parallelism=parallelism, packed=True
+        ) == b"".join(expected)
+
+    def test_xof(self, backend):
+        algorithm = hashes.SHAKE256(digest_size=100)
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support SHAKE256")
+
+        data = [b"abc", b"", b"\x00" * 1000]
+        digests = hashes.digest_many(algorithm, data, parallelism=2)
+        assert digests == [hashes.digest(algorithm, d) for d in data]
+        assert all(len(d) == 100 for d in digests)
+
+    def test_huge_xof(self, backend):
+        algorithm = hashes.SHAKE128(digest_size=sys.maxsize)
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support SHAKE128")
+
+        with pytest.raises((MemoryError, OverflowError)):
+            hashes.digest_many(algorithm, [b"abc", b"def"])
+
+    def test_empty(self, backend):
+        assert hashes.digest_many(hashes.SHA256(), []) == []
+        assert hashes.digest_many(hashes.SHA256(), [], packed=True) == b""
+
+    def test_buffer_protocol(self, backend):
+        data: list[Buffer] = [b"abc", bytearray(b"abc"), memoryview(b"abc")]
+        digests = hashes.digest_many(hashes.SHA256(), data)
+        assert digests == [hashes.digest(hashes.SHA256(), b"abc")] * 3
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            hashes.digest_many(hashes.SHA256(), [b"abc"], parallelism=0)
+        with pytest.raises(ValueError):
+            hashes.digest_many(hashes.SHA256(), [b"abc"], parallelism=-1)
+        with pytest.raises(ValueError):
+            hashes.digest_many(hashes.SHA256(), [b"abc"], parallelism=1025)
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA256(), ["abc"])  # type: ignore[list-item]
+        with pytest.raises(TypeError):
+            hashes.digest_many(
+                hashes.SHA256,  # type: ignore[call-overload]
+                [b"abc"],
+            )
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest_many(DummyHashAlgorithm(), [b"abc"])
+
+
+class TestHashFile:
+    @pytest.mark.parametrize(
+        "length", [0, 1, 2**20 - 1, 2**20, 2**20 + 1, 3 * 2**20]
+    )
+    def test_path(self, length, tmp_path, backend):
+        data = os.urandom(length)
+        path = tmp_path / "data"
+        path.write_bytes(data)
+
+        expected = hashes.digest(hashes.SHA256(), data)
+        assert hashes.hash_file(path, hashes.SHA256()) == expected
+        assert hashes.hash_file(str(path), hashes.SHA256()) == expected
+
+    def test_fd(self, tmp_path, backend):
+        data = os.urandom(1000)
+        path = tmp_path / "data"
+        path.write_bytes(data)
+
+        with open(path, "rb") as f:
+            f.seek(100)
+            assert hashes.hash_file(f.fileno(), hashes.SHA256()) == (
+                hashes.digest(hashes.SHA256(), data[100:])
+            )
+            # The file descriptor is left open.
+            os.fstat(f.fileno())
+
+    def test_hmac(self, tmp_path, backend):
+        data = os.urandom(1000)
+        path = tmp_path / "data"
+        path.write_bytes(data)
+
+        h = hmac.HMAC(b"key", hashes.SHA256(), backend=backend)
+        h.update(data)
+        assert hashes.hash_file(path, hashes.SHA256(), key=b"key") == (
+            h.finalize()
+        )
+
+    def test_xof(self, tmp_path, backend):
+        algorithm = hashes.SHAKE128(digest_size=100)
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support SHAKE128")
+
+        path = tmp_path / "data"
+        path.write_bytes(b"abc")
+        assert hashes.hash_file(path, algorithm) == hashes.digest(
+            algorithm, b"abc"
+        )
+
+    def test_huge_xof(self, tmp_path, backend):
+        algorithm = hashes.SHAKE128(digest_size=sys.maxsize)
+        if not backend.hash_supported(algorithm):
+            pytest.skip("Does not support SHAKE128")
+
+        path = tmp_path / "data"
+        path.write_bytes(b"abc")
+        with pytest.raises(MemoryError):
+            hashes.hash_file(path, algorithm)
+
+    def test_errors(self, tmp_path, backend):
+        with pytest.raises(FileNotFoundError):
+            hashes.hash_file(tmp_path / "missing", hashes.SHA256())
+        with pytest.raises(OSError):
+            hashes.hash_file(tmp_path, hashes.SHA256())
+        with pytest.raises(ValueError):
+            hashes.hash_file(-1, hashes.SHA256())
+        with pytest.raises(TypeError):
+            hashes.hash_file(object(), hashes.SHA256())  # type: ignore[arg-type]
+
+        path = tmp_path / "data"
+        path.write_bytes(b"abc")
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.hash_file(path, DummyHashAlgorithm())
+
+
+def _merkle_tree_hash(leaves: list[bytes]) -> bytes:
+    # RFC 6962 section 2.1
+    if not leaves:
+        return hashes.digest(hashes.SHA256(), b"")
+    if len(leaves) == 1:
+        return hashes.digest(hashes.SHA256(), b"\x00" + leaves[0])
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return hashes.digest(
+        hashes.SHA256(),
+        b"\x01"
+        + _merkle_tree_hash(leaves[:k])
+        + _merkle_tree_hash(leaves[k:]),
+    )
+
+
+class TestTreeHash:
+    def test_vector(self, backend):
+        tree = hashes.TreeHash(hashes.SHA256(), 4)
+        tree.update(b"abc123")
+        assert tree.finalize() == binascii.unhexlify(
+            b"5b3906976170745922834b81c8fb32cfcd46bfd6840954e89b1867d9c6ee21a2"
+        )
+
+    @pytest.mark.parametrize("leaf_size", [1, 7, 64])
+    @pytest.mark.parametrize("parallelism", [1, 3])
+    def test_matches_reference(self, leaf_size, parallelism, backend):
+        data = os.urandom(1000)
+        for length in [0, 1, leaf_size, leaf_size + 1, 5 * leaf_size, 1000]:
+            leaves = [
+                data[i : i + leaf_size] for i in range(0, length, leaf_size)
+            ]
+            tree = hashes.TreeHash(
+                hashes.SHA256(), leaf_size, parallelism=parallelism
+            )
+            tree.update(data[:length])
+            assert tree.finalize() == _merkle_tree_hash(leaves)
+            assert tree.leaf_digests() == [
+                hashes.digest(hashes.SHA256(), b"\x00" + leaf)
+                for leaf in leaves
+            ]
+
+    def test_split_updates(self, backend):
+        data = os.urandom(1000)
+        expected = hashes.TreeHash(hashes.SHA256(), 64)
+        expected.update(data)
+
+        tree = hashes.TreeHash(hashes.SHA256(), 64)
+        for i in range(0, len(data), 37):
+            tree.update(data[i : i + 37])
+        assert tree.finalize() == expected.finalize()
+        assert tree.leaf_digests() == expected.leaf_digests()
+
+    def test_leaf_digests_incremental(self, backend):
+        tree = hashes.TreeHash(hashes.SHA256(), 4)
+        tree.update(b"abcdef")
+        assert tree.leaf_digests() == [
+            hashes.digest(hashes.SHA256(), b"\x00abcd")
+        ]
+        tree.update(b"gh")
+        assert len(tree.leaf_digests()) == 2
+        tree.update(b"i")
+        tree.finalize()
+        assert len(tree.leaf_digests()) == 3
+
+    def test_large(self, backend):
+        data = os.urandom(2**20 + 5)
+        tree = hashes.TreeHash(hashes.SHA256(), 4096, parallelism=4)
+        tree.update(data)
+        single = hashes.TreeHash(hashes.SHA256(), 4096)
+        single.update(data)
+        assert tree.finalize() == single.finalize()
+
+    def test_copy(self, backend):
+        tree = hashes.TreeHash(hashes.SHA256(), 4)
+        tree.update(b"abcdef")
+        copy = tree.copy()
+        copy.update(b"gh")
+        tree.update(b"gh")
+        assert copy.finalize() == tree.finalize()
+        assert isinstance(copy, hashes.HashContext)
+        assert copy.algorithm.name == "sha256"
+        assert copy.leaf_size == 4
+
+    def test_raises_after_finalize(self, backend):
+        tree = hashes.TreeHash(hashes.SHA256(), 4)
+        tree.finalize()
+
+        with pytest.raises(AlreadyFinalized):
+            tree.update(b"foo")
+
+        with pytest.raises(AlreadyFinalized):
+            tree.copy()
+
+        with pytest.raises(AlreadyFinalized):
+            tree.finalize()
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            hashes.TreeHash(hashes.SHA256(), 0)
+        with pytest.raises(ValueError):
+            hashes.TreeHash(hashes.SHA256(), 4, parallelism=0)
+        with pytest.raises(ValueError):
+            hashes.TreeHash(hashes.SHA256(), 4, parallelism=-1)
+        with pytest.raises(ValueError):
+            hashes.TreeHash(hashes.SHA256(), 4, parallelism=1025)
+        with pytest.raises(TypeError):
+            hashes.TreeHash(hashes.SHA256, 4)  # type: ignore[arg-type]
+        with pytest.raises(TypeError):
+            hashes.TreeHash(hashes.SHAKE128(digest_size=32), 4)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.TreeHash(DummyHashAlgorithm(), 4)
+
+        tree = hashes.TreeHash(hashes.SHA256(), 4)
+        with pytest.raises(TypeError):
+            tree.update("abc")  # type: ignore[arg-type]
@@ -0,0 +1,95 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+
+import ctypes
+import os
+import sys
+import threading
+
+import pytest
+
+from cryptography.hazmat.primitives.random import random_bytes
+
+
+class TestRandomBytes:
+    @pytest.mark.parametrize("length", [0, 1, 12, 16, 32, 1024, 1025, 10000])
+    def test_length(self, length):
+        data = random_bytes(length)
+        assert isinstance(data, bytes)
+        assert len(data) == length
+
+    def test_distinct(self):
+        values = {random_bytes(16) for _ in range(1000)}
+        assert len(values) == 1000
+
+    def test_invalid_length(self):
+        with pytest.raises(TypeError):
+            random_bytes(16.0)  # type: ignore[arg-type]
+        with pytest.raises(TypeError):
+            random_bytes("16")  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            random_bytes(-1)
+
+    def test_threads(self):
+        results: list[bytes] = []
+
+        def generate():
+            results.extend(random_bytes(16) for _ in range(100))
+
+        threads = [threading.Thread(target=generate) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(results)) == 400
+
+    @pytest.mark.skipif(
+        not hasattr(os, "fork") or sys.platform == "darwin",
+        reason="Requires fork()",
+    )
+    def test_fork(self):
+        # Make sure this thread's buffer has been filled before forking.
+        random_bytes(16)
+
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(r)
+            os.write(w, random_bytes(16))
+            os._exit(0)
+
+        os.close(w)
+        child = os.read(r, 16)
+        os.close(r)
+        os.waitpid(pid, 0)
+
+        assert len(child) == 16
+        assert child != random_bytes(16)
+
+    @pytest.mark.skipif(
+        not hasattr(os, "fork") or sys.platform == "darwin",
+        reason="Requires fork()",
+    )
+    def test_fork_bypassing_os_fork(self):
+        # Calling fork() through ctypes skips os.register_at_fork hooks, but
+        # the buffer must still be discarded in the child.
+        random_bytes(16)
+
+        r, w = os.pipe()
+        pid = ctypes.CDLL(None, use_errno=True).fork()
+        if pid == 0:  # pragma: no cover
+            os.close(r)
+            os.write(w, random_bytes(16))
+            os._exit(0)
+        assert pid > 0
+
+        os.close(w)
+        child = os.read(r, 16)
+        os.close(r)
+        os.waitpid(pid, 0)
+
+        assert len(child) == 16
+        assert child != random_bytes(16)
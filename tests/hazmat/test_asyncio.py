@@ -0,0 +1,97 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+import pytest
+
+from cryptography.exceptions import InvalidSignature, InvalidTag
+from cryptography.hazmat import asyncio as crypto_asyncio
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from .primitives.fixtures_rsa import RSA_KEY_2048
+
+
+@pytest.fixture
+def executor():
+    with concurrent.futures.ThreadPoolExecutor(
+        thread_name_prefix="crypto-test"
+    ) as executor:
+        crypto_asyncio.set_executor(executor)
+        try:
+            yield executor
+        finally:
+            crypto_asyncio.set_executor(None)
+
+
+def test_aead(backend):
+    aesgcm = AESGCM(AESGCM.generate_key(bit_length=128))
+    nonce = os.urandom(12)
+    data = os.urandom(2**17)
+
+    async def main():
+        ct = await crypto_asyncio.encrypt(aesgcm, nonce, data, b"ad")
+        assert ct == aesgcm.encrypt(nonce, data, b"ad")
+        assert await crypto_asyncio.decrypt(aesgcm, nonce, ct, b"ad") == data
+        with pytest.raises(InvalidTag):
+            await crypto_asyncio.decrypt(aesgcm, nonce, ct, None)
+
+    asyncio.run(main())
+
+
+def test_derive(backend):
+    def kdf():
+        return PBKDF2HMAC(hashes.SHA256(), 32, b"salt", 1000)
+
+    async def main():
+        return await crypto_asyncio.derive(kdf(), b"password")
+
+    assert asyncio.run(main()) == kdf().derive(b"password")
+
+
+def test_sign_verify(backend):
+    private_key = RSA_KEY_2048.private_key(unsafe_skip_rsa_key_validation=True)
+    public_key = private_key.public_key()
+
+    async def main():
+        signature = await crypto_asyncio.sign(
+            private_key, b"data", padding.PKCS1v15(), hashes.SHA256()
+        )
+        await crypto_asyncio.verify(
+            public_key, signature, b"data", padding.PKCS1v15(), hashes.SHA256()
+        )
+        with pytest.raises(InvalidSignature):
+            await crypto_asyncio.verify(
+                public_key,
+                signature,
+                b"other",
+                padding.PKCS1v15(),
+                hashes.SHA256(),
+            )
+
+    asyncio.run(main())
+
+
+def test_set_executor(executor):
+    assert crypto_asyncio.get_executor() is executor
+
+    async def main():
+        return await crypto_asyncio.run(
+            lambda: threading.current_thread().name
+        )
+
+    assert asyncio.run(main()).startswith("crypto-test")
+
+
+def test_set_executor_invalid():
+    with pytest.raises(TypeError):
+        crypto_asyncio.set_executor(object())  # type: ignore[arg-type]
+    assert crypto_asyncio.get_executor() is None
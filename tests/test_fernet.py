@@ -14,7 +14,9 @@ import pytest
 
 import cryptography_vectors
 from cryptography.fernet import Fernet, InvalidToken, MultiFernet
-from cryptography.hazmat.primitives.ciphers import algorithms, modes
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.hmac import HMAC
 
 
 def json_parametrize(keys, filename):
@@ -157,6 +159,137 @@ class TestFernet:
         with pytest.raises(InvalidToken):
             f.extract_timestamp(b"nonsensetoken")
 
+    def test_roundtrip_lengths(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        for length in range(50):
+            message = os.urandom(length)
+            assert f.decrypt(f.encrypt(message)) == message
+
+    def test_non_canonical_base64(self, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        token = f.encrypt(b"encrypt me")
+        # Python's base64 decoder discards characters outside of the
+        # alphabet, and accepts the standard alphabet as well.
+        assert f.decrypt(token[:20] + b"\n" + token[20:]) == b"encrypt me"
+        assert f.decrypt(token + b"\n") == b"encrypt me"
+        assert f.decrypt(token.replace(b"-", b"+").replace(b"_", b"/")) == (
+            b"encrypt me"
+        )
+        with pytest.raises(InvalidToken):
+            f.decrypt(token.rstrip(b"="))
+        with pytest.raises(ValueError):
+            f.decrypt(token.decode("ascii") + "\u2603")
+
+    def test_large_roundtrip(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        message = os.urandom(2**20 + 3)
+        assert f.decrypt(f.encrypt(message)) == message
+
+    @pytest.mark.parametrize(
+        "ciphertext",
+        [
+            # No ciphertext
+            b"",
+            # Not a multiple of the block size
+            b"\x00" * 17,
+            # Invalid padding
+            Cipher(algorithms.AES(b"\x00" * 16), modes.CBC(b"\x00" * 16))
+            .encryptor()
+            .update(b"\x00" * 16),
+        ],
+    )
+    def test_invalid_ciphertext_valid_hmac(self, ciphertext, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        data = b"\x80" + b"\x00" * 8 + b"\x00" * 16 + ciphertext
+        h = HMAC(b"\x00" * 16, hashes.SHA256())
+        h.update(data)
+        token = base64.urlsafe_b64encode(data + h.finalize())
+        assert f.extract_timestamp(token) == 0
+        with pytest.raises(InvalidToken):
+            f.decrypt(token)
+
+
+@pytest.mark.supported(
+    only_if=lambda backend: backend.cipher_supported(
+        algorithms.AES(b"\x00" * 32), modes.CBC(b"\x00" * 16)
+    ),
+    skip_message="Does not support AES CBC",
+)
+class TestFernetBatch:
+    @pytest.mark.parametrize("parallelism", [1, 3])
+    def test_roundtrip(self, parallelism, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        messages = [os.urandom(i) for i in range(40)]
+        tokens = f.encrypt_many(iter(messages), parallelism=parallelism)
+        assert [f.decrypt(t) for t in tokens] == messages
+        assert len(set(tokens)) == len(tokens)
+        assert f.decrypt_many(tokens, parallelism=parallelism) == messages
+        assert f.encrypt_many([]) == []
+        assert f.decrypt_many([]) == []
+
+    def test_current_time(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        tokens = f.encrypt_many([b"a", b"b"], current_time=100)
+        assert [f.extract_timestamp(t) for t in tokens] == [100, 100]
+        assert f.decrypt_many(tokens, ttl=1, current_time=101) == [b"a", b"b"]
+        assert f.decrypt_many(tokens, ttl=1, current_time=102) == [None, None]
+        assert f.decrypt_many(
+            [t.decode("ascii") for t in tokens], ttl=1, current_time=101
+        ) == [b"a", b"b"]
+
+    @pytest.mark.parametrize("parallelism", [1, 2])
+    def test_invalid_tokens(self, parallelism, backend):
+        f1 = Fernet(Fernet.generate_key(), backend=backend)
+        f2 = Fernet(Fernet.generate_key(), backend=backend)
+        token = f1.encrypt(b"abc")
+        tokens = [
+            token,
+            f2.encrypt(b"abc"),
+            b"nonsensetoken",
+            base64.urlsafe_b64encode(b"\x81"),
+            token[:-4],
+            token,
+        ]
+        assert f1.decrypt_many(tokens, parallelism=parallelism) == [
+            b"abc",
+            None,
+            None,
+            None,
+            None,
+            b"abc",
+        ]
+
+    @pytest.mark.parametrize("ttl", [None, 60])
+    def test_matches_decrypt(self, ttl, backend):
+        f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        tokens = [
+            f.encrypt(b"current"),
+            f.encrypt_at_time(b"old", 1000),
+            f.encrypt_at_time(b"future", int(time.time()) + 3600),
+        ]
+        expected: list[bytes | None] = []
+        for token in tokens:
+            try:
+                expected.append(f.decrypt(token, ttl))
+            except InvalidToken:
+                expected.append(None)
+        assert f.decrypt_many(tokens, ttl) == expected
+
+    def test_invalid_arguments(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        with pytest.raises(TypeError):
+            f.encrypt_many([b"abc", "abc"])  # type: ignore[list-item]
+        with pytest.raises(TypeError):
+            f.decrypt_many([12345])  # type: ignore[list-item]
+        with pytest.raises(ValueError):
+            f.encrypt_many([b"abc"], parallelism=0)
+        with pytest.raises(ValueError):
+            f.decrypt_many([f.encrypt(b"abc")], parallelism=0)
+        with pytest.raises(ValueError):
+            f.encrypt_many([b"abc"], parallelism=-1)
+        with pytest.raises(ValueError):
+            f.decrypt_many([f.encrypt(b"abc")], parallelism=1025)
+
 
 @pytest.mark.supported(
     only_if=lambda backend: backend.cipher_supported(
@@ -203,6 +336,33 @@ class TestMultiFernet:
                 current_time=100,
             )
 
+    def test_decrypt_many_keys(self, backend):
+        fernets = [
+            Fernet(Fernet.generate_key(), backend=backend) for _ in range(12)
+        ]
+        f = MultiFernet(fernets)
+        for i, fernet in enumerate(fernets):
+            token = fernet.encrypt_at_time(b"key %d" % i, 100)
+            assert f.decrypt(token) == b"key %d" % i
+            assert f.decrypt_at_time(token, ttl=1, current_time=101) == (
+                b"key %d" % i
+            )
+            assert f.extract_timestamp(token) == 100
+            assert fernets[0].decrypt(f.rotate(token)) == b"key %d" % i
+            with pytest.raises(InvalidToken):
+                f.decrypt_at_time(token, ttl=1, current_time=102)
+            with pytest.raises(InvalidToken):
+                f.decrypt(token, ttl=1)
+
+        other = Fernet(Fernet.generate_key(), backend=backend)
+        token = other.encrypt(b"abc")
+        with pytest.raises(InvalidToken):
+            f.decrypt(token)
+        with pytest.raises(InvalidToken):
+            f.extract_timestamp(token)
+        with pytest.raises(TypeError):
+            f.decrypt(12345)  # type: ignore[arg-type]
+
     def test_no_fernets(self, backend):
         with pytest.raises(ValueError):
             MultiFernet([])
@@ -278,6 +438,77 @@ class TestMultiFernet:
         with pytest.raises(InvalidToken):
             mf2.rotate(mf1.encrypt(b"abc"))
 
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    def test_rotate_many(self, chunk_size, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        mf1 = MultiFernet([f1])
+        mf2 = MultiFernet([f2, f1])
+
+        messages = [b"message %d" % i for i in range(10)]
+        tokens: list[bytes | str] = [
+            mf1.encrypt_at_time(m, 1000 + i) for i, m in enumerate(messages)
+        ]
+        tokens[3] = f2.encrypt_at_time(messages[3], 1003)
+        tokens[4] = mf1.encrypt_at_time(messages[4], 1004).decode("ascii")
+
+        rotated = list(mf2.rotate_many(iter(tokens), chunk_size=chunk_size))
+        assert [f2.decrypt(t) for t in rotated] == messages
+        assert [f2.extract_timestamp(t) for t in rotated] == [
+            1000 + i for i in range(10)
+        ]
+        assert len(set(rotated)) == len(rotated)
+        assert list(mf2.rotate_many([])) == []
+
+    def test_rotate_many_lazy(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        mf = MultiFernet([f1])
+        consumed = []
+
+        def tokens():
+            for i in range(10):
+                consumed.append(i)
+                yield f1.encrypt(b"abc")
+
+        rotated = mf.rotate_many(tokens(), chunk_size=4)
+        assert consumed == []
+        next(rotated)
+        assert consumed == [0, 1, 2, 3]
+        assert len(list(rotated)) == 9
+
+    def test_rotate_many_invalid_returns_prefix(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        mf = MultiFernet([f2, f1])
+        wrong_key = Fernet(Fernet.generate_key()).encrypt(b"abc")
+        for invalid in [b"nonsensetoken", wrong_key]:
+            tokens = [
+                f1.encrypt(b"first"),
+                f1.encrypt(b"second"),
+                invalid,
+                f1.encrypt(b"never rotated"),
+            ]
+            rotated = mf.rotate_many(tokens, chunk_size=10)
+            assert f2.decrypt(next(rotated)) == b"first"
+            assert f2.decrypt(next(rotated)) == b"second"
+            with pytest.raises(InvalidToken):
+                next(rotated)
+
+    def test_rotate_many_invalid(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        mf = MultiFernet([f1])
+        with pytest.raises(InvalidToken):
+            list(mf.rotate_many([f1.encrypt(b"abc"), f2.encrypt(b"abc")]))
+        with pytest.raises(InvalidToken):
+            list(mf.rotate_many([b"nonsensetoken"]))
+        with pytest.raises(TypeError):
+            list(mf.rotate_many([12345]))  # type: ignore[list-item]
+        with pytest.raises(ValueError):
+            mf.rotate_many([], chunk_size=0)
+        with pytest.raises(TypeError):
+            mf.rotate_many([], chunk_size=1.5)  # type: ignore[arg-type]
+
     def test_extract_timestamp_first_fernet_valid_token(self, backend):
         f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
         mf1 = MultiFernet([f1])